@@ -0,0 +1,21 @@
+from __future__ import annotations
+import os
+import pytest
+from ticker import db
+from ticker.config import CFG
+from ticker.parse import cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    """A fresh SQLite database and cache dir; fixture paths resolve from the repo root."""
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(CFG, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(CFG, "parse_workers", 1)
+    monkeypatch.setattr(cache, "_CACHE", None)
+    url = CFG.db_url
+    db.use_database(f"sqlite:///{tmp_path / 'ticker.db'}")
+    db.init_db()
+    yield tmp_path
+    db.use_database(url)
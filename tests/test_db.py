@@ -0,0 +1,94 @@
+from __future__ import annotations
+from datetime import date, datetime
+from sqlalchemy import inspect
+from sqlmodel import select
+from ticker import db, migrations
+from ticker.db import batched, get_session, iter_chunks, stream
+from ticker.models import Filing, Member, MemberDayRollup, Signal, Trade
+from ticker.score.signals import compute_follow_scores, score_all_new_trades
+
+def _seed(n: int) -> None:
+    with get_session() as s:
+        s.add(Filing(filing_id="F", source="house", filer_name_raw="x", filed_date=date(2025, 8, 1)))
+        s.add_all(Trade(trade_id=f"T{i:04d}", filing_id="F", txn_date=date(2025, 8, 1), issuer_raw="Acme") for i in range(n))
+        s.commit()
+
+def test_iter_chunks_pages_by_key_and_allows_writes(tmp_db):
+    _seed(25)
+    seen = []
+    with get_session() as s:
+        for rows in iter_chunks(s, select(Trade).where(Trade.ticker.is_(None)), Trade.trade_id, size=10):
+            assert len(rows) <= 10 and len(s.identity_map) == len(rows)  # earlier pages were expunged
+            seen += [t.trade_id for t in rows]
+            for t in rows:
+                t.ticker = "ACME"  # leaves the filter; keyset paging still visits every row once
+            s.commit()
+    assert seen == [f"T{i:04d}" for i in range(25)]
+    with get_session() as s:
+        pairs = list(stream(s, select(Trade.trade_id, Trade.ticker), size=7))
+    assert pairs == [(f"T{i:04d}", "ACME") for i in range(25)]
+
+def test_iter_chunks_keys_joined_rows(tmp_db):
+    _seed(5)
+    with get_session() as s:
+        q = select(Trade, Filing).join(Filing, Filing.filing_id == Trade.filing_id)
+        assert [len(rows) for rows in iter_chunks(s, q, Trade.trade_id, size=2)] == [2, 2, 1]
+        q = select(Trade.trade_id, Trade.issuer_raw)
+        assert [len(rows) for rows in iter_chunks(s, q, Trade.trade_id, size=5)] == [5]
+
+def test_batched():
+    assert [list(b) for b in batched(list(range(5)), 2)] == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+# The tables touched by later migrations, as the first release created them.
+BASELINE = [
+    "CREATE TABLE member (member_id VARCHAR NOT NULL PRIMARY KEY, first VARCHAR NOT NULL, last VARCHAR NOT NULL, "
+    "chamber VARCHAR NOT NULL, state VARCHAR NOT NULL, district VARCHAR, party VARCHAR, active BOOLEAN NOT NULL, "
+    "follow_score FLOAT NOT NULL, follow_score_updated_at DATETIME)",
+    "CREATE TABLE filing (filing_id VARCHAR NOT NULL PRIMARY KEY, source VARCHAR NOT NULL, "
+    "filer_member_id VARCHAR REFERENCES member (member_id), filer_name_raw VARCHAR NOT NULL, filed_date DATE NOT NULL, "
+    "period_start DATE, period_end DATE, url VARCHAR, file_local_path VARCHAR, doc_type VARCHAR NOT NULL, "
+    "status VARCHAR NOT NULL, checksum VARCHAR)",
+    "CREATE TABLE trade (trade_id VARCHAR NOT NULL PRIMARY KEY, filing_id VARCHAR NOT NULL REFERENCES filing (filing_id), "
+    "txn_date DATE NOT NULL, issuer_raw VARCHAR NOT NULL, ticker VARCHAR, security_type VARCHAR, txn_type VARCHAR, "
+    "amount_band VARCHAR, comments_raw VARCHAR, confidence FLOAT NOT NULL, map_method VARCHAR)",
+    "CREATE TABLE signal (signal_id VARCHAR NOT NULL PRIMARY KEY, trade_id VARCHAR NOT NULL REFERENCES trade (trade_id), "
+    "score FLOAT NOT NULL, tags VARCHAR, reason VARCHAR, created_at DATETIME NOT NULL)",
+    "CREATE TABLE runmetric (run_id VARCHAR NOT NULL PRIMARY KEY, started_at DATETIME NOT NULL, "
+    "finished_at DATETIME NOT NULL, stage VARCHAR NOT NULL, success BOOLEAN NOT NULL, details VARCHAR)",
+    "INSERT INTO member VALUES ('M1', 'Ann', 'Lee', 'house', 'CA', NULL, 'D', 1, 0.0, NULL)",
+    "INSERT INTO filing VALUES ('F1', 'house', 'M1', 'Lee, Ann', '2025-08-20', NULL, NULL, NULL, NULL, 'PTR', 'parsed', 'abc')",
+    "INSERT INTO trade VALUES ('F1:0', 'F1', '2025-08-18', 'Apple', 'AAPL', 'stock', 'buy', '$1k-$15k', NULL, 0.95, 'extracted')",
+    "INSERT INTO trade VALUES ('F1:1', 'F1', '2025-08-19', 'Microsoft', NULL, 'stock', 'sell', '$15k-$50k', NULL, 0.75, NULL)",
+    "INSERT INTO signal VALUES ('S-F1:0', 'F1:0', 1.0, 'size_small,influence', 'x', '2025-08-21 09:00:00.000000')",
+]
+
+def test_migrate_populated_baseline_db(tmp_db):
+    db.use_database(f"sqlite:///{tmp_db / 'baseline.db'}")
+    with db.get_engine().begin() as conn:
+        for sql in BASELINE:
+            conn.exec_driver_sql(sql)
+    db.init_db()
+    engine = db.get_engine()
+    assert migrations.current(engine) == migrations.MIGRATIONS[-1].version
+    assert migrations.migrate(engine) == []
+
+    indexes = {ix["name"] for t in ("filing", "trade", "signal", "member") for ix in inspect(engine).get_indexes(t)}
+    assert {"ix_filing_member_filed", "ix_trade_filing_txn", "ix_trade_ticker_txn", "ix_signal_updated_at",
+            "ix_member_follow_score_updated_at"} <= indexes
+    assert "ix_trade_ticker" not in indexes  # superseded by ix_trade_ticker_txn
+
+    created = datetime(2025, 8, 21, 9)
+    with get_session() as s:
+        f = s.get(Filing, "F1")
+        assert (f.filer_member_ref, f.first_signal_at, f.checksum) == ("M1", created, "abc")
+        sig = s.get(Signal, "S-F1:0")
+        assert sig.updated_at == sig.created_at == created
+        assert len(s.exec(select(Trade)).all()) == 2
+        rollups = {(r.day, r.member_id): (r.trades, r.scored) for r in s.exec(select(MemberDayRollup))}
+    assert rollups == {(date(2025, 8, 18), "M1"): (1, 1), (date(2025, 8, 19), "M1"): (1, 0)}
+
+    assert score_all_new_trades() == 1  # the unscored trade; the migrated signal still matches its inputs
+    assert compute_follow_scores() == 1
+    with get_session() as s:
+        assert s.get(Member, "M1").follow_score > 0
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import asyncio, io, os, threading, zipfile
+from datetime import date
+import httpx
+import pytest
+from ticker.config import CFG
+from ticker.fetch import house, http, senate
+from ticker.fetch.http import FetchClient
+from ticker.fetch.standin import make_server
+
+@pytest.fixture
+def fetch_cfg(tmp_path, monkeypatch):
+    monkeypatch.setattr(CFG, "dev", False)
+    monkeypatch.setattr(CFG, "http_rate", 0.0)
+    monkeypatch.setattr(CFG, "http_retries", 3)
+    monkeypatch.setattr(CFG, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(CFG, "data_dir", str(tmp_path / "filings"))
+    return tmp_path
+
+@pytest.fixture
+def standin(fetch_cfg, monkeypatch):
+    srv = make_server("127.0.0.1", 0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    monkeypatch.setattr(CFG, "house_index_url", f"{base}/house/index.json")
+    monkeypatch.setattr(CFG, "senate_index_url", f"{base}/senate/index.json")
+    yield base
+    srv.shutdown()
+    srv.server_close()
+
+def _validators() -> str:
+    return os.path.join(CFG.cache_dir, "http_validators.json")
+
+def test_standin_conditional_get(standin):
+    async def run():
+        async with FetchClient() as c:
+            first = await c.get_if_changed(f"{standin}/house/index.json")
+            c.commit()
+        async with FetchClient() as c:
+            again = await c.get_if_changed(f"{standin}/house/index.json")
+            missing = await c.request(f"{standin}/files/nope.txt")
+        return first, again, missing
+
+    first, again, missing = asyncio.run(run())
+    assert first.status_code == 200 and first.json()
+    assert again is None  # 304 with the persisted ETag
+    assert missing.status_code == 404
+
+def test_retry_backoff(fetch_cfg, monkeypatch):
+    calls, waits = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(calls) < 4:
+            return httpx.Response(503, headers={"Retry-After": "7"})
+        return httpx.Response(200, content=b"ok")
+
+    async def sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(http.asyncio, "sleep", sleep)
+
+    async def run():
+        async with FetchClient() as c:
+            c.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await c.request("http://example.test/index.json")
+
+    assert asyncio.run(run()).content == b"ok"
+    assert len(calls) == 4
+    assert 0.5 <= waits[0] <= 0.75  # exponential backoff after the transport error
+    assert waits[1:] == [7.0, 7.0]  # Retry-After honoured
+
+def test_retries_exhausted_returns_last_response(fetch_cfg, monkeypatch):
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr(http.asyncio, "sleep", sleep)
+
+    async def run():
+        async with FetchClient() as c:
+            c.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(429)))
+            return await c.request("http://example.test/index.json")
+
+    assert asyncio.run(run()).status_code == 429
+
+def test_validators_not_committed_on_partial_failure(standin, monkeypatch):
+    real = FetchClient.download
+
+    async def flaky(self, url, dest):
+        if url.endswith("ptr_pelosi_2025-08-20.txt"):
+            raise httpx.ReadTimeout("timed out")
+        return await real(self, url, dest)
+
+    monkeypatch.setattr(FetchClient, "download", flaky)
+    rows = asyncio.run(house.fetch_new_filings(date(2025, 1, 1)))
+    total = len(asyncio.run(_index(standin)))
+    assert 0 < len(rows) < total
+    assert not os.path.exists(_validators())
+
+    monkeypatch.setattr(FetchClient, "download", real)
+    rows = asyncio.run(house.fetch_new_filings(date(2025, 1, 1)))
+    assert len(rows) == total and all(os.path.exists(r["file_local_path"]) for r in rows)
+    assert os.path.exists(_validators())
+    assert asyncio.run(house.fetch_new_filings(date(2025, 1, 1))) == []  # index unchanged: 304
+
+async def _index(base):
+    async with httpx.AsyncClient() as c:
+        return (await c.get(f"{base}/house/index.json")).json()
+
+def test_list_new_filings_inside_running_loop(standin):
+    async def run():
+        return senate.list_new_filings(date(2025, 1, 1))
+
+    assert asyncio.run(run())
+
+def test_parse_index_skips_malformed_entries():
+    xml = b"""<FinancialDisclosure>
+      <Member><Last>Doe</Last><First>Jane</First><FilingType>P</FilingType><StateDst>CA12</StateDst>
+        <FilingDate>8/25/2025</FilingDate><DocID>1</DocID></Member>
+      <Member><Last>Roe</Last><First>Rick</First><FilingType>P</FilingType><StateDst>OH08</StateDst>
+        <FilingDate></FilingDate><DocID>2</DocID></Member>
+      <Member><Last>Poe</Last><First>Pat</First><FilingType>P</FilingType><StateDst>NY01</StateDst>
+        <FilingDate>13/45/2025</FilingDate><DocID>3</DocID></Member>
+    </FinancialDisclosure>"""
+    rows = house.parse_index(xml, 2025)
+    assert [r["filing_id"] for r in rows] == ["H-CA-12-20250825-1"]
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("2025FD.txt", "no xml here")
+    assert house.parse_index(buf.getvalue(), 2025) == []
+
+def test_rows_since_skips_malformed_rows():
+    rows = [
+        {"filing_id": "S-1", "filed_date": "2025-03-01"},
+        {"filing_id": "S-2", "filed_date": ""},
+        {"filing_id": "S-3"},
+        {"filing_id": "S-4", "filed_date": "2024-12-31"},
+    ]
+    assert [r["filing_id"] for r in http.rows_since(rows, date(2025, 1, 1), "senate")] == ["S-1"]
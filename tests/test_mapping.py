@@ -0,0 +1,59 @@
+from __future__ import annotations
+from datetime import date
+import pytest
+from sqlmodel import select
+from ticker import hotpath
+from ticker.db import get_session
+from ticker.fetch import house, senate
+from ticker.hotpath import ingest_rows, map_all, parse_all
+from ticker.mapsec.aliases import drop_alias, lookup_aliases, set_alias
+from ticker.mapsec.issuers import IssuerResolver, issuer_key
+from ticker.mapsec.sec_cik import company_table, load_company_tickers
+from ticker.models import IssuerAlias, Trade
+
+def test_resolver_exact_fuzzy_and_memo(tmp_db):
+    r = IssuerResolver.from_table(company_table())
+    assert r.names == IssuerResolver(load_company_tickers()).names
+    got = r.resolve_many(["Apple Inc.", "APPLE INC", "JPMorgan Chase", "Zzyzx Holdings", "Apple Inc."])
+    assert [(m.ticker, m.method) for m in got.values()] == [("AAPL", "exact"), ("AAPL", "exact"), ("JPM", "fuzzy"), (None, "none")]
+    assert (r.hits, r.misses) == (1, 3)  # both spellings of Apple share one key
+    assert r.resolve("JPMorgan Chase", fuzzy=False).ticker is None
+
+@pytest.fixture
+def parsed(tmp_db):
+    since = date(2025, 1, 1)
+    ingest_rows({"house": house.list_new_filings(since), "senate": senate.list_new_filings(since)})
+    parse_all(workers=1)
+    with get_session() as s:
+        fid = s.exec(select(Trade.filing_id)).first()
+        for i, name in enumerate(["Microsoft", "JPMorgan Chase", "Zzyzx Holdings"]):
+            s.add(Trade(trade_id=f"manual:{i}", filing_id=fid, txn_date=date(2025, 8, 1), issuer_raw=name))
+        s.commit()
+
+def test_aliases_round_trip(parsed, monkeypatch):
+    with get_session() as s:
+        aliases = {a.issuer_key: (a.ticker, a.method) for a in s.exec(select(IssuerAlias))}
+        extracted = {issuer_key(i): (t, "extracted") for i, t in s.exec(select(Trade.issuer_raw, Trade.ticker).where(Trade.ticker.is_not(None)))}
+    assert aliases == extracted  # learned while parsing
+
+    resolved = []
+    resolve_many = hotpath.get_resolver().resolve_many
+    monkeypatch.setattr(hotpath.get_resolver(), "resolve_many", lambda names, **kw: resolved.extend(names) or resolve_many(names, **kw))
+    assert map_all(True) == 2
+    assert sorted(resolved) == ["JPMorgan Chase", "Zzyzx Holdings"]  # Microsoft came from its alias
+    with get_session() as s:
+        mapped = {t.trade_id: (t.ticker, t.map_method) for t in s.exec(select(Trade).where(Trade.trade_id.like("manual:%")))}
+        assert mapped == {"manual:0": ("MSFT", "extracted"), "manual:1": ("JPM", "fuzzy"), "manual:2": (None, None)}
+        assert lookup_aliases(s, ["jpmorgan chase"])["jpmorgan chase"].method == "fuzzy"
+
+        assert set_alias(s, "zzyzx holdings", "ZZYX") == 1
+        assert set_alias(s, "apple", "APPL") == 0  # tickers printed on the filing win
+        s.commit()
+        assert s.get(Trade, "manual:2").ticker == "ZZYX"
+        assert lookup_aliases(s, ["zzyzx holdings"])["zzyzx holdings"].method == "manual"
+        assert drop_alias(s, "zzyzx holdings")
+        s.commit()
+        assert not drop_alias(s, "zzyzx holdings") and not lookup_aliases(s, ["zzyzx holdings"])
+
+    resolved.clear()
+    assert map_all(True) == 0 and resolved == []  # nothing left unmapped
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import os, shutil
+from datetime import date
+import pytest
+from sqlmodel import func, select
+from ticker import hotpath
+from ticker.db import get_session
+from ticker.fetch import house, senate
+from ticker.hotpath import ingest_rows, parse_all
+from ticker.models import Filing, Trade
+from ticker.parse import cache, pdf
+from ticker.parse.cache import TextCache
+from ticker.utils.hashing import sha256_file
+
+def _ingest(tmp_path, ext=".txt"):
+    """Ingest the fixture filings, each pointing at its own copy of the fixture file."""
+    since = date(2025, 1, 1)
+    rows = {"house": house.list_new_filings(since), "senate": senate.list_new_filings(since)}
+    for r in rows["house"] + rows["senate"]:
+        path = tmp_path / (r["filing_id"] + ext)
+        shutil.copy(r["file_local_path"], path)
+        r["file_local_path"] = str(path)
+    ingest_rows(rows)
+    return {r["filing_id"]: r["file_local_path"] for r in rows["house"] + rows["senate"]}
+
+def _trades():
+    with get_session() as s:
+        return dict(s.exec(select(Trade.filing_id, func.count()).group_by(Trade.filing_id)).all())
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Paths ``parse_all`` hashes."""
+    out = []
+    monkeypatch.setattr(hotpath, "sha256_file", lambda p: out.append(p) or sha256_file(p))
+    return out
+
+def test_parse_all_reparses_only_changed_filings(tmp_db, hashed):
+    paths = _ingest(tmp_db)
+    assert parse_all(workers=1) == 7
+    before = _trades()
+    hashed.clear()
+    assert parse_all(workers=1) == 0
+    assert hashed == []  # same size and mtime as when hashed: not even read
+
+    touched, changed, _ = sorted(paths)
+    os.utime(paths[touched], ns=(10**18, 10**18))
+    with open(paths[changed], "a") as f:
+        f.write("2025-08-22 | Apple Inc. | AAPL | SELL | $1k-$15k\n")
+    assert parse_all(workers=1) == before[changed] + 1
+    assert sorted(hashed) == sorted([paths[touched], paths[changed]])
+    assert _trades() == {**before, changed: before[changed] + 1}
+
+    hashed.clear()
+    assert parse_all(workers=1) == 0
+    assert hashed == []  # the touch was recorded with the unchanged checksum
+
+def test_unreadable_filing_is_failed_and_keeps_its_trades(tmp_db):
+    paths = _ingest(tmp_db)
+    parse_all(workers=1)
+    before = _trades()
+    fid = sorted(paths)[0]
+    os.remove(paths[fid])
+    assert parse_all(workers=1) == 0
+    with get_session() as s:
+        assert s.get(Filing, fid).status == "failed"
+    assert _trades() == before
+
+def test_cached_pdf_text_is_not_extracted_again(tmp_db, monkeypatch):
+    _ingest(tmp_db, ext=".pdf")  # pdfplumber or not, these read back as their plain text
+    assert parse_all(workers=1) == 7
+    assert cache.get_text_cache().stats()["entries"] == 3
+
+    def _no_extract(*a, **kw):
+        raise AssertionError("extracted a cached PDF")
+
+    monkeypatch.setattr(pdf, "extract_many", _no_extract)
+    assert parse_all(force=True, workers=1) == 7
+
+def test_text_cache_round_trip(tmp_path):
+    c = TextCache(str(tmp_path / "text"), max_bytes=1 << 20)
+    src = tmp_path / "a.pdf"
+    src.write_text("raw")
+    key, text = c.lookup(str(src))
+    assert key == sha256_file(str(src)) and text is None
+    c.put(key, "extracted")
+    assert c.lookup(str(src)) == (key, "extracted")
+    assert c.lookup(str(tmp_path / "gone.pdf"), key) == (key, "extracted")  # a known key is not re-hashed
+    assert c.get(None) is None and (c.hits, c.misses) == (2, 1)
+
+def test_text_cache_prunes_least_recently_used(tmp_path):
+    c = TextCache(str(tmp_path), max_bytes=1 << 20)
+    for i, key in enumerate(["aa1", "bb2", "cc3"]):
+        c.put(key, key * 100)
+        os.utime(c._path(key), (i, i))
+    assert c.get("aa1")  # a hit makes it the most recently used
+    size = c.stats()["bytes"]
+    assert c.prune(size - 1) == 1
+    assert c.get("bb2") is None and c.get("aa1") and c.get("cc3")
+
+def test_text_cache_prunes_after_a_tenth_of_its_budget(tmp_path, monkeypatch):
+    c = TextCache(str(tmp_path), max_bytes=10_000)
+    walks = []
+    entries = c._entries
+    monkeypatch.setattr(c, "_entries", lambda: walks.append(1) or entries())
+    c.put("aa1", "x" * 100)
+    assert walks == []  # a few compressed bytes: no directory walk
+    for i in range(50):
+        c.put(f"{i:03d}", os.urandom(200).hex())
+    assert walks and c.stats()["bytes"] <= 10_000
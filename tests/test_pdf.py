@@ -0,0 +1,61 @@
+from __future__ import annotations
+import asyncio, multiprocessing, os, time
+from datetime import date
+import pytest
+from sqlmodel import select
+from ticker import pipeline
+from ticker.db import get_session
+from ticker.fetch import house
+from ticker.models import Filing
+from ticker.parse import pdf, ptr
+
+# The fakes below reach the workers by inheritance, so they need fork.
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs fork workers")
+
+def _flaky(path, start=0, stop=None):
+    name = os.path.basename(path)
+    if name.startswith("crash"):
+        os._exit(1)
+    if name.startswith("hang"):
+        time.sleep(60)
+    return pdf._read_plain(path)
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "_extract_pages", _flaky)
+    paths = {}
+    for name in ["crash", "hang"] + [f"good{i}" for i in range(8)]:
+        path = tmp_path / f"{name}.pdf"
+        path.write_text(f"text of {name}")
+        paths[name] = str(path)
+    return paths
+
+def test_extract_many_isolates_hanging_and_crashing_docs(docs):
+    t0 = time.monotonic()
+    out = dict(pdf.extract_many(docs.values(), workers=2, timeout=1))
+    assert time.monotonic() - t0 < 30
+    assert out.pop(docs["crash"]) is None
+    assert out.pop(docs["hang"]) is None
+    assert out == {docs[n]: f"text of {n}" for n in docs if n.startswith("good")}
+
+def test_single_filing_does_not_extract_in_process(tmp_db, docs):
+    f = Filing(filing_id="F-1", source="house", file_local_path=docs["crash"])
+    [(got, trades, text)] = list(ptr.parse_filings([f], workers=1))
+    assert got is f and text is None and trades == []
+
+def test_pipeline_survives_a_crashing_worker(tmp_db, monkeypatch):
+    rows = house.list_new_filings(date(2025, 1, 1))
+    bad, bad_path = rows[0]["filing_id"], rows[0]["file_local_path"]
+    read = ptr._read_txt
+
+    def _read_txt(path):
+        if path == bad_path:
+            os._exit(1)
+        return read(path)
+
+    monkeypatch.setattr(ptr, "_read_txt", _read_txt)
+    assert asyncio.run(pipeline.run_pipeline({"house": rows}, workers=2)) == len(rows) - 1
+    with get_session() as s:
+        statuses = dict(s.exec(select(Filing.filing_id, Filing.status)).all())
+    assert statuses.pop(bad) == "failed"
+    assert set(statuses.values()) == {"parsed"}
@@ -0,0 +1,45 @@
+from __future__ import annotations
+import asyncio
+from collections import Counter
+from datetime import date
+from sqlmodel import func, select
+from ticker import pipeline
+from ticker.db import get_session
+from ticker.enrich.members import load_members
+from ticker.fetch import house, senate
+from ticker.models import Filing, Member, RunMetric, Signal, Trade
+
+def _listing():
+    since = date(2025, 1, 1)
+    return {"house": house.list_new_filings(since), "senate": senate.list_new_filings(since)}
+
+def test_each_filing_flows_to_its_signals(tmp_db):
+    load_members(force=True)
+    new = _listing()
+    new["house"].append({**new["house"][0], "filing_id": "H-MISSING", "file_local_path": str(tmp_db / "missing.pdf")})
+    assert asyncio.run(pipeline.run_pipeline(new, workers=2)) == 3
+
+    with get_session() as s:
+        statuses = dict(s.exec(select(Filing.filing_id, Filing.status)).all())
+        trades = s.exec(select(func.count()).select_from(Trade)).one()
+        scored = s.exec(select(Signal.trade_id)).all()
+        unstamped = s.exec(select(Filing.filing_id).where(Filing.status == "parsed", Filing.first_signal_at.is_(None))).all()
+        followed = s.exec(select(Member.member_id).where(Member.follow_score_updated_at.is_not(None))).all()
+        metrics = s.exec(select(RunMetric.stage, RunMetric.success, RunMetric.batch_id)).all()
+    assert statuses.pop("H-MISSING") == "failed"
+    assert set(statuses.values()) == {"parsed"}
+    assert trades == len(scored) == 7 and unstamped == []
+    assert {"H-CA-12", "H-OH-08", "S-NY-00"} <= set(followed)
+
+    assert len({b for *_, b in metrics}) == 1
+    assert Counter((st, ok) for st, ok, _ in metrics) == {
+        ("ingest", True): 4, ("extract", True): 3, ("extract", False): 1,
+        ("parse", True): 3, ("map", True): 3, ("score", True): 3, ("follow", True): 1,
+    }
+
+def test_without_scoring_filings_stop_after_mapping(tmp_db):
+    assert asyncio.run(pipeline.run_pipeline(_listing(), score=False, workers=1)) == 3
+    with get_session() as s:
+        assert s.exec(select(func.count()).select_from(Trade)).one() == 7
+        assert s.exec(select(Signal)).all() == []
+        assert set(s.exec(select(RunMetric.stage))) == {"ingest", "extract", "parse", "map"}
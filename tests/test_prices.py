@@ -0,0 +1,54 @@
+from __future__ import annotations
+import numpy as np
+from sqlmodel import select
+from ticker import prices
+from ticker.db import get_session
+from ticker.models import PriceCache
+from ticker.prices import PriceStore
+
+def _csv(path, text):
+    path.write_text(text)
+    return str(path)
+
+def test_load_prices_merges_and_mirrors(tmp_db):
+    d = tmp_db / "px"
+    d.mkdir()
+    _csv(d / "aapl.csv", "Date,Close\n2025-08-18,230.5\n2025-08-20,231.0\n2025-08-19,nan\n")
+    _csv(d / "multi.csv", "symbol,date,adj_close\nmsft,2025-08-18,510\nMSFT,2025-08-21,512\n")
+    assert prices.load_prices([str(d)]) == {"files": 2, "rows_read": 4, "tickers": 2, "rows": 4, "mirrored": 4}
+
+    # a later load replaces the close of an existing (ticker, date) and keeps the rest
+    fix = _csv(tmp_db / "fix.csv", "ticker,date,close\nAAPL,2025-08-20,232.0\nNVDA,2025-08-22,180\n")
+    assert prices.load_prices([fix])["rows"] == 5
+    st = PriceStore.open()
+    assert st.tickers == ["AAPL", "MSFT", "NVDA"]
+    dates, closes = st.history("aapl")
+    assert dates.astype(str).tolist() == ["2025-08-18", "2025-08-20"] and closes.tolist() == [230.5, 232.0]
+    assert st.header["sources"] == sorted(str(p) for p in (d / "aapl.csv", d / "multi.csv", tmp_db / "fix.csv"))
+    with get_session() as s:
+        assert s.get(PriceCache, ("AAPL", np.datetime64("2025-08-20").item())).close == 232.0
+        assert len(s.exec(select(PriceCache)).all()) == 5
+
+    # the store can be recompiled from the mirror
+    prices.write_store(prices.store_path(), [], np.empty(0, np.int64), np.empty(0), [])
+    assert prices.rebuild_from_db() == 5
+    assert PriceStore.open().history("AAPL")[1].tolist() == [230.5, 232.0]
+
+def test_close_on_or_after(tmp_db):
+    path = _csv(tmp_db / "px.csv", "ticker,date,close\nAAPL,2025-08-18,1\nAAPL,2025-08-22,2\nMSFT,2025-08-19,3\n")
+    prices.load_prices([path], to_db=False)
+    st = PriceStore.open()
+    tickers = ["AAPL", "aapl", "AAPL", "MSFT", "MSFT", "XXX"]
+    dates = ["2025-08-18", "2025-08-19", "2025-08-23", "2025-08-01", "2025-08-19", "2025-08-18"]
+    closes, on = st.close_on_or_after(tickers, dates)
+    assert np.array_equal(closes, [1, 2, np.nan, 3, 3, np.nan], equal_nan=True)
+    assert on.astype(str).tolist() == ["2025-08-18", "2025-08-22", "NaT", "2025-08-19", "2025-08-19", "NaT"]
+    closes, _ = st.close_on_or_after(tickers, dates, max_days=2)
+    assert np.array_equal(closes, [1, np.nan, np.nan, np.nan, 3, np.nan], equal_nan=True)
+
+def test_open_missing_or_foreign_store(tmp_db):
+    assert len(PriceStore.open()) == 0 and prices.status() == {"path": prices.store_path(), "exists": False}
+    bad = tmp_db / "bad.store"
+    bad.write_bytes(b"not a price store")
+    st = PriceStore.open(str(bad))
+    assert len(st) == 0 and np.isnan(st.close_on_or_after(["AAPL"], ["2025-08-18"])[0]).all()
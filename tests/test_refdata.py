@@ -0,0 +1,53 @@
+from __future__ import annotations
+import json, os
+import pytest
+from ticker import refdata
+from ticker.mapsec import sec_cik
+
+@pytest.fixture
+def snapshots(tmp_db):
+    refdata.clear()
+    yield tmp_db
+    refdata.clear()
+
+def test_snapshot_round_trip(tmp_path):
+    src = tmp_path / "src.json"
+    src.write_text("[]")
+    path = str(tmp_path / "t.snap")
+    rows = [("a", None, "ünïcode"), ("", "2", "x" * 1000)]
+    refdata.write_snapshot(path, "t", [str(src)], ["k", "v", "w"], rows)
+    t = refdata.attach(path, "t")
+    assert len(t) == 2 and t.columns == ["k", "v", "w"]
+    assert list(t.column("v")) == [None, "2"] and t.column("w")[-1] == "x" * 1000
+    assert list(t) == [{"k": "a", "w": "ünïcode"}, {"k": "", "v": "2", "w": "x" * 1000}]
+
+    with open(path, "r+b") as f:
+        f.write(b"XXXXX")
+    assert refdata.attach(path, "t") is None
+    assert refdata.attach(str(tmp_path / "missing.snap"), "t") is None
+
+def test_fixture_table_rebuilds_only_when_its_source_changes(snapshots, monkeypatch):
+    src = snapshots / "members.json"
+    src.write_text(json.dumps([{"id": "M1", "party": "D"}, {"id": "M2"}]))
+    assert list(refdata.fixture_table("members", str(src))) == [{"id": "M1", "party": "D"}, {"id": "M2"}]
+
+    builds = []
+    read = refdata._read_records
+    monkeypatch.setattr(refdata, "_read_records", lambda p: builds.append(p) or read(p))
+    refdata._LOADED.clear()  # a new process attaches the snapshot on disk
+    assert len(refdata.fixture_table("members", str(src))) == 2
+    os.utime(src, ns=(10**18, 10**18))  # touched, same bytes: the hash still matches
+    refdata._LOADED.clear()
+    assert len(refdata.fixture_table("members", str(src))) == 2
+    assert builds == []
+
+    src.write_text(json.dumps([{"id": "M3"}]))
+    assert list(refdata.fixture_table("members", str(src))) == [{"id": "M3"}]
+    assert builds == [str(src)]
+    assert refdata.status()["members"]["fresh"]
+
+def test_company_table_keys_are_precomputed(snapshots):
+    t = sec_cik.company_table()
+    assert dict(zip(t.column("key"), t.column("ticker")))["nvidia"] == "NVDA"
+    assert sec_cik.load_company_tickers()["apple inc."] == {"ticker": "AAPL", "cik": 320193}
+    assert sec_cik.company_table() is t  # attached once per process
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from datetime import date, timedelta
+import pytest
+from sqlmodel import select
+from ticker.bench import QueryCounter
+from ticker.db import get_session
+from ticker.enrich.members import load_members
+from ticker.fetch import house, senate
+from ticker.hotpath import ingest_rows, map_all, parse_all
+from ticker.models import Filing, Member, MemberDayRollup, Signal, TickerDayRollup, Trade
+from ticker.score.rollups import _PROBE, _probe_query, rebuild_rollups
+from ticker.score.signals import compute_follow_scores, score_all_new_trades
+
+def _rollups():
+    with get_session() as s:
+        return {m.__name__: sorted(tuple(r) for r in s.exec(select(*m.__table__.c))) for m in (MemberDayRollup, TickerDayRollup)}
+
+def test_incremental_rollups_match_rebuild(tmp_db):
+    since = date(2025, 1, 1)
+    ingest_rows({"house": house.list_new_filings(since), "senate": senate.list_new_filings(since)})
+    parse_all(workers=1)
+    map_all(True)
+    score_all_new_trades()
+    scored = _rollups()
+    assert scored["MemberDayRollup"]
+
+    parse_all(force=True, workers=1)  # replaces every trade under the same ids and re-scores them
+    reparsed = _rollups()
+    assert reparsed == scored
+    with get_session() as s:
+        assert not s.exec(select(Signal.signal_id).where(Signal.trade_id.not_in(select(Trade.trade_id)))).all()
+    rebuild_rollups()
+    assert _rollups() == reparsed
+
+@pytest.mark.parametrize("ref_col, index", [(Trade.filing_id, "ix_trade_filing_txn"), (Trade.ticker, "ix_trade_ticker_txn")])
+def test_rollup_probe_seeks_trade_index(tmp_db, ref_col, index):
+    with get_session() as s:
+        conn = s.connection()
+        _PROBE.create(conn, checkfirst=True)
+        sql = str(_probe_query(ref_col).compile(conn, compile_kwargs={"literal_binds": True}))
+        plan = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+    assert plan[0] == "SCAN rollup_probe", plan
+    assert any(step.startswith(f"SEARCH trade USING INDEX {index} ") for step in plan), plan
+
+def _seed(tag: str, n: int) -> None:
+    day = date.today() - timedelta(days=10)
+    with get_session() as s:
+        for i in range(10):
+            s.merge(Member(member_id=f"M{i}", first="A", last=f"B{i}", chamber="house", state="CA", party="D"))
+            s.add(Filing(filing_id=f"{tag}{i}", source="house", filer_member_id=f"M{i}", filer_name_raw="x", filed_date=day, status="parsed"))
+        s.flush()
+        s.add_all(
+            Trade(trade_id=f"{tag}-{j}", filing_id=f"{tag}{j % 10}", txn_date=day - timedelta(days=j % 30),
+                  issuer_raw="Acme", ticker=f"T{j % 20}", amount_band="$1,001-$15,000")
+            for j in range(n)
+        )
+        s.commit()
+
+def test_scoring_statements_do_not_grow_with_trades(tmp_db):
+    counts = []
+    for tag, n in (("W", 10), ("A", 200), ("B", 800)):  # all within one chunk; "W" warms up the temp probe table
+        _seed(tag, n)
+        with QueryCounter() as qc:
+            assert score_all_new_trades() == n
+        counts.append(qc.n)
+    assert counts[1] == counts[2], counts
+
+def test_filings_ingested_before_their_member_are_linked(tmp_db):
+    since = date(2025, 1, 1)
+    ingest_rows({"house": house.list_new_filings(since), "senate": senate.list_new_filings(since)})
+    parse_all(workers=1)
+    map_all(True)
+    score_all_new_trades()
+    assert {k for _, k, *_ in _rollups()["MemberDayRollup"]} == {""}
+
+    load_members(force=True)
+    with get_session() as s:
+        filings = s.exec(select(Filing.filer_member_ref, Filing.filer_member_id)).all()
+    assert filings and all(ref == mid for ref, mid in filings)
+    linked = _rollups()
+    assert "" not in {k for _, k, *_ in linked["MemberDayRollup"]}
+    rebuild_rollups()
+    assert _rollups() == linked
+
+    assert compute_follow_scores() >= len(filings)
+    with get_session() as s:
+        assert all(s.get(Member, ref).follow_score > 0 for ref, _ in filings)
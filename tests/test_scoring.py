@@ -0,0 +1,69 @@
+from __future__ import annotations
+from datetime import date, timedelta
+import pytest
+from sqlmodel import select
+from ticker.db import get_session
+from ticker.enrich.members import load_members
+from ticker.fetch import house, senate
+from ticker.hotpath import ingest_rows, parse_all
+from ticker.models import Filing, Member, Signal, Trade
+from ticker.score import signals
+from ticker.score.signals import compute_follow_scores, score_all_new_trades
+
+@pytest.fixture
+def scored(tmp_db):
+    since = date(2025, 1, 1)
+    load_members(force=True)
+    ingest_rows({"house": house.list_new_filings(since), "senate": senate.list_new_filings(since)})
+    parse_all(workers=1)
+    with get_session() as s:
+        s.add(Trade(trade_id="recent:0", filing_id="H-CA-12-20250825-001", txn_date=date.today() - timedelta(days=10),
+                    issuer_raw="Apple", ticker="AAPL", amount_band="$1k-$15k"))
+        s.commit()
+    assert score_all_new_trades() == 8
+
+def _signals():
+    with get_session() as s:
+        return {g.signal_id: g for g in s.exec(select(Signal))}
+
+def test_scoring_skips_trades_whose_inputs_did_not_change(scored):
+    before = _signals()
+    assert score_all_new_trades() == 0
+
+    with get_session() as s:
+        s.get(Member, "H-OH-08").party = "I"  # loses the influence tag
+        s.commit()
+        davidson = set(s.exec(select(Trade.trade_id).join(Filing).where(Filing.filer_member_id == "H-OH-08")))
+    assert score_all_new_trades() == len(davidson)
+    after = _signals()
+    changed = {k for k in after if after[k].updated_at != before[k].updated_at}
+    assert changed == {f"S-{t}" for t in davidson}
+    assert all(after[k].created_at == before[k].created_at for k in after)
+
+def test_scoring_picks_up_trades_that_aged_out_of_a_window(scored, monkeypatch):
+    class _Later(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=40)
+
+    monkeypatch.setattr(signals, "date", _Later)
+    assert score_all_new_trades() == 1
+    assert _signals()["S-recent:0"].tags.split(",") == ["size_small", "recent90", "influence"]
+
+def test_follow_scores_recompute_only_members_with_new_signals(scored):
+    with get_session() as s:
+        members = len(s.exec(select(Member.member_id)).all())
+    assert compute_follow_scores() == members  # never scored
+    assert compute_follow_scores() == 0
+
+    with get_session() as s:
+        s.add(Trade(trade_id="new:0", filing_id="S-NY-00-20250822-001", txn_date=date.today(), issuer_raw="Apple", ticker="AAPL"))
+        s.commit()
+    assert score_all_new_trades() == 1
+    with get_session() as s:
+        stamp = s.get(Member, "H-CA-12").follow_score_updated_at
+    assert compute_follow_scores() == 1
+    with get_session() as s:
+        assert s.get(Member, "S-NY-00").follow_score_updated_at > stamp
+        assert s.get(Member, "H-CA-12").follow_score_updated_at == stamp
+    assert compute_follow_scores(force=True) == members
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import asyncio, time
+from datetime import date, timedelta
+from ticker.db import get_session
+from ticker.models import Filing, Member, Trade
+from ticker.tui import portfolio
+from ticker.tui.app import MenuApp
+from ticker.tui.portfolio import PAGE
+
+TRADES = PAGE * 3 + 17
+
+def _seed():
+    with get_session() as s:
+        s.add(Member(member_id="H-ZZ-01", first="Pat", last="Pager", chamber="house", state="ZZ"))
+        s.add(Filing(filing_id="F-1", source="house", filer_member_id="H-ZZ-01", filer_name_raw="Pager, Pat", filed_date=date(2025, 1, 1)))
+        s.add_all(
+            Trade(trade_id=f"T-{i:05d}", filing_id="F-1", txn_date=date(2024, 1, 1) + timedelta(days=i % 300), issuer_raw=f"Issuer {i}")
+            for i in range(TRADES)
+        )
+        s.commit()
+
+def test_portfolio_pages_reach_the_table(tmp_db, monkeypatch):
+    _seed()
+    fetch_page = portfolio.fetch_page
+
+    def slow_fetch(*a, **k):
+        time.sleep(0.05)  # keep each page in flight across several highlights
+        return fetch_page(*a, **k)
+
+    monkeypatch.setattr(portfolio, "fetch_page", slow_fetch)
+
+    async def run():
+        app = MenuApp()
+        async with app.run_test() as pilot:
+            view = app.portfolio
+            view.show_member("H-ZZ-01")
+            while view.current is None:
+                await pilot.pause(0.01)
+            step = 0
+            while not view.current.done or view._paging is not None:
+                # Keep highlighting the last rows, so highlights arrive while a page is in flight.
+                step += 1
+                view.table.move_cursor(row=view.table.row_count - 1 - step % 2)
+                await pilot.pause(0)
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            return view.table.row_count, len(view.current.rows)
+
+    shown, loaded = asyncio.run(run())
+    assert loaded == TRADES
+    assert shown == TRADES
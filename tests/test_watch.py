@@ -0,0 +1,87 @@
+from __future__ import annotations
+import asyncio
+from datetime import date
+import pytest
+from sqlmodel import select
+from ticker import pipeline, watch
+from ticker.db import get_session
+from ticker.fetch import house
+from ticker.hotpath import ingest_rows
+from ticker.models import Filing, SourceState
+
+@pytest.fixture
+def listing(tmp_db, monkeypatch):
+    rows = house.list_new_filings(date(2025, 1, 1))
+
+    async def _list(source, since):
+        return rows if source == "house" else []
+
+    monkeypatch.setattr(watch, "_list", _list)
+    monkeypatch.setattr(watch, "RETRY_BACKOFF", 0)
+    watch._PENDING.clear()
+    watch._RETRIES.clear()
+    return rows
+
+def _statuses():
+    with get_session() as s:
+        return dict(s.exec(select(Filing.filing_id, Filing.status)).all())
+
+def _tick():
+    """One watcher iteration: discover, process, mark processed (as ``_process_loop`` does)."""
+    changes = asyncio.run(watch.discover_changes("house"))
+    if changes:
+        asyncio.run(pipeline.run_pipeline(changes))
+        watch.mark_processed(changes)
+    return changes
+
+def test_failed_stage_is_retried(listing, monkeypatch):
+    def boom(*a, **k):
+        raise RuntimeError("score down")
+
+    real = pipeline.score_all_new_trades
+    monkeypatch.setattr(pipeline, "score_all_new_trades", boom)
+    assert len(_tick()["house"]) == len(listing)
+    assert set(_statuses().values()) == {"failed"}
+
+    monkeypatch.setattr(pipeline, "score_all_new_trades", real)
+    changes = _tick()
+    assert {r["filing_id"] for r in changes["house"]} == {r["filing_id"] for r in listing}
+    assert set(_statuses().values()) == {"parsed"}
+    assert _tick() == {}
+
+def test_ingested_but_unprocessed_is_requeued(listing):
+    # A run that died after ingest: filings are known but still "fetched".
+    assert len(asyncio.run(watch.discover_changes("house"))["house"]) == len(listing)
+    ingest_rows({"house": listing})
+    watch.mark_processed({"house": listing})
+    changes = asyncio.run(watch.discover_changes("house"))
+    assert len(changes["house"]) == len(listing)
+
+def test_retries_back_off_and_give_up(listing, monkeypatch):
+    def boom(*a, **k):
+        raise RuntimeError("score down")
+
+    monkeypatch.setattr(pipeline, "score_all_new_trades", boom)
+    assert _tick()
+    retried = sum(bool(_tick()) for _ in range(watch.MAX_RETRIES + 2))
+    assert retried == watch.MAX_RETRIES
+    assert set(_statuses().values()) == {"failed"}
+
+    monkeypatch.setattr(watch, "RETRY_BACKOFF", 60)
+    watch._RETRIES.clear()
+    assert _tick()  # left over from an earlier process: retried at once
+    assert _tick() == {}  # then not before the backoff
+
+def test_empty_listing_keeps_fingerprint(listing, monkeypatch):
+    _tick()
+    with get_session() as s:
+        fp = s.get(SourceState, "house").fingerprint
+    assert fp
+
+    async def _empty(source, since):
+        return []
+
+    monkeypatch.setattr(watch, "_list", _empty)
+    assert _tick() == {}
+    with get_session() as s:
+        assert s.get(SourceState, "house").fingerprint == fp
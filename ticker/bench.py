@@ -0,0 +1,398 @@
+from __future__ import annotations
+import json, os, random, statistics, subprocess, sys, time, tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .utils.logging import info, banner
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+TRADES_PER_FILING = 12
+BANDS = ["$1k-$15k", "$15k-$50k", "$50k-$100k", "$100k-$250k", "$250k-$500k", "$500k-$1m"]
+SUFFIXES = ["Inc.", "Corp.", "Corporation", "Holdings Inc.", "Group", "Co.", "PLC", "Ltd."]
+WORDS = (
+    "Advanced Allied American Applied Atlas Blue Bright Capital Cascade Central Coastal Core Crown Delta "
+    "Digital Dynamic Eagle Energy First Frontier General Global Granite Harbor Horizon Integrated Iron "
+    "Keystone Liberty Lunar Meridian Metro Micro National Nova Pacific Peak Pioneer Prime Quantum Radiant "
+    "Red River Silver Solar Summit Superior Systems Titan Trans United Vector Vista Western"
+).split()
+INDUSTRIES = "Bancorp Biotech Brands Chemicals Devices Energy Foods Logistics Materials Media Networks Pharma Realty Semiconductor Software Therapeutics".split()
+FIRST = "Alex Blair Casey Dana Drew Emerson Finley Harper Jordan Kendall Logan Morgan Parker Quinn Reese Riley Rowan Sage Taylor".split()
+LAST = "Adams Baker Carter Diaz Evans Foster Garcia Hayes Irwin Jensen Keller Lopez Morris Nguyen Ortiz Patel Reed Shaw Turner Walsh".split()
+STATES = "AL AZ CA CO FL GA IL MA MI NC NJ NY OH PA TX VA WA WI".split()
+
+def synth_companies(n: int, rng: random.Random) -> List[dict]:
+    """SEC-style company reference rows (``title``/``ticker``/``cik``) with unique titles and tickers."""
+    out, titles, tickers = [], set(), set()
+    while len(out) < n:
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(INDUSTRIES)} {rng.choice(SUFFIXES)}"
+        letters = "".join(w[0] for w in title.split()[:3]).upper()
+        ticker = letters + "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(0, 2)))
+        if title in titles or ticker in tickers:
+            continue
+        titles.add(title)
+        tickers.add(ticker)
+        out.append({"title": title, "ticker": ticker, "cik": 1_000_000 + len(out)})
+    return out
+
+def synth_members(n: int, rng: random.Random) -> List[dict]:
+    out = []
+    for i in range(n):
+        chamber = "senate" if i % 5 == 0 else "house"
+        state = rng.choice(STATES)
+        district = None if chamber == "senate" else str(i % 53 + 1)
+        out.append({
+            "member_id": f"B{chamber[0].upper()}-{state}-{i:04d}",
+            "first": rng.choice(FIRST),
+            "last": rng.choice(LAST),
+            "chamber": chamber,
+            "state": state,
+            "district": district,
+            "party": rng.choice(["D", "R", "R", "D", "I"]),
+            "active": True,
+        })
+    return out
+
+def _issuer_variant(title: str, rng: random.Random) -> str:
+    """Spelling drift seen in real PTRs: dropped/changed suffixes, case, extra punctuation."""
+    r = rng.random()
+    if r < 0.5:
+        return title
+    words = title.split()
+    if r < 0.75:
+        return " ".join(words[:-1])
+    if r < 0.9:
+        return " ".join(words[:-1]) + " " + rng.choice(SUFFIXES)
+    return title.upper().replace(".", "")
+
+def write_filings(root: str, members: List[dict], companies: List[dict], trades: int, rng: random.Random) -> List[dict]:
+    """Write PTR text files under ``root`` and return filing rows in fetcher format.
+
+    Issuers are drawn with a Zipf-like skew (a few names are traded a lot);
+    a third of lines omit the ticker so the mapper has work to do.
+    """
+    os.makedirs(root, exist_ok=True)
+    today = date.today()
+    weights = [1.0 / (i + 1) for i in range(len(companies))]
+    rows: List[dict] = []
+    n_filings = max(1, trades // TRADES_PER_FILING)
+    for i in range(n_filings):
+        m = members[rng.randrange(len(members))]
+        k = trades - i * TRADES_PER_FILING if i == n_filings - 1 else TRADES_PER_FILING
+        filed = today - timedelta(days=rng.randint(0, 180))
+        lines = []
+        for c in rng.choices(companies, weights=weights, k=k):
+            txn = filed - timedelta(days=rng.randint(1, 45))
+            ticker = c["ticker"] if rng.random() > 0.33 else ""
+            lines.append(
+                f"{txn.isoformat()} | {_issuer_variant(c['title'], rng)} | {ticker} | "
+                f"{rng.choice(['BUY', 'BUY', 'SELL'])} | {rng.choice(BANDS)}"
+            )
+        fid = f"{m['member_id']}-{filed:%Y%m%d}-{i:07d}"
+        path = os.path.join(root, f"{fid}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        rows.append({
+            "filing_id": fid,
+            "filer_member_id": m["member_id"],
+            "filer_name_raw": f"{m['last']}, {m['first']}",
+            "filed_date": filed.isoformat(),
+            "file_local_path": path,
+            "doc_type": "PTR",
+            "chamber": m["chamber"],
+        })
+    return rows
+
+# Modules ``import ticker.cli`` must not pull in (each command imports what it needs).
+HEAVY_MODULES = ("sqlalchemy", "sqlmodel", "textual", "rapidfuzz", "pdfplumber", "httpx", "ticker.db")
+STARTUP_BUDGET_MS = 400.0
+SCALING_STAGES = ("map", "score")
+SCALING_SLACK = 2.0  # allowed per-trade slowdown when the dataset grows (quadratic work shows as ~factor)
+
+def _py(code: str, *args: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code, *args]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+def startup_report(runs: int = 5, budget_ms: float = STARTUP_BUDGET_MS) -> dict:
+    """Cold-start cost of the CLI, measured in fresh interpreters.
+
+    Reports the median ``-X importtime`` total for ``ticker.cli`` and wall time
+    of ``ticker --help``, plus any heavy modules imported eagerly. ``ok`` is
+    False when a heavy module leaks in or the import exceeds ``budget_ms``.
+    """
+    imports, walls = [], []
+    for _ in range(runs):
+        err = _py("import ticker.cli", importtime=True).stderr
+        line = next(ln for ln in err.splitlines() if ln.rstrip().endswith("| ticker.cli"))
+        imports.append(int(line.split("|")[1]) / 1000.0)
+        t0 = time.perf_counter()
+        _py("import sys; sys.argv[0] = 'ticker'; from ticker.cli import app; app()", "--help")
+        walls.append((time.perf_counter() - t0) * 1000.0)
+    probe = f"import sys, ticker.cli; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    leaked = [m for m in _py(probe).stdout.strip().split(",") if m]
+    import_ms = statistics.median(imports)
+    return {
+        "import_ms": round(import_ms, 1),
+        "help_wall_ms": round(statistics.median(walls), 1),
+        "budget_ms": budget_ms,
+        "eager_heavy_modules": leaked,
+        "ok": not leaked and import_ms <= budget_ms,
+    }
+
+class QueryCounter:
+    """Counts SQL statements on every engine while installed."""
+
+    def __init__(self):
+        self.n = 0
+
+    def _on_execute(self, *args) -> None:
+        self.n += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Engine, "before_cursor_execute", self._on_execute)
+
+def _rss_mb() -> Optional[float]:
+    """Peak RSS of this process so far. ``ru_maxrss`` never drops, so per stage it
+    is a running maximum over every stage before it, not the stage's own usage."""
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def check_target(db_url: str) -> None:
+    """Raise ``ValueError`` if any of the app's tables in ``db_url`` holds a row (the bench writes synthetic data)."""
+    from sqlalchemy import create_engine, inspect, select
+    from sqlalchemy.engine import make_url
+    from sqlmodel import SQLModel
+    from . import models  # ensures models are imported
+    engine = create_engine(db_url)
+    try:
+        present = set(inspect(engine).get_table_names())
+        with engine.connect() as conn:
+            used = any(
+                conn.execute(select(1).select_from(t).limit(1)).first() is not None
+                for name, t in SQLModel.metadata.tables.items() if name in present
+            )
+    finally:
+        engine.dispose()
+    if used:
+        raise ValueError(f"{make_url(db_url).render_as_string(hide_password=True)} is not empty; pass --force to write bench data into it")
+
+def _timed(name: str, fn: Callable[[], Optional[int]], trades: int, memory: bool) -> dict:
+    if memory:
+        tracemalloc.start()
+    with QueryCounter() as qc:
+        t0 = time.perf_counter()
+        rows = fn()
+        secs = time.perf_counter() - t0
+    peak, rss = None, _rss_mb()
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    out = {
+        "stage": name,
+        "seconds": round(secs, 4),
+        "rows": rows,
+        "trades_per_s": round(trades / secs, 1) if secs else None,
+        "queries": qc.n,
+        "py_peak_mb": round(peak, 1) if peak is not None else None,
+        "process_rss_peak_mb": round(rss, 1) if rss is not None else None,
+    }
+    info(f"{name}: {secs:.2f}s, {qc.n} queries")
+    return out
+
+def run_bench(
+    trades: int,
+    workdir: str,
+    seed: int = 7,
+    companies: int = 5000,
+    db_url: Optional[str] = None,
+    workers: Optional[int] = None,
+    memory: bool = False,
+    force: bool = False,
+) -> dict:
+    """Generate a synthetic dataset of ``trades`` trades in ``workdir`` and time every stage on it.
+
+    Uses a fresh SQLite database in ``workdir`` unless ``db_url`` is given; a
+    ``db_url`` that already holds data is refused (``ValueError``) unless
+    ``force``, since the bench writes synthetic members and filings into it.
+    Returns a JSON-serializable report.
+    """
+    from . import db
+    from .db import get_session, upsert
+    from .models import Member
+    from .mapsec import issuers
+    from .hotpath import ingest_rows, parse_all, map_all
+    from .score.signals import score_all_new_trades, compute_follow_scores
+    from .stats import table_daily_report
+
+    banner(f"Bench • {trades:,} trades")
+    rng = random.Random(seed)
+    os.makedirs(workdir, exist_ok=True)
+    if db_url is None:
+        path = os.path.join(workdir, "bench.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        db_url = f"sqlite:///{path}"
+    elif not force:
+        check_target(db_url)
+    db.use_database(db_url)
+    db.init_db()
+
+    ref = synth_companies(companies, rng)
+    members = synth_members(min(535, max(20, trades // 100)), rng)
+    stages: List[dict] = []
+    filings: List[dict] = []
+
+    def generate() -> int:
+        nonlocal filings
+        filings = write_filings(os.path.join(workdir, "filings"), members, ref, trades, rng)
+        with get_session() as s:
+            for chunk in db.batched(members, 500):
+                upsert(s, Member, chunk, ["member_id"])
+            s.commit()
+        return len(filings)
+
+    def ingest() -> int:
+        by_source: Dict[str, List[dict]] = {}
+        for r in filings:
+            by_source.setdefault(r["chamber"], []).append(r)
+        return ingest_rows(by_source)
+
+    def resolver() -> int:
+        issuers._RESOLVER = issuers.IssuerResolver({r["title"].lower(): r for r in ref})
+        return len(ref)
+
+    for name, fn in (
+        ("generate", generate),
+        ("ingest", ingest),
+        ("parse", lambda: parse_all(workers=workers)),
+        ("parse-noop", lambda: parse_all(workers=workers)),
+        ("resolver-build", resolver),
+        ("map", lambda: map_all(True)),
+        ("score", lambda: score_all_new_trades()),
+        ("score-noop", lambda: score_all_new_trades()),
+        ("follow", lambda: compute_follow_scores()),
+        ("stats", lambda: table_daily_report().row_count),
+    ):
+        stages.append(_timed(name, fn, trades, memory))
+
+    return {
+        "trades": trades,
+        "filings": len(filings),
+        "members": len(members),
+        "companies": len(ref),
+        "seed": seed,
+        "db": db_url.split("://", 1)[0],
+        "python": sys.version.split()[0],
+        "stages": stages,
+    }
+
+def scaling_report(
+    trades: int,
+    workdir: str,
+    factor: int = 4,
+    slack: float = SCALING_SLACK,
+    stages=SCALING_STAGES,
+    **kwargs,
+) -> dict:
+    """Run the bench at ``trades`` and ``factor × trades`` and check that ``stages`` scale linearly.
+
+    ``growth`` is the ratio of per-trade seconds (large / small) for each
+    stage; ``ok`` is False when any exceeds ``slack``.
+    """
+    runs = [run_bench(n, os.path.join(workdir, f"scaling-{n}"), **kwargs) for n in (trades, trades * factor)]
+    secs = [{r["stage"]: r["seconds"] for r in run["stages"]} for run in runs]
+    out = {}
+    for name in stages:
+        small, large = secs[0][name], secs[1][name]
+        growth = (large / (trades * factor)) / (small / trades) if small else None
+        out[name] = {"seconds": [small, large], "growth": round(growth, 2) if growth is not None else None}
+    return {
+        "trades": [trades, trades * factor],
+        "slack": slack,
+        "stages": out,
+        "ok": all(s["growth"] is None or s["growth"] <= slack for s in out.values()),
+    }
+
+def _cdist_union(resolver, keys: List[str], block: int) -> int:
+    """Score ``keys`` ``block`` at a time with one ``cdist`` over the union of their shortlists; returns hits."""
+    import numpy as np
+    from rapidfuzz import fuzz, process
+    from .mapsec.issuers import FUZZY_CUTOFF
+    hits = 0
+    for b in range(0, len(keys), block):
+        batch = keys[b:b + block]
+        shortlists = [resolver._shortlist(k) for k in batch]
+        cols = sorted(set().union(*shortlists))
+        pos = {c: j for j, c in enumerate(cols)}
+        scores = process.cdist(
+            batch, [resolver.names[c] for c in cols],
+            scorer=fuzz.token_set_ratio, score_cutoff=FUZZY_CUTOFF, dtype=np.uint8,
+        )
+        for row, shortlist in zip(scores, shortlists):
+            hits += bool(shortlist) and bool(row[[pos[c] for c in shortlist]].max())
+    return hits
+
+def resolver_report(issuers: int = 2000, companies: int = 5000, seed: int = 7, block: int = 64) -> dict:
+    """Time fuzzy issuer resolution per issuer (``extractOne`` over its own shortlist, as
+    ``IssuerResolver`` does) against batching with ``process.cdist`` over the union of
+    ``block`` issuers' shortlists.
+
+    ``ok`` is True while per-issuer scoring is the faster of the two.
+    """
+    from .mapsec.issuers import IssuerResolver, issuer_key
+    rng = random.Random(seed)
+    ref = synth_companies(companies, rng)
+    resolver = IssuerResolver({r["title"]: r for r in ref})
+    names = (_issuer_variant(rng.choice(ref)["title"], rng) + rng.choice(["", " Holdings", " Grp"]) for _ in range(issuers * 2))
+    keys = [k for k in dict.fromkeys(issuer_key(n) for n in names) if k not in resolver.exact][:issuers]
+    banner(f"Bench • resolver ({len(keys):,} fuzzy misses, {len(ref):,} companies)")
+    t0 = time.perf_counter()
+    per_issuer = sum(resolver._resolve_key(k, True).ticker is not None for k in keys)
+    t1 = time.perf_counter()
+    batched = _cdist_union(resolver, keys, block)
+    t2 = time.perf_counter()
+    info(f"per-issuer: {t1 - t0:.2f}s, cdist over shortlist union: {t2 - t1:.2f}s")
+    return {
+        "issuers": len(keys),
+        "companies": len(ref),
+        "block": block,
+        "per_issuer": {"seconds": round(t1 - t0, 4), "hits": per_issuer},
+        "cdist_union": {"seconds": round(t2 - t1, 4), "hits": batched},
+        "ok": t1 - t0 <= t2 - t1,
+    }
+
+def dump(report: dict, path: str) -> None:
+    """Write the report as JSON to ``path`` (``-`` for stdout)."""
+    text = json.dumps(report, indent=2)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+def table(report: dict):
+    from rich.table import Table
+    t = Table(title=f"Ticker • Bench ({report['trades']:,} trades, {report['filings']:,} filings)")
+    for col in ("Stage", "Seconds", "Trades/s", "Rows", "Queries", "Py peak MB", "Process RSS peak MB"):
+        t.add_column(col, justify="left" if col == "Stage" else "right")
+    for r in report["stages"]:
+        t.add_row(
+            r["stage"],
+            f"{r['seconds']:.3f}",
+            f"{r['trades_per_s']:,.0f}" if r["trades_per_s"] else "-",
+            "-" if r["rows"] is None else f"{r['rows']:,}",
+            str(r["queries"]),
+            "-" if r["py_peak_mb"] is None else f"{r['py_peak_mb']:.1f}",
+            "-" if r["process_rss_peak_mb"] is None else f"{r['process_rss_peak_mb']:.1f}",
+        )
+    return t
@@ -1,52 +1,132 @@
 from __future__ import annotations
-import asyncio
 import typer
 from rich import print
-from .db import init_db
-from .hotpath import run_hotpath_once, ingest_since, parse_all, map_all
-from .score.signals import score_all_new_trades, compute_follow_scores
-from .enrich.members import load_members
-from .enrich.committees import load_committees
-from .stats import print_last_24h_report
-from .watch import run_watch, status as watch_status
-from .tui.app import run_menu
+
+# Commands import what they use on demand: cron/scripts call ``ticker`` often and
+# short commands should not pay for textual, rapidfuzz, httpx or the engine.
 
 app = typer.Typer(add_completion=False, no_args_is_help=True, help="Ticker CLI")
 
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Profile the command (cProfile + SQL counts, N+1 detection)"),
+    profile_out: str = typer.Option(None, help="Report path (default: ticker-profile-<command>-<time>.txt)"),
+):
+    """Ticker CLI"""
+    if not profile:
+        return
+    from .profiling import Profiler
+    prof = Profiler(ctx.invoked_subcommand or "ticker")
+    prof.start()
+
+    def _finish():
+        prof.stop()
+        path = prof.write(profile_out)
+        suspects = prof.suspects()
+        print(f"[cyan]Profile: {prof.elapsed:.2f}s, {prof.statements} SQL statements, "
+              f"{len(suspects)} repeated shape(s) → {path}[/]")
+        for shape, n in suspects[:5]:
+            print(f"[yellow]  {n}x[/] {shape[:120]}")
+
+    ctx.call_on_close(_finish)
+
 @app.command(name="init-db")
 def init_db_cmd():
     """Initialize the database."""
+    from .db import init_db
+    from .enrich.members import load_members
+    from .enrich.committees import load_committees
     init_db()
     load_members()
     load_committees()
     print('[green]DB initialized and fixtures loaded.[/]')
 
 @app.command()
-def hotpath(action: str = typer.Argument("run"), score: bool = typer.Option(True), alerts: bool = typer.Option(False)):
-    """Fetch → parse → map → (score) in one go."""
-    if action != "run":
-        raise typer.BadParameter("Only 'run' is supported")
-    run_hotpath_once(score=score, alerts=alerts)
+def db(action: str = typer.Argument(...), to: int = typer.Option(None, help="migrate: stop at this version")):
+    """Manage schema migrations (migrate|current|history)."""
+    from .db import get_engine
+    from .migrations import MIGRATIONS, migrate, current, applied
+    engine = get_engine()
+    if action == "migrate":
+        ran = migrate(engine, target=to)
+        print(f"[green]Applied migrations: {ran}[/]" if ran else "[green]Schema is up to date.[/]")
+    elif action == "current":
+        print(current(engine))
+    elif action == "history":
+        from rich.table import Table
+        done = applied(engine)
+        t = Table(title="Schema migrations")
+        for col in ("Version", "Name", "Applied at"):
+            t.add_column(col)
+        for m in MIGRATIONS:
+            t.add_row(str(m.version), m.name, str(done[m.version][1]) if m.version in done else "[yellow]pending[/]")
+        print(t)
+    else:
+        raise typer.BadParameter("Use migrate|current|history")
+
+@app.command()
+def hotpath(action: str = typer.Argument("run"), score: bool = typer.Option(True), alerts: bool = typer.Option(False), sources: str = typer.Option("house,senate")):
+    """Fetch → parse → map → (score) in one go (run), or per filing as new filings appear (stream)."""
+    if action == "run":
+        from .hotpath import run_hotpath_once
+        run_hotpath_once(score=score, alerts=alerts)
+    elif action == "stream":
+        import asyncio
+        from .watch import discover_changes, mark_processed
+        from .pipeline import run_pipeline
+
+        async def _stream():
+            changes = await discover_changes(sources)
+            if changes:
+                await run_pipeline(changes, score=score)
+                mark_processed(changes)
+            return changes
+
+        changes = asyncio.run(_stream())
+        if alerts and changes:
+            from . import metrics
+            from .notify.alerts import send_alerts
+            with metrics.stage("alerts"):
+                send_alerts(["New filings processed and scored"])
+            metrics.flush()
+    else:
+        raise typer.BadParameter("Use run|stream")
 
 @app.command()
 def ingest(source: str = typer.Argument(...), since: str = typer.Option(None)):
     """Ingest filings since a given date (YYYY-MM-DD)."""
     from datetime import date
+    from .hotpath import ingest_since
     d = date.fromisoformat(since) if since else None
     ingest_since(60 if d is None else (date.today() - d).days)
 
+@app.command(name="serve-fixtures")
+def serve_fixtures(host: str = typer.Option("127.0.0.1"), port: int = typer.Option(8765)):
+    """Serve fixtures over HTTP as a stand-in for the live sources."""
+    from .fetch.standin import make_server
+    srv = make_server(host, port)
+    print(f"[green]Serving fixtures on http://{host}:{port}/{{house,senate}}/index.json[/]")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        srv.server_close()
+
 @app.command()
-def parse(source: str = typer.Option(None)):
-    """Parse all filings (source arg is ignored in DEV mode)."""
-    parse_all()
+def parse(source: str = typer.Option(None), force: bool = typer.Option(False, help="Re-parse filings even if unchanged"), workers: int = typer.Option(0, help="PDF extraction processes (0 = config default)")):
+    """Parse new or changed filings (source arg is ignored in DEV mode)."""
+    from .hotpath import parse_all
+    parse_all(force=force, workers=workers or None)
 
 @app.command()
-def enrich(what: str = typer.Argument(...)):
+def enrich(what: str = typer.Argument(...), force: bool = typer.Option(True, help="Reload even if the source CSVs are unchanged")):
     """Enrich database with members or committees."""
     if what == "members":
-        load_members()
+        from .enrich.members import load_members
+        load_members(force=force)
     elif what == "committees":
-        load_committees()
+        from .enrich.committees import load_committees
+        load_committees(force=force)
     else:
         raise typer.BadParameter("Unknown enrich target") 
 
@@ -55,36 +135,232 @@ def map(what: str = typer.Argument("issuers"), fuzzy: bool = typer.Option(True))
     """Map issuers to tickers (using SEC reference data)."""
     if what != "issuers":
         raise typer.BadParameter("Only 'issuers' supported")
+    from .hotpath import map_all
     map_all(fuzzy)
 
 @app.command()
-def score(what: str = typer.Argument("signals")):
+def alias(
+    action: str = typer.Argument("list"),
+    issuer: str = typer.Argument(None),
+    ticker: str = typer.Argument(None),
+    cik: int = typer.Option(None),
+    below: float = typer.Option(0.9, help="list: only aliases under this confidence"),
+):
+    """Review or override learned issuer aliases (list|set|drop)."""
+    from rich.table import Table
+    from .db import get_session
+    from .mapsec.aliases import list_aliases, set_alias, drop_alias
+    from .mapsec.issuers import issuer_key
+    with get_session() as s:
+        if action == "list":
+            t = Table(title=f"Issuer aliases (confidence < {below:.2f})")
+            for col in ("Issuer", "Ticker", "CIK", "Conf", "Method", "First seen"):
+                t.add_column(col)
+            for a in list_aliases(s, below=below):
+                t.add_row(a.issuer_key, a.ticker, str(a.cik or "-"), f"{a.confidence:.2f}", a.method, a.first_seen.strftime("%Y-%m-%d"))
+            print(t)
+        elif action == "set":
+            if not issuer or not ticker:
+                raise typer.BadParameter("Usage: ticker alias set ISSUER TICKER [--cik N]")
+            n = set_alias(s, issuer_key(issuer), ticker.upper(), cik)
+            s.commit()
+            print(f"[green]Pinned '{issuer_key(issuer)}' → {ticker.upper()} ({n} trades re-mapped).[/]")
+        elif action == "drop":
+            if not issuer:
+                raise typer.BadParameter("Usage: ticker alias drop ISSUER")
+            ok = drop_alias(s, issuer_key(issuer))
+            s.commit()
+            print("[green]Alias dropped.[/]" if ok else "[yellow]No such alias.[/]")
+        else:
+            raise typer.BadParameter("Use list|set|drop")
+
+@app.command()
+def score(what: str = typer.Argument("signals"), force: bool = typer.Option(False, help="Re-score every trade and member")):
     """Score trades and update follow likelihoods."""
     if what != "signals":
         raise typer.BadParameter("Only 'signals' supported")
-    score_all_new_trades()
-    compute_follow_scores()
+    from .score.signals import score_all_new_trades, compute_follow_scores
+    score_all_new_trades(force=force)
+    compute_follow_scores(force=force)
 
 @app.command()
-def stats(period: str = typer.Argument("last-24h"), format: str = typer.Option("table")):
-    """Show stats for the last 24h."""
-    if period != "last-24h":
-        raise typer.BadParameter("Only last-24h supported in MVP")
-    print_last_24h_report()
+def stats(
+    period: str = typer.Argument("last-24h", help="last-24h|today|last-Nd|mtd|ytd|all|pipeline|rebuild"),
+    format: str = typer.Option("table", help="table|json|csv"),
+    days: int = typer.Option(7, help="pipeline: look-back window"),
+    start: str = typer.Option(None, "--from", help="YYYY-MM-DD (overrides the period)"),
+    end: str = typer.Option(None, "--to", help="YYYY-MM-DD (default: today)"),
+    by: str = typer.Option("member", help="member|ticker"),
+    top: int = typer.Option(10, help="rows to show"),
+    sort: str = typer.Option("score", help="score|avg|volume|trades"),
+):
+    """Show period leaderboards from the day rollups, the last 24h, or pipeline latency."""
+    if format not in ("table", "json", "csv"):
+        raise typer.BadParameter("Use --format table|json|csv")
+    if period == "last-24h" and not (start or end):
+        from .stats import print_last_24h_report
+        print_last_24h_report(format)
+    elif period == "pipeline":
+        from .stats import print_pipeline_report
+        print_pipeline_report(days, format)
+    elif period == "rebuild":
+        from .score.rollups import rebuild_rollups
+        print(f"[green]Rebuilt {rebuild_rollups()} rollup rows.[/]")
+    else:
+        from datetime import date
+        from .stats import SORTS, emit, leaderboard, resolve_period, table_leaderboard
+        if by not in ("member", "ticker"):
+            raise typer.BadParameter("Use --by member|ticker")
+        if sort not in SORTS:
+            raise typer.BadParameter("Use --sort " + "|".join(SORTS))
+        try:
+            lo, hi = resolve_period(
+                period,
+                date.fromisoformat(start) if start else None,
+                date.fromisoformat(end) if end else None,
+            )
+        except ValueError:
+            raise typer.BadParameter("Use last-24h|today|last-Nd|mtd|ytd|all|pipeline|rebuild, or --from/--to YYYY-MM-DD")
+        rows = leaderboard(lo, hi, by=by, top=top, sort=sort)
+        emit(rows, format, table_leaderboard(rows, by, lo, hi, sort) if format == "table" else None)
 
 @app.command()
-def watch(action: str = typer.Argument(...), interval: int = typer.Option(75), jitter: int = typer.Option(20), sources: str = typer.Option("house,senate")):
+def watch(
+    action: str = typer.Argument(...),
+    interval: int = typer.Option(75, help="Poll interval at peak filing times (seconds)"),
+    jitter: int = typer.Option(20),
+    sources: str = typer.Option("house,senate"),
+    adaptive: bool = typer.Option(True, help="Back off when filings are unlikely (--no-adaptive = fixed interval)"),
+    max_interval: int = typer.Option(240, help="Longest adaptive interval (seconds); above 300 misses the 5-minute freshness target"),
+):
     """Run or check the background watcher."""
     if action == "start":
-        asyncio.run(run_watch(interval=interval, jitter=jitter, sources=sources))
+        import asyncio
+        from .watch import run_watch
+        asyncio.run(run_watch(interval=interval, jitter=jitter, sources=sources, adaptive=adaptive, max_interval=max_interval))
     elif action == "status":
         from rich.pretty import pprint
+        from .watch import status as watch_status
         pprint(watch_status())
+    elif action == "schedule":
+        from rich.pretty import pprint
+        from .schedule import Scheduler
+        from .watch import parse_sources
+        sch = Scheduler(base=interval, ceiling=max_interval)
+        for src in parse_sources(sources):
+            sch.next_delay(src)
+        pprint(sch.describe())
+    else:
+        raise typer.BadParameter("Use start|status|schedule")
+
+@app.command()
+def cache(action: str = typer.Argument(...), max_mb: int = typer.Option(None, help="Prune down to this size (default: TICKER_CACHE_MAX_MB)")):
+    """Inspect or prune the extracted-text cache and compiled reference snapshots."""
+    from .parse.cache import get_text_cache
+    c = get_text_cache()
+    if action == "stats":
+        from rich.pretty import pprint
+        pprint(c.stats())
+    elif action == "prune":
+        removed = c.prune(None if max_mb is None else max_mb * 1024 * 1024)
+        print(f"[green]Pruned {removed} cache entries.[/]")
+    elif action == "refdata":
+        from rich.pretty import pprint
+        from .refdata import status
+        pprint(status())
+    elif action == "refdata-clear":
+        from .refdata import clear
+        print(f"[green]Removed {clear()} reference snapshots (rebuilt on next use).[/]")
     else:
-        raise typer.BadParameter("Use start|status") 
+        raise typer.BadParameter("Use stats|prune|refdata|refdata-clear")
+
+@app.command()
+def prices(
+    action: str = typer.Argument(..., help="load|status|rebuild|lookup"),
+    paths: list[str] = typer.Argument(None, help="load: CSV/Parquet files or directories; lookup: TICKER YYYY-MM-DD"),
+    db: bool = typer.Option(True, help="load: also upsert closes into the PriceCache table"),
+    max_days: int = typer.Option(None, help="lookup: ignore closes more than this many days after the date"),
+):
+    """Import end-of-day closes from local files into the columnar price store."""
+    from rich.pretty import pprint
+    if action == "load":
+        if not paths:
+            raise typer.BadParameter("Usage: ticker prices load PATH...")
+        from .prices import load_prices
+        try:
+            pprint(load_prices(paths, to_db=db))
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(str(e))
+    elif action == "status":
+        from .prices import status
+        pprint(status())
+    elif action == "rebuild":
+        from .prices import rebuild_from_db
+        print(f"[green]Price store rebuilt from PriceCache ({rebuild_from_db()} closes).[/]")
+    elif action == "lookup":
+        if not paths or len(paths) != 2:
+            raise typer.BadParameter("Usage: ticker prices lookup TICKER YYYY-MM-DD")
+        from .prices import PriceStore
+        closes, on = PriceStore.open().close_on_or_after([paths[0]], [paths[1]], max_days=max_days)
+        print(f"{paths[0].upper()} {on[0]} {closes[0]:.4f}" if closes[0] == closes[0] else "[yellow]No close on or after that date.[/]")
+    else:
+        raise typer.BadParameter("Use load|status|rebuild|lookup")
+
+@app.command()
+def bench(
+    scale: str = typer.Argument("10k", help="10k|100k|1m trades, 'startup' for CLI import time, 'scaling' for a linear-growth check, or 'resolver' for fuzzy-matching strategies"),
+    trades: int = typer.Option(0, help="Exact trade count (overrides scale)"),
+    workdir: str = typer.Option(".ticker_bench", help="Where synthetic filings and the bench DB are written"),
+    out: str = typer.Option(None, help="JSON report path ('-' for stdout; default: <workdir>/bench-<scale>-<time>.json)"),
+    db_url: str = typer.Option(None, help="Benchmark against this database instead of a fresh SQLite file"),
+    force: bool = typer.Option(False, help="Allow --db-url to point at a database that already holds data"),
+    seed: int = typer.Option(7),
+    companies: int = typer.Option(5000, help="Synthetic company reference size"),
+    workers: int = typer.Option(0, help="PDF extraction processes (0 = config default)"),
+    memory: bool = typer.Option(False, help="Track Python peak memory per stage (slower)"),
+    budget_ms: float = typer.Option(None, help="startup: fail above this import time (default 400)"),
+):
+    """Generate a synthetic dataset and time every pipeline stage on it."""
+    from contextlib import nullcontext
+    from datetime import datetime
+    from rich.console import Console
+    from .bench import SCALES, STARTUP_BUDGET_MS, check_target, resolver_report, run_bench, scaling_report, startup_report, dump, table
+    from .utils.logging import logs_to_stderr
+    if scale == "startup":
+        with logs_to_stderr() if (out or "-") == "-" else nullcontext():
+            report = startup_report(budget_ms=budget_ms or STARTUP_BUDGET_MS)
+        dump(report, out or "-")
+        raise typer.Exit(0 if report["ok"] else 1)
+    if scale == "resolver":
+        with logs_to_stderr() if (out or "-") == "-" else nullcontext():
+            report = resolver_report(issuers=trades or 2000, companies=companies, seed=seed)
+        dump(report, out or "-")
+        raise typer.Exit(0 if report["ok"] else 1)
+    if scale == "scaling":
+        with logs_to_stderr() if (out or "-") == "-" else nullcontext():
+            report = scaling_report(trades or 5000, workdir, seed=seed, companies=companies, workers=workers or None)
+        dump(report, out or "-")
+        raise typer.Exit(0 if report["ok"] else 1)
+    n = trades or SCALES.get(scale.lower())
+    if not n:
+        raise typer.BadParameter(f"Use {'|'.join(SCALES)} or --trades N")
+    if db_url and not force:
+        try:
+            check_target(db_url)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--db-url")
+    path = out or f"{workdir}/bench-{scale.lower() if not trades else n}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    with logs_to_stderr() if path == "-" else nullcontext():
+        report = run_bench(n, workdir, seed=seed, companies=companies, db_url=db_url, workers=workers or None, memory=memory, force=force)
+    if path != "-":
+        Console(stderr=True).print(table(report))
+        print(f"[green]Report written to {path}[/]")
+    dump(report, path)
 
 @app.command()
 def menu():
     """Launch interactive TUI menu."""
+    from .tui.app import run_menu
+    from .stats import print_last_24h_report
     run_menu()
     print_last_24h_report()
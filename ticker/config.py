@@ -11,5 +11,30 @@ class Config:
     dev: bool = os.getenv("TICKER_DEV", "1") == "1"
     db_url: str = os.getenv("TICKER_DB_URL", "sqlite:///ticker.db")
     tz: str = os.getenv("TICKER_TZ", "America/New_York")
+    # SQLite tuning (ignored for other backends)
+    db_journal_mode: str = os.getenv("TICKER_DB_JOURNAL_MODE", "WAL")
+    db_synchronous: str = os.getenv("TICKER_DB_SYNCHRONOUS", "NORMAL")
+    db_busy_timeout_ms: int = int(os.getenv("TICKER_DB_BUSY_TIMEOUT_MS", "5000"))
+    db_cache_kb: int = int(os.getenv("TICKER_DB_CACHE_KB", "65536"))
+    db_mmap_mb: int = int(os.getenv("TICKER_DB_MMAP_MB", "256"))
+    parse_workers: int = int(os.getenv("TICKER_PARSE_WORKERS", "0"))  # 0 = one per CPU
+    parse_timeout: float = float(os.getenv("TICKER_PARSE_TIMEOUT", "120"))  # seconds per document
+    # Live fetchers
+    data_dir: str = os.getenv("TICKER_DATA_DIR", "data/filings")
+    house_index_url: str = os.getenv(
+        "TICKER_HOUSE_INDEX_URL", "https://disclosures-clerk.house.gov/public_disc/financial-pdfs/{year}FD.zip"
+    )
+    house_pdf_url: str = os.getenv(
+        "TICKER_HOUSE_PDF_URL", "https://disclosures-clerk.house.gov/public_disc/ptr-pdfs/{year}/{doc_id}.pdf"
+    )
+    senate_index_url: str = os.getenv("TICKER_SENATE_INDEX_URL", "")
+    http_concurrency: int = int(os.getenv("TICKER_HTTP_CONCURRENCY", "4"))
+    http_rate: float = float(os.getenv("TICKER_HTTP_RATE", "2"))  # requests/second
+    http_timeout: float = float(os.getenv("TICKER_HTTP_TIMEOUT", "30"))
+    http_retries: int = int(os.getenv("TICKER_HTTP_RETRIES", "4"))
+    http_user_agent: str = os.getenv("TICKER_HTTP_USER_AGENT", "ticker-cli/0.1 (+https://github.com/kilodelta8/Ticker)")
+    sec_tickers_path: str = os.getenv("TICKER_SEC_TICKERS_PATH", "")  # full SEC company_tickers.json (default: sample)
+    cache_dir: str = os.getenv("TICKER_CACHE_DIR", ".ticker_cache")
+    cache_max_mb: int = int(os.getenv("TICKER_CACHE_MAX_MB", "512"))
 
 CFG = Config()
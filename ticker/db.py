@@ -1,15 +1,188 @@
 from __future__ import annotations
+from typing import Any, Iterable, Iterator, List, Sequence
+from sqlalchemy import event
 from sqlmodel import SQLModel, create_engine, Session
 from .config import CFG
 
-# Create engine from environment
-engine = create_engine(CFG.db_url, echo=False)
+def _sqlite_pragmas(engine, read_only: bool = False) -> None:
+    """Apply journaling/locking/cache pragmas from ``CFG`` on every new SQLite connection."""
+    memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        if not memory:
+            cur.execute(f"PRAGMA journal_mode={CFG.db_journal_mode}")
+        cur.execute(f"PRAGMA synchronous={CFG.db_synchronous}")
+        cur.execute(f"PRAGMA busy_timeout={CFG.db_busy_timeout_ms}")
+        cur.execute(f"PRAGMA cache_size=-{CFG.db_cache_kb}")
+        cur.execute(f"PRAGMA mmap_size={CFG.db_mmap_mb * 1024 * 1024}")
+        if read_only:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+def _make_engine(read_only: bool = False):
+    eng = create_engine(CFG.db_url, echo=False)
+    if eng.dialect.name == "sqlite":
+        _sqlite_pragmas(eng, read_only=read_only)
+    elif read_only and eng.dialect.name == "postgresql":
+        eng = eng.execution_options(postgresql_readonly=True)
+    return eng
+
+# Engines are built from ``CFG`` on first use: one read/write, one for read-only query surfaces
+_engine = None
+_read_engine = None
+
+def get_engine():
+    """The read/write engine (created on first call)."""
+    global _engine
+    if _engine is None:
+        _engine = _make_engine()
+    return _engine
+
+def get_read_engine():
+    """The read-only engine (created on first call)."""
+    global _read_engine
+    if _read_engine is None:
+        _read_engine = _make_engine(read_only=True)
+    return _read_engine
+
+def __getattr__(name: str):
+    # ``db.engine`` / ``db.read_engine`` stay available without building engines at import time
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def use_database(url: str) -> None:
+    """Point ``get_session``/``get_read_session`` at another database (bench, tools)."""
+    global _engine, _read_engine
+    CFG.db_url = url
+    _engine = _read_engine = None
 
 def init_db() -> None:
-    """Initialize database schema."""
+    """Initialize database schema and apply pending migrations."""
     from . import models  # ensures models are imported
+    from .migrations import migrate
+    engine = get_engine()
     SQLModel.metadata.create_all(engine)
+    migrate(engine)
 
 def get_session() -> Session:
     """Get a database session."""
-    return Session(engine)
+    return Session(get_engine())
+
+def get_read_session() -> Session:
+    """Get a read-only session (stats, TUI); never takes the write lock."""
+    return Session(get_read_engine())
+
+def _dialect_insert(s: Session, model: type[SQLModel]):
+    """Dialect ``insert()`` supporting ON CONFLICT, or None when the backend has none."""
+    dialect = s.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(model)
+
+def upsert(s: Session, model: type[SQLModel], rows: Sequence[dict], keys: Iterable[str], insert_only: Iterable[str] = ()) -> int:
+    """Insert-or-update ``rows`` into ``model``'s table in one statement.
+
+    Uses ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite/PostgreSQL, with ``rows``
+    passed as parameters so the statement is compiled once (and cached) instead
+    of being rendered with a bind per value; falls back to ``Session.merge``
+    elsewhere. ``insert_only`` columns (e.g. creation timestamps) are written
+    for new rows and left untouched on existing ones.
+    """
+    if not rows:
+        return 0
+    keys = list(keys)
+    keep = set(insert_only)
+    stmt = _dialect_insert(s, model)
+    if stmt is not None:
+        cols = [c for c in rows[0] if c not in keys and c not in keep]
+        if cols:
+            stmt = stmt.on_conflict_do_update(index_elements=keys, set_={c: stmt.excluded[c] for c in cols})
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+        s.exec(stmt, params=list(rows))
+    elif keep:
+        for r in rows:
+            cur = s.get(model, tuple(r[k] for k in keys) if len(keys) > 1 else r[keys[0]])
+            if cur is None:
+                s.add(model(**r))
+            else:
+                for c, v in r.items():
+                    if c not in keep:
+                        setattr(cur, c, v)
+    else:
+        for r in rows:
+            s.merge(model(**r))
+    return len(rows)
+
+def insert_missing(s: Session, model: type[SQLModel], rows: Sequence[dict], keys: Iterable[str]) -> int:
+    """Insert ``rows`` whose ``keys`` are not present yet, leaving existing rows untouched.
+
+    One ``INSERT ... ON CONFLICT DO NOTHING`` statement on SQLite/PostgreSQL;
+    elsewhere rows are added one by one after a key lookup. Returns the number
+    of rows inserted.
+    """
+    if not rows:
+        return 0
+    keys = list(keys)
+    stmt = _dialect_insert(s, model)
+    if stmt is not None:
+        res = s.exec(stmt.values(list(rows)).on_conflict_do_nothing(index_elements=keys))
+        return res.rowcount if res.rowcount is not None and res.rowcount >= 0 else len(rows)
+    n = 0
+    for r in rows:
+        ident = tuple(r[k] for k in keys)
+        if s.get(model, ident if len(ident) > 1 else ident[0]) is None:
+            s.add(model(**r))
+            n += 1
+    return n
+
+CHUNK = 1000
+
+def _key_of(row: Any, col) -> Any:
+    cls = col.class_
+    if isinstance(row, cls):
+        return getattr(row, col.key)
+    for v in row:
+        if isinstance(v, cls):
+            return getattr(v, col.key)
+    return row._mapping[col]
+
+def iter_chunks(s: Session, stmt, key_col, size: int = CHUNK) -> Iterator[List[Any]]:
+    """Keyset-paginate ``stmt`` on a unique ``key_col``, yielding lists of up to ``size`` rows.
+
+    Each page is a fresh ``WHERE key > :last ORDER BY key LIMIT :size`` query, so
+    callers may write (and commit) between pages. Pending changes are flushed and
+    the identity map is cleared after every page to keep memory flat.
+    """
+    last = None
+    while True:
+        q = stmt.order_by(key_col).limit(size)
+        if last is not None:
+            q = q.where(key_col > last)
+        rows = s.exec(q).all()
+        if not rows:
+            return
+        last = _key_of(rows[-1], key_col)
+        yield rows
+        s.flush()
+        s.expunge_all()
+
+def stream(s: Session, stmt, size: int = CHUNK) -> Iterator[Any]:
+    """Iterate a read-only query server-side (``yield_per``), clearing the identity map every ``size`` rows."""
+    for part in s.exec(stmt.execution_options(yield_per=size)).partitions():
+        yield from part
+        s.expunge_all()
+
+def batched(items: Sequence[Any], size: int = CHUNK) -> Iterator[Sequence[Any]]:
+    """Split a sequence into slices of at most ``size`` (e.g. for IN lists)."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
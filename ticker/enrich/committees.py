@@ -1,47 +1,44 @@
 from __future__ import annotations
-import os, csv
-from ..db import get_session
+import os
+from ..db import get_session, upsert, batched
 from ..models import Committee, MemberCommittee
+from ..refdata import fixture_table
 from ..utils.logging import info
+from .refstate import fingerprint, is_current, mark_loaded
 
-def load_committees() -> int:
-    """Load committees and member-committee links from fixtures."""
+def load_committees(force: bool = False) -> int:
+    """Load committees and member-committee links from fixtures.
+
+    Skipped when both CSVs are unchanged since the last load (``force=True``
+    reloads anyway); rows are written with bulk upserts.
+    """
     base = os.path.join(os.path.dirname(__file__), "..", "fixtures")
     committees_csv = os.path.normpath(os.path.join(base, "committees.csv"))
     members_committees_csv = os.path.normpath(os.path.join(base, "member_committees.csv"))
 
-    # Committees
-    n = 0
-    with get_session() as s, open(committees_csv, newline='', encoding='utf-8') as f:
-        for row in csv.DictReader(f):
-            c = Committee(
-                committee_id=row["committee_id"],
-                name=row["name"],
-                chamber=row["chamber"],
-            )
-            ex = s.get(Committee, c.committee_id)
-            if ex:
-                ex.name, ex.chamber = c.name, c.chamber
-            else:
-                s.add(c)
-            n += 1
-        s.commit()
+    fp = fingerprint(committees_csv, members_committees_csv)
+    n = m = 0
+    with get_session() as s:
+        if not force and is_current(s, "committees", fp):
+            return 0
+
+        # Committees
+        committees = [
+            {"committee_id": row["committee_id"], "name": row["name"], "chamber": row["chamber"]}
+            for row in fixture_table("committees", committees_csv)
+        ]
+        for chunk in batched(committees):
+            n += upsert(s, Committee, chunk, ["committee_id"])
+
+        # Member ↔ Committee links
+        links = [
+            {"member_id": row["member_id"], "committee_id": row["committee_id"], "role": row.get("role") or None}
+            for row in fixture_table("member_committees", members_committees_csv)
+        ]
+        for chunk in batched(links):
+            m += upsert(s, MemberCommittee, chunk, ["member_id", "committee_id"])
 
-    # Member ↔ Committee links
-    m = 0
-    with get_session() as s, open(members_committees_csv, newline='', encoding='utf-8') as f:
-        for row in csv.DictReader(f):
-            mc = MemberCommittee(
-                member_id=row["member_id"],
-                committee_id=row["committee_id"],
-                role=row.get("role") or None,
-            )
-            ex = s.get(MemberCommittee, (mc.member_id, mc.committee_id))
-            if ex:
-                ex.role = mc.role
-            else:
-                s.add(mc)
-            m += 1
+        mark_loaded(s, "committees", fp)
         s.commit()
 
     info(f"Loaded/updated {n} committees and {m} member-committee links")
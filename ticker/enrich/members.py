@@ -1,37 +1,71 @@
 from __future__ import annotations
-import os, csv
-from ..db import get_session
-from ..models import Member
+import os
+from sqlmodel import Session, select, update
+from ..db import get_session, upsert, batched
+from ..models import Filing, Member, Trade
+from ..score.rollups import refresh_member_rollups
+from ..refdata import fixture_table
 from ..utils.logging import info
+from .refstate import fingerprint, is_current, mark_loaded
 
-def load_members() -> int:
-    """Load/update members from fixture CSV."""
+def load_members(force: bool = False) -> int:
+    """Load/update members from fixture CSV.
+
+    Skipped when the CSV is unchanged since the last load (``force=True``
+    reloads anyway). Rows are written with bulk upserts, so a member's
+    follow score is left untouched. Filings ingested before their member was
+    known are then linked (see ``link_filings``).
+    """
     csv_path = os.path.join(os.path.dirname(__file__), "..", "fixtures", "members.csv")
     csv_path = os.path.normpath(csv_path)
 
+    fp = fingerprint(csv_path)
     n = 0
-    with get_session() as s, open(csv_path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            member = Member(
-                member_id=row["member_id"],
-                first=row["first"],
-                last=row["last"],
-                chamber=row["chamber"],
-                state=row["state"],
-                district=row.get("district") or None,
-                party=row.get("party") or None,
-                active=True,
-            )
-            existing = s.get(Member, member.member_id)
-            if existing:
-                # Update fields if already present
-                for k in ["first", "last", "chamber", "state", "district", "party", "active"]:
-                    setattr(existing, k, getattr(member, k))
-            else:
-                s.add(member)
-            n += 1
+    with get_session() as s:
+        if not force and is_current(s, "members", fp):
+            return 0
+        rows = [
+            {
+                "member_id": row["member_id"],
+                "first": row["first"],
+                "last": row["last"],
+                "chamber": row["chamber"],
+                "state": row["state"],
+                "district": row.get("district") or None,
+                "party": row.get("party") or None,
+                "active": True,
+            }
+            for row in fixture_table("members", csv_path)
+        ]
+        for chunk in batched(rows):
+            n += upsert(s, Member, chunk, ["member_id"])
+        linked = link_filings(s)
+        mark_loaded(s, "members", fp)
         s.commit()
 
-    info(f"Loaded/updated {n} members from fixtures")
+    info(f"Loaded/updated {n} members from fixtures ({linked} filings linked)")
     return n
+
+def link_filings(s: Session) -> int:
+    """Set ``filer_member_id`` on filings whose ``filer_member_ref`` member now exists (caller commits).
+
+    Their trades move out of the unknown-member rollups, and the members'
+    follow scores are cleared so the next ``compute_follow_scores`` redoes them.
+    """
+    found = s.exec(
+        select(Filing.filing_id, Filing.filer_member_ref)
+        .join(Member, Member.member_id == Filing.filer_member_ref)
+        .where(Filing.filer_member_id.is_(None))
+    ).all()
+    if not found:
+        return 0
+    owner = dict(found)
+    s.exec(update(Filing), params=[{"filing_id": fid, "filer_member_id": mid} for fid, mid in found])
+    groups = set()
+    for chunk in batched(list(owner)):
+        for fid, d in s.exec(select(Trade.filing_id, Trade.txn_date).where(Trade.filing_id.in_(chunk))):
+            groups.update(((d, None), (d, owner[fid])))
+    refresh_member_rollups(s, groups)
+    for chunk in batched(sorted(set(owner.values()))):
+        s.exec(update(Member).where(Member.member_id.in_(chunk)).values(follow_score_updated_at=None))
+    return len(found)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+import hashlib
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Session
+from ..models import RefState
+from ..utils.hashing import sha256_file
+
+def fingerprint(*paths: str) -> str:
+    """Combined SHA-256 of reference source files (missing files hash as empty)."""
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(f"{p}:{sha256_file(p) or ''}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def is_current(s: Session, name: str, fp: str) -> bool:
+    """True when ``name`` was last loaded from sources with fingerprint ``fp``."""
+    try:
+        st: Optional[RefState] = s.get(RefState, name)
+    except Exception:
+        s.rollback()
+        return False  # table not migrated yet
+    return st is not None and st.fingerprint == fp
+
+def mark_loaded(s: Session, name: str, fp: str) -> None:
+    """Record ``fp`` as the loaded fingerprint for ``name`` (caller commits)."""
+    st = s.get(RefState, name) or RefState(name=name, fingerprint=fp)
+    st.fingerprint = fp
+    st.loaded_at = datetime.utcnow()
+    s.add(st)
@@ -1,9 +1,11 @@
 from __future__ import annotations
-from datetime import date
+from datetime import date, datetime
 from typing import List, Dict
-import os, json
+import asyncio, io, os, json, zipfile
+import xml.etree.ElementTree as ET
 from ..config import CFG
-from ..utils.logging import info
+from ..refdata import fixture_table
+from ..utils.logging import info, warn
 
 def list_new_filings(since: date) -> List[Dict]:
     """Return new House filings since a given date.
@@ -12,16 +14,84 @@ def list_new_filings(since: date) -> List[Dict]:
     if CFG.dev:
         fx_path = os.path.join(os.path.dirname(__file__), "..", "fixtures", "house_filings.json")
         fx_path = os.path.normpath(fx_path)
-        with open(fx_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        out: List[Dict] = []
-        for row in data:
-            if date.fromisoformat(row["filed_date"]) >= since:
-                out.append(row)
+        table = fixture_table("house_filings", fx_path)
+        cutoff = since.isoformat()  # ISO dates compare correctly as strings
+        out: List[Dict] = [table.row(i) for i, d in enumerate(table.column("filed_date")) if d >= cutoff]
 
         info(f"Loaded {len(out)} House fixture filings since {since}")
         return out
     else:
-        # TODO: implement live fetch from Clerk of House
-        return []
+        from .http import run_sync
+        return run_sync(fetch_new_filings(since))
+
+def parse_index(content: bytes, year: int) -> List[Dict]:
+    """Parse a Clerk financial-disclosure index (``{year}FD.zip``/``.xml``, or a JSON list of filing rows).
+
+    Entries without a DocID or a valid FilingDate are skipped with a warning.
+    """
+    if content[:2] == b"PK":
+        with zipfile.ZipFile(io.BytesIO(content)) as z:
+            name = next((n for n in z.namelist() if n.lower().endswith(".xml")), None)
+            if name is None:
+                warn(f"house: {year} index archive has no .xml member")
+                return []
+            content = z.read(name)
+    if content.lstrip()[:1] in (b"[", b"{"):
+        return json.loads(content)
+
+    out: List[Dict] = []
+    bad = 0
+    for m in ET.fromstring(content).iter("Member"):
+        if (m.findtext("FilingType") or "").strip() != "P":  # P = periodic transaction report
+            continue
+        doc_id = (m.findtext("DocID") or "").strip()
+        st_dst = (m.findtext("StateDst") or "").strip()
+        try:
+            filed = datetime.strptime((m.findtext("FilingDate") or "").strip(), "%m/%d/%Y").date()
+        except ValueError:
+            filed = None
+        if not doc_id or filed is None:
+            bad += 1
+            continue
+        state, dst = st_dst[:2], st_dst[2:]
+        out.append({
+            "filing_id": f"H-{state}-{dst}-{filed:%Y%m%d}-{doc_id}",
+            "source": "house",
+            "filer_member_id": f"H-{state}-{dst}" if state else None,
+            "filer_name_raw": f"{(m.findtext('Last') or '').strip()}, {(m.findtext('First') or '').strip()}",
+            "filed_date": filed.isoformat(),
+            "url": CFG.house_pdf_url.format(year=year, doc_id=doc_id),
+            "doc_type": "PTR",
+        })
+    if bad:
+        warn(f"house: skipped {bad} malformed entries in the {year} index")
+    return out
+
+async def fetch_new_filings(since: date, client=None) -> List[Dict]:
+    """Fetch the Clerk index for each year since ``since`` and download new PTR files.
+
+    Index pages are fetched with conditional GETs, so an unchanged index costs
+    one 304 round trip and yields no rows.
+    """
+    from .http import FetchClient, download_filings, rows_since
+    own = client is None
+    client = client or FetchClient()
+    try:
+        urls = {CFG.house_index_url.format(year=y): y for y in range(since.year, date.today().year + 1)}
+        found: Dict[str, Dict] = {}
+        for url, year in urls.items():
+            resp = await client.get_if_changed(url)
+            if resp is None:
+                continue
+            parsed = await asyncio.to_thread(parse_index, resp.content, year)
+            for r in rows_since(parsed, since, "house"):
+                found[r["filing_id"]] = r
+        rows = list(found.values())
+        out = await download_filings(client, rows, "house")
+        if own and len(out) == len(rows):
+            await asyncio.to_thread(client.commit)  # keep old validators if any download failed, so it is retried
+        info(f"Fetched {len(out)} House filings since {since}")
+        return out
+    finally:
+        if own:
+            await client.aclose()
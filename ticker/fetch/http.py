@@ -0,0 +1,190 @@
+from __future__ import annotations
+import asyncio, hashlib, json, os, random, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Awaitable, Dict, List, Optional, TypeVar
+import httpx
+from ..config import CFG
+from ..utils.logging import warn
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run ``coro`` to completion from sync code, even when called inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(1) as ex:  # asyncio.run refuses to nest; give it a thread of its own
+        return ex.submit(asyncio.run, coro).result()
+
+def rows_since(rows: List[Dict], since: date, source: str) -> List[Dict]:
+    """Index rows filed on or after ``since``; rows without a usable ``filing_id``/``filed_date`` are skipped with a warning."""
+    out: List[Dict] = []
+    bad = 0
+    for r in rows:
+        try:
+            keep = bool(r["filing_id"]) and date.fromisoformat(r["filed_date"]) >= since
+        except (KeyError, TypeError, ValueError):
+            bad += 1
+            continue
+        if keep:
+            out.append(r)
+    if bad:
+        warn(f"{source}: skipped {bad} malformed index row(s)")
+    return out
+
+class RateLimiter:
+    """Space request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class FetchClient:
+    """Pooled async HTTP client for the live fetchers.
+
+    Adds a concurrency cap, request rate limiting, retry with exponential
+    backoff on throttling/transient errors, and ``ETag``/``Last-Modified``
+    validators for conditional GETs. Validators are persisted by ``commit()``,
+    so a cycle that fails half-way re-fetches its index next time.
+    """
+
+    def __init__(self, validators_path: Optional[str] = None):
+        self.validators_path = validators_path or os.path.join(CFG.cache_dir, "http_validators.json")
+        self.validators: Dict[str, Dict[str, str]] = self._load_validators()
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self.sem = asyncio.Semaphore(CFG.http_concurrency)
+        self.limiter = RateLimiter(CFG.http_rate)
+        self.client = httpx.AsyncClient(
+            timeout=CFG.http_timeout,
+            follow_redirects=True,
+            headers={"User-Agent": CFG.http_user_agent},
+            limits=httpx.Limits(max_connections=CFG.http_concurrency, max_keepalive_connections=CFG.http_concurrency),
+        )
+
+    async def __aenter__(self) -> "FetchClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def _load_validators(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.validators_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def commit(self) -> None:
+        """Persist validators from successful conditional GETs."""
+        if not self._pending:
+            return
+        self.validators.update(self._pending)
+        self._pending.clear()
+        os.makedirs(os.path.dirname(self.validators_path) or ".", exist_ok=True)
+        tmp = f"{self.validators_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.validators, f)
+        os.replace(tmp, self.validators_path)
+
+    async def request(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET with rate limiting and retry/backoff; returns the final response (body read)."""
+        for attempt in range(CFG.http_retries + 1):
+            async with self.sem:
+                await self.limiter.wait()
+                try:
+                    resp = await self.client.get(url, headers=headers)
+                except httpx.TransportError as e:
+                    if attempt == CFG.http_retries:
+                        raise
+                    warn(f"GET {url} failed ({e}); retrying")
+                    resp = None
+            if resp is not None and resp.status_code not in RETRY_STATUS:
+                return resp
+            if resp is not None and attempt == CFG.http_retries:
+                return resp
+            await asyncio.sleep(self._backoff(attempt, resp))
+        raise RuntimeError("unreachable")
+
+    @staticmethod
+    def _backoff(attempt: int, resp: Optional[httpx.Response]) -> float:
+        if resp is not None:
+            ra = resp.headers.get("Retry-After")
+            if ra and ra.isdigit():
+                return min(float(ra), 300.0)
+        return min(60.0, 0.5 * 2 ** attempt) + random.uniform(0, 0.25)
+
+    async def get_if_changed(self, url: str) -> Optional[httpx.Response]:
+        """Conditional GET; returns None when the server answers 304 Not Modified."""
+        headers = {}
+        v = self.validators.get(url, {})
+        if v.get("etag"):
+            headers["If-None-Match"] = v["etag"]
+        if v.get("last_modified"):
+            headers["If-Modified-Since"] = v["last_modified"]
+        resp = await self.request(url, headers=headers)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        new = {k: resp.headers[h] for k, h in (("etag", "ETag"), ("last_modified", "Last-Modified")) if h in resp.headers}
+        if new:
+            self._pending[url] = new
+        return resp
+
+    async def download(self, url: str, dest: str) -> str:
+        """Download ``url`` to ``dest`` (atomically) and return its SHA-256; disk work runs off the event loop."""
+        resp = await self.request(url)
+        resp.raise_for_status()
+        return await asyncio.to_thread(_save, resp.content, dest)
+
+def _save(content: bytes, dest: str) -> str:
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    tmp = f"{dest}.part"
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, dest)
+    return hashlib.sha256(content).hexdigest()
+
+async def download_filings(client: FetchClient, rows: list, source: str) -> list:
+    """Download each row's ``url`` into ``CFG.data_dir/<source>/``, filling ``file_local_path`` and ``checksum``.
+
+    Rows whose file already exists locally are not re-downloaded; rows whose
+    download fails are dropped (and picked up again on the next poll).
+    """
+    from ..utils.hashing import sha256_file
+
+    async def one(row: dict) -> Optional[dict]:
+        url = row.get("url")
+        if not url:
+            return None
+        ext = os.path.splitext(httpx.URL(url).path)[1] or ".pdf"
+        dest = os.path.join(CFG.data_dir, source, f"{row['filing_id']}{ext}")
+        try:
+            if os.path.exists(dest):
+                checksum = await asyncio.to_thread(sha256_file, dest)
+            else:
+                checksum = await client.download(url, dest)
+        except Exception as e:
+            warn(f"download failed for {row['filing_id']}: {e}")
+            return None
+        return {**row, "file_local_path": dest, "checksum": checksum}
+
+    results = await asyncio.gather(*(one(r) for r in rows))
+    return [r for r in results if r]
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from datetime import date
 from typing import List, Dict
-import os, json
+import asyncio, os
 from ..config import CFG
+from ..refdata import fixture_table
 from ..utils.logging import info
 
 def list_new_filings(since: date) -> List[Dict]:
@@ -12,16 +13,36 @@ def list_new_filings(since: date) -> List[Dict]:
     if CFG.dev:
         fx_path = os.path.join(os.path.dirname(__file__), "..", "fixtures", "senate_filings.json")
         fx_path = os.path.normpath(fx_path)
-        with open(fx_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        out: List[Dict] = []
-        for row in data:
-            if date.fromisoformat(row["filed_date"]) >= since:
-                out.append(row)
+        table = fixture_table("senate_filings", fx_path)
+        cutoff = since.isoformat()  # ISO dates compare correctly as strings
+        out: List[Dict] = [table.row(i) for i, d in enumerate(table.column("filed_date")) if d >= cutoff]
 
         info(f"Loaded {len(out)} Senate fixture filings since {since}")
         return out
     else:
-        # TODO: implement live fetch from Senate eFD
+        from .http import run_sync
+        return run_sync(fetch_new_filings(since))
+
+async def fetch_new_filings(since: date, client=None) -> List[Dict]:
+    """Fetch the Senate PTR index and download new filings.
+
+    eFD search sits behind a session/agreement handshake, so the index is read
+    from ``CFG.senate_index_url``: a JSON list of filing rows (same schema as
+    the fixtures) published by a mirror or the local stand-in server.
+    """
+    from .http import FetchClient, download_filings, rows_since
+    if not CFG.senate_index_url:
         return []
+    own = client is None
+    client = client or FetchClient()
+    try:
+        resp = await client.get_if_changed(CFG.senate_index_url)
+        rows = [] if resp is None else rows_since(await asyncio.to_thread(resp.json), since, "senate")
+        out = await download_filings(client, rows, "senate")
+        if own and len(out) == len(rows):
+            await asyncio.to_thread(client.commit)  # keep old validators if any download failed, so it is retried
+        info(f"Fetched {len(out)} Senate filings since {since}")
+        return out
+    finally:
+        if own:
+            await client.aclose()
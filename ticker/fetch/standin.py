@@ -0,0 +1,59 @@
+from __future__ import annotations
+import hashlib, json, os
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+FIXTURES = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "fixtures"))
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve ``/<source>/index.json`` and ``/files/<name>`` from the DEV fixtures with ETag/Last-Modified support."""
+
+    def log_message(self, *args):  # keep the console quiet
+        pass
+
+    def _index(self, source: str) -> Tuple[bytes, float]:
+        path = os.path.join(FIXTURES, f"{source}_filings.json")
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        host = f"http://{self.headers.get('Host')}"
+        for r in rows:
+            name = os.path.basename(r.pop("file_local_path", "") or "")
+            r["url"] = f"{host}/files/{name}"
+        return json.dumps(rows).encode("utf-8"), os.path.getmtime(path)
+
+    def _file(self, name: str) -> Optional[Tuple[bytes, float]]:
+        for base in (os.path.join(FIXTURES, "..", "..", "data", "fixtures"), FIXTURES):
+            path = os.path.normpath(os.path.join(base, os.path.basename(name)))
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    return f.read(), os.path.getmtime(path)
+        return None
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        found = None
+        if len(parts) == 2 and parts[1] == "index.json" and parts[0] in ("house", "senate"):
+            found = self._index(parts[0])
+        elif len(parts) == 2 and parts[0] == "files":
+            found = self._file(parts[1])
+        if found is None:
+            self.send_error(404)
+            return
+        body, mtime = found
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(mtime, usegmt=True))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def make_server(host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Local stand-in for the live House/Senate sources, for exercising the live fetchers."""
+    return ThreadingHTTPServer((host, port), _Handler)
@@ -1,108 +1,260 @@
 from __future__ import annotations
-from datetime import date
-from sqlmodel import select
-from .db import get_session
-from .models import Filing, Trade
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Set
+from sqlmodel import select, delete, update, literal
+from . import metrics
+from .db import get_session, insert_missing, iter_chunks, batched, upsert
+from .models import Filing, Member, Signal, Trade
 from .utils.logging import info, banner
+from .utils.hashing import file_stat, sha256_file
 from .fetch import house as fetch_house
 from .fetch import senate as fetch_senate
-from .parse.ptr import parse_pdf_file
+from .parse.ptr import parse_filings, parse_text_to_trades
 from .enrich.members import load_members
 from .enrich.committees import load_committees
-from .mapsec.issuers import map_issuer_to_ticker
-from .score.signals import score_all_new_trades, compute_follow_scores
+from .mapsec.issuers import Match, get_resolver, issuer_key
+from .mapsec.aliases import lookup_aliases, learn_aliases, learn_extracted
+from .score.signals import score_all_new_trades, compute_follow_scores, score_batch
+from .score.rollups import refresh_rollups, refresh_ticker_rollups
 from .notify.alerts import send_alerts
 
+RETRY_STATUSES = ("fetched", "failed")  # parsed again even when the file is unchanged
+
 def _today_minus(days: int) -> date:
     from datetime import timedelta
     return date.today() - timedelta(days=days)
 
+def member_ids() -> Set[str]:
+    """All known member ids (pass to ``ingest_rows`` when ingesting row by row)."""
+    with get_session() as s:
+        return set(s.exec(select(Member.member_id)))
+
+def ingest_rows(rows_by_source: Dict[str, List[Dict]], members: Optional[Set[str]] = None) -> int:
+    """Insert fetched filing rows (keyed by source) that are not yet in the database.
+
+    Rows are set-differenced against known filing ids and written with one
+    ``INSERT ... ON CONFLICT DO NOTHING`` per batch (see ``db.insert_missing``).
+    A filer not yet in ``Member`` is kept in ``filer_member_ref`` and linked by
+    ``load_members`` when it arrives. ``members`` (see ``member_ids``) saves reloading the member ids on every call.
+    """
+    new = 0
+    now = datetime.utcnow()
+    rows = {r["filing_id"]: (source, r) for source, batch in rows_by_source.items() for r in batch}
+    with get_session() as s:
+        known_members = set(s.exec(select(Member.member_id))) if members is None else members
+        for ids in batched(list(rows)):
+            known = set(s.exec(select(Filing.filing_id).where(Filing.filing_id.in_(ids))))
+            fresh = []
+            for fid in ids:
+                if fid in known:
+                    continue
+                source, row = rows[fid]
+                member_id = row.get("filer_member_id")
+                fresh.append({
+                    "filing_id": fid,
+                    "source": source,
+                    "filer_member_id": member_id if member_id in known_members else None,
+                    "filer_member_ref": member_id,
+                    "filer_name_raw": row["filer_name_raw"],
+                    "filed_date": date.fromisoformat(row["filed_date"]),
+                    "url": row.get("url"),
+                    "file_local_path": row.get("file_local_path"),
+                    "checksum": row.get("checksum"),
+                    "doc_type": row.get("doc_type", "PTR"),
+                    "status": "fetched",
+                    "discovered_at": now,
+                })
+            new += insert_missing(s, Filing, fresh, ["filing_id"])
+        s.commit()
+    info(f"Ingested {new} new filings")
+    return new
+
 def ingest_since(days: int = 30) -> int:
     """Ingest filings since a given number of days ago."""
     since = _today_minus(days)
     load_members()
     load_committees()
-    new = 0
+    return ingest_rows({
+        "house": fetch_house.list_new_filings(since),
+        "senate": fetch_senate.list_new_filings(since),
+    })
+
+def parse_all(force: bool = False, workers: int | None = None, filing_ids: Optional[Sequence[str]] = None) -> int:
+    """Parse new or changed filings into trades.
+
+    A filing is (re)parsed when its status is ``fetched`` or ``failed`` or the
+    SHA-256 of its local file no longer matches ``Filing.checksum``; everything
+    else is skipped (files whose size and mtime match those recorded with the
+    checksum are not even re-hashed). A filing whose text cannot be extracted
+    (timeout, crash, unreadable file) is marked ``failed`` and keeps its
+    previous trades and checksum, so the next run retries it.
+    Pass ``force=True`` to re-parse every filing. PDF extraction runs on a
+    process pool of ``workers`` processes (default: ``CFG.parse_workers``).
+    ``filing_ids`` limits the run to those filings.
+    """
+    n, done, skipped, failed = 0, 0, 0, 0
+    scopes = [select(Filing)] if filing_ids is None else [
+        select(Filing).where(Filing.filing_id.in_(chunk)) for chunk in batched(list(filing_ids))
+    ]
     with get_session() as s:
-        for row in fetch_house.list_new_filings(since):
-            f = s.get(Filing, row["filing_id"])
-            if not f:
-                f = Filing(
-                    filing_id=row["filing_id"],
-                    source="house",
-                    filer_member_id=row.get("filer_member_id"),
-                    filer_name_raw=row["filer_name_raw"],
-                    filed_date=date.fromisoformat(row["filed_date"]),
-                    url=row.get("url"),
-                    file_local_path=row.get("file_local_path"),
-                    doc_type=row.get("doc_type", "PTR"),
-                    status="fetched",
-                )
-                s.add(f)
-                new += 1
-        for row in fetch_senate.list_new_filings(since):
-            f = s.get(Filing, row["filing_id"])
-            if not f:
-                f = Filing(
-                    filing_id=row["filing_id"],
-                    source="senate",
-                    filer_member_id=row.get("filer_member_id"),
-                    filer_name_raw=row["filer_name_raw"],
-                    filed_date=date.fromisoformat(row["filed_date"]),
-                    url=row.get("url"),
-                    file_local_path=row.get("file_local_path"),
-                    doc_type=row.get("doc_type", "PTR"),
-                    status="fetched",
-                )
-                s.add(f)
-                new += 1
-        s.commit()
-    info(f"Ingested {new} new filings")
-    return new
+        for filings in (page for q in scopes for page in iter_chunks(s, q, Filing.filing_id)):
+            todo, checksums, stats, touched, stored = [], {}, {}, set(), []
+            for f in filings:
+                path = f.file_local_path or ""
+                stat = file_stat(path)
+                # Same size and mtime as when the checksum was taken: no need to read the file.
+                same = f.checksum is not None and stat is not None and stat == (f.file_size, f.file_mtime_ns)
+                checksum = f.checksum if same else sha256_file(path)
+                if not force and f.status not in RETRY_STATUSES and checksum == f.checksum:
+                    if stat and not same:
+                        f.file_size, f.file_mtime_ns = stat  # touched but unchanged: skip hashing next time
+                    skipped += 1
+                    continue
+                checksums[f.filing_id], stats[f.filing_id] = checksum, stat
+                todo.append(f)
+            for f, trades, text in parse_filings(todo, workers=workers, checksums=checksums):
+                if text is None:
+                    f.status = "failed"
+                    failed += 1
+                    continue
+                n += _store_trades(s, f, trades, checksums[f.filing_id], touched)
+                f.file_size, f.file_mtime_ns = stats[f.filing_id] or (None, None)
+                stored.extend(trades)
+                done += 1
+            learn_extracted(s, stored)
+            refresh_rollups(s, touched)
+            s.commit()
+    info(f"Parsed {n} trades from {done} filings ({skipped} unchanged skipped, {failed} failed)")
+    return n
+
+def _store_trades(s, f: Filing, trades: List[Trade], checksum: Optional[str], touched: Set[tuple]) -> int:
+    """Replace a filing's trades and mark it parsed (caller commits).
 
-def parse_all() -> int:
-    """Parse all filings into trades."""
-    n = 0
+    The ``(txn_date, member_id, ticker)`` rollup groups of both the removed and
+    the new trades are added to ``touched``; the caller refreshes them with
+    ``refresh_rollups`` so a re-parse leaves no stale counts behind, and
+    passes the new trades to ``learn_extracted``. Signals of trades that are
+    gone are deleted; if the filing was scored, its new trades are re-scored
+    here, so no signal describes a trade that was replaced.
+    """
+    old = s.exec(
+        select(Trade.trade_id, Trade.txn_date, Trade.ticker, Signal.signal_id)
+        .outerjoin(Signal, Signal.signal_id == literal("S-") + Trade.trade_id)
+        .where(Trade.filing_id == f.filing_id)
+    ).all()
+    touched.update((d, f.filer_member_id, t) for _, d, t, _ in old)
+    touched.update((t.txn_date, f.filer_member_id, t.ticker) for t in trades)
+    ids = {t.trade_id for t in trades}
+    for chunk in batched([tid for tid, _, _, sig in old if sig and tid not in ids]):
+        s.exec(delete(Signal).where(Signal.trade_id.in_(chunk)))
+    s.exec(delete(Trade).where(Trade.filing_id == f.filing_id))
+    s.add_all(trades)
+    if trades and any(sig for *_, sig in old):
+        member = s.get(Member, f.filer_member_id) if f.filer_member_id else None
+        upsert(s, Signal, score_batch((t, member) for t in trades), ["signal_id"], insert_only=["created_at"])
+    f.checksum = checksum
+    f.status = "parsed"
+    return len(trades)
+
+def store_parsed(filing_id: str, text: Optional[str], checksum: Optional[str]) -> int:
+    """Parse already-extracted text for one filing and store its trades.
+
+    ``text=None`` (extraction failed) marks the filing ``failed`` instead, keeping
+    its previous trades and checksum.
+    """
     with get_session() as s:
-        filings = s.exec(select(Filing)).all()
-        for f in filings:
-            trades, _ = parse_pdf_file(f.file_local_path or "", f)
-            old = s.exec(select(Trade).where(Trade.filing_id == f.filing_id)).all()
-            for o in old:
-                s.delete(o)
-            for tr in trades:
-                s.add(tr)
-                n += 1
-            f.status = "parsed"
+        f = s.get(Filing, filing_id)
+        if not f:
+            return 0
+        if text is None:
+            f.status = "failed"
+            n = 0
+        else:
+            touched: Set[tuple] = set()
+            trades = parse_text_to_trades(text, f)
+            n = _store_trades(s, f, trades, checksum, touched)
+            learn_extracted(s, trades)
+            refresh_rollups(s, touched)
         s.commit()
-    info(f"Parsed {n} trades")
     return n
 
-def map_all(fuzzy: bool = True) -> int:
-    """Map issuers to tickers."""
-    m = 0
+def mark_failed(filing_ids: Sequence[str]) -> None:
+    """Flag filings whose processing failed so the next parse/watch run retries them."""
     with get_session() as s:
-        trades = s.exec(select(Trade)).all()
-        for t in trades:
-            if not t.ticker:
-                tk, conf, meth = map_issuer_to_ticker(t.issuer_raw, fuzzy=fuzzy)
-                if tk:
-                    t.ticker = tk
-                    t.confidence = conf
-                    t.map_method = meth
-                    m += 1
+        for chunk in batched(list(filing_ids)):
+            s.exec(update(Filing).where(Filing.filing_id.in_(chunk)).values(status="failed"))
         s.commit()
-    info(f"Mapped {m} issuers to tickers")
+
+def map_all(fuzzy: bool = True, filing_ids: Optional[Sequence[str]] = None) -> int:
+    """Map issuers to tickers.
+
+    Each distinct issuer is looked up in the ``IssuerAlias`` table first; only
+    unknown issuers go through the resolver, and its hits are learned as new
+    aliases (tickers the parser extracted are learned as trades are stored).
+    ``filing_ids`` limits the run to trades from those filings.
+    """
+    m, resolved_n, learned = 0, 0, 0
+    unmapped = select(Trade).where(Trade.ticker.is_(None))
+    scopes = [unmapped] if filing_ids is None else [
+        unmapped.where(Trade.filing_id.in_(chunk)) for chunk in batched(list(filing_ids))
+    ]
+    with get_session() as s:
+        for trades in (page for q in scopes for page in iter_chunks(s, q, Trade.trade_id)):
+            keys = {t.issuer_raw: issuer_key(t.issuer_raw) for t in trades}
+            matches = {
+                k: Match(a.ticker, a.cik, a.confidence, a.method)
+                for k, a in lookup_aliases(s, keys.values()).items()
+            }
+            misses = [raw for raw, k in keys.items() if k not in matches]
+            resolved = {keys[raw]: hit for raw, hit in get_resolver().resolve_many(misses, fuzzy=fuzzy).items()}
+            learned += learn_aliases(s, resolved)
+            resolved_n += len(misses)
+            matches.update(resolved)
+            remapped = set()
+            for t in trades:
+                hit = matches[keys[t.issuer_raw]]
+                if hit.ticker:
+                    remapped.update(((t.txn_date, None), (t.txn_date, hit.ticker)))
+                    t.ticker = hit.ticker
+                    t.confidence = hit.confidence
+                    t.map_method = hit.method
+                    m += 1
+            s.flush()
+            refresh_ticker_rollups(s, remapped)
+            s.commit()
+    info(f"Mapped {m} issuers to tickers ({resolved_n} resolved, {learned} aliases learned)")
     return m
 
-def run_hotpath_once(score: bool = True, alerts: bool = False) -> None:
-    """Run one full ingestion → parsing → mapping → scoring pipeline."""
+def run_hotpath_once(score: bool = True, alerts: bool = False, new: Optional[Dict[str, List[Dict]]] = None) -> None:
+    """Run one full ingestion → parsing → mapping → scoring pipeline.
+
+    Each stage is recorded as a ``RunMetric`` row (see ``ticker stats pipeline``).
+
+    ``new`` (filing rows per source, as returned by ``watch.discover_changes``)
+    skips re-listing the sources and limits parsing/scoring to those filings.
+    """
     banner("Hotpath")
-    ingest_since(60)
-    parse_all()
-    map_all(True)
-    if score:
-        score_all_new_trades()
-        compute_follow_scores()
-    if alerts:
-        send_alerts(["New filings processed and scored"])
+    batch = metrics.new_batch()
+    try:
+        with metrics.stage("ingest", batch) as st:
+            if new is None:
+                st.rows_out = ingest_since(60)
+                ids = None
+            else:
+                st.rows_in = sum(len(rows) for rows in new.values())
+                st.rows_out = ingest_rows(new)
+                ids = [r["filing_id"] for rows in new.values() for r in rows]
+        with metrics.stage("parse", batch, len(ids) if ids is not None else None) as st:
+            st.rows_out = parse_all(filing_ids=ids)
+        with metrics.stage("map", batch) as st:
+            st.rows_out = map_all(True, filing_ids=ids)
+        if score:
+            with metrics.stage("score", batch) as st:
+                st.rows_out = score_all_new_trades(filing_ids=ids)
+            with metrics.stage("follow", batch) as st:
+                st.rows_out = compute_follow_scores()
+        if alerts:
+            with metrics.stage("alerts", batch):
+                send_alerts(["New filings processed and scored"])
+    finally:
+        metrics.flush()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional
+from sqlmodel import Session, select, update, func
+from ..models import IssuerAlias, Trade
+from ..score.rollups import refresh_ticker_rollups
+from .issuers import Match, issuer_key
+
+_IN_CHUNK = 500
+
+def lookup_aliases(s: Session, keys: Iterable[str]) -> Dict[str, IssuerAlias]:
+    """Fetch known aliases for a set of issuer keys (chunked IN queries)."""
+    keys = list(dict.fromkeys(keys))
+    out: Dict[str, IssuerAlias] = {}
+    for i in range(0, len(keys), _IN_CHUNK):
+        rows = s.exec(select(IssuerAlias).where(IssuerAlias.issuer_key.in_(keys[i:i + _IN_CHUNK])))
+        out.update((a.issuer_key, a) for a in rows)
+    return out
+
+def learn_aliases(s: Session, matches: Dict[str, Match]) -> int:
+    """Record successful mappings (issuer key → match) not yet in the alias table."""
+    known = lookup_aliases(s, matches)
+    n = 0
+    for key, m in matches.items():
+        if m.ticker and key and key not in known:
+            s.add(IssuerAlias(issuer_key=key, ticker=m.ticker, cik=m.cik, confidence=m.confidence, method=m.method))
+            n += 1
+    return n
+
+def learn_extracted(s: Session, trades: Iterable[Trade]) -> int:
+    """Record tickers the PTR parser extracted for ``trades`` whose issuers are not yet aliased."""
+    matches: Dict[str, Match] = {}
+    for t in trades:
+        if t.map_method == "extracted" and t.ticker:
+            matches.setdefault(issuer_key(t.issuer_raw), Match(t.ticker, None, t.confidence, "extracted"))
+    return learn_aliases(s, matches)
+
+def list_aliases(s: Session, below: Optional[float] = None) -> List[IssuerAlias]:
+    """Aliases ordered by confidence, optionally only those under a threshold."""
+    q = select(IssuerAlias).order_by(IssuerAlias.confidence, IssuerAlias.issuer_key)
+    if below is not None:
+        q = q.where(IssuerAlias.confidence < below)
+    return list(s.exec(q))
+
+def set_alias(s: Session, key: str, ticker: str, cik: Optional[int] = None) -> int:
+    """Pin an issuer key to a ticker and re-map trades previously resolved by lookup."""
+    a = s.get(IssuerAlias, key)
+    if a:
+        a.ticker, a.cik, a.confidence, a.method = ticker, cik, 1.0, "manual"
+    else:
+        s.add(IssuerAlias(issuer_key=key, ticker=ticker, cik=cik, confidence=1.0, method="manual"))
+    remap = (func.lower(Trade.issuer_raw) == key) & (Trade.map_method.is_(None) | (Trade.map_method != "extracted"))
+    before = set(s.exec(select(Trade.txn_date, Trade.ticker).where(remap)))
+    res = s.exec(update(Trade).where(remap).values(ticker=ticker, confidence=1.0, map_method="manual"))
+    refresh_ticker_rollups(s, before | {(d, ticker) for d, _ in before})
+    return res.rowcount or 0
+
+def drop_alias(s: Session, key: str) -> bool:
+    a = s.get(IssuerAlias, key)
+    if not a:
+        return False
+    s.delete(a)
+    return True
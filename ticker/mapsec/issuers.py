@@ -1,32 +1,130 @@
 from __future__ import annotations
-from typing import Optional
-from ..utils.text import normalize_issuer, fuzzy_ratio
-from .sec_cik import load_company_tickers
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from rapidfuzz import process, fuzz
+from ..utils.text import normalize_issuer
+from .sec_cik import company_table
+
+FUZZY_CUTOFF = 85
+SHORTLIST = 64
+
+class Match(NamedTuple):
+    ticker: Optional[str]
+    cik: Optional[int]
+    confidence: float
+    method: str  # "exact" | "fuzzy" | "none"
+
+NO_MATCH = Match(None, None, 0.0, "none")
+
+def issuer_key(name: str) -> str:
+    """Normalized, lower-cased lookup key for an issuer name."""
+    return normalize_issuer(name).lower()
+
+def _trigrams(s: str) -> set[str]:
+    s = f"  {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+class IssuerResolver:
+    """Resident issuer → ticker index built once from SEC reference data.
+
+    Exact hits come from a hash index of normalized names. Fuzzy lookups are
+    blocked by a trigram index to a shortlist of candidates, which is then
+    scored with rapidfuzz in C. Results are memoized per normalized issuer.
+    """
+
+    def __init__(self, ref: Dict[str, dict]):
+        self._index((issuer_key(title), v) for title, v in ref.items())
+
+    @classmethod
+    def from_table(cls, table) -> "IssuerResolver":
+        """Build from a ``company_table()`` snapshot, reusing its precomputed issuer keys."""
+        self = cls.__new__(cls)
+        self._index(
+            (k, {"ticker": t, "cik": int(c) if c else None})
+            for k, t, c in zip(table.column("key"), table.column("ticker"), table.column("cik"))
+        )
+        return self
+
+    def _index(self, items: Iterable[tuple]) -> None:
+        self.names: List[str] = []
+        self.values: List[dict] = []
+        self.exact: Dict[str, int] = {}
+        self.grams: Dict[str, List[int]] = {}
+        for k, v in items:
+            if not k or k in self.exact:
+                continue
+            i = len(self.names)
+            self.exact[k] = i
+            self.names.append(k)
+            self.values.append(v)
+            for g in _trigrams(k):
+                self.grams.setdefault(g, []).append(i)
+        self._memo: Dict[tuple, Match] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _shortlist(self, key: str) -> List[int]:
+        counts: Counter = Counter()
+        for g in _trigrams(key):
+            counts.update(self.grams.get(g, ()))
+        return [i for i, _ in counts.most_common(SHORTLIST)]
+
+    def _resolve_key(self, key: str, fuzzy: bool) -> Match:
+        i = self.exact.get(key)
+        if i is not None:
+            v = self.values[i]
+            return Match(v["ticker"], v.get("cik"), 0.99, "exact")
+        if not fuzzy or not key:
+            return NO_MATCH
+        cands = self._shortlist(key)
+        if not cands:
+            return NO_MATCH
+        best = process.extractOne(
+            key, [self.names[i] for i in cands], scorer=fuzz.token_set_ratio, score_cutoff=FUZZY_CUTOFF
+        )
+        if best is None:
+            return NO_MATCH
+        _, score, pos = best
+        v = self.values[cands[pos]]
+        return Match(v["ticker"], v.get("cik"), score / 100.0, "fuzzy")
+
+    def resolve(self, name: str, fuzzy: bool = True) -> Match:
+        key = issuer_key(name)
+        memo_key = (key, fuzzy)
+        m = self._memo.get(memo_key)
+        if m is None:
+            self.misses += 1
+            m = self._memo[memo_key] = self._resolve_key(key, fuzzy)
+        else:
+            self.hits += 1
+        return m
+
+    def resolve_many(self, names: Iterable[str], fuzzy: bool = True) -> Dict[str, Match]:
+        """Resolve a batch of raw issuer names, each distinct name once.
+
+        Fuzzy misses are scored one by one against their own shortlists:
+        shortlists barely overlap, so a ``process.cdist`` over their union
+        does far more comparisons (see ``ticker bench resolver``).
+        """
+        return {n: self.resolve(n, fuzzy) for n in dict.fromkeys(names)}
+
+_RESOLVER: Optional[IssuerResolver] = None
+
+def get_resolver() -> IssuerResolver:
+    """Process-wide resolver, built on first use."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        _RESOLVER = IssuerResolver.from_table(company_table())
+    return _RESOLVER
 
 def map_issuer_to_ticker(name: str, fuzzy: bool = True) -> tuple[Optional[str], float, str]:
     """
     Map a raw issuer name to a stock ticker.
-    
+
     Returns (ticker, confidence, method).
     - ticker: str or None
     - confidence: float between 0.0 and 1.0
     - method: "exact" | "fuzzy" | "none"
     """
-    ref = load_company_tickers()
-    norm = normalize_issuer(name).lower()
-
-    # Exact match
-    if norm in ref:
-        return ref[norm]["ticker"], 0.99, "exact"
-
-    # Fuzzy match
-    if fuzzy:
-        best_t, best_score = None, 0
-        for k, v in ref.items():
-            sc = fuzzy_ratio(norm, k)
-            if sc > best_score:
-                best_score, best_t = sc, v["ticker"]
-        if best_score >= 85:
-            return best_t, best_score / 100.0, "fuzzy"
-
-    return None, 0.0, "none"
+    m = get_resolver().resolve(name, fuzzy=fuzzy)
+    return m.ticker, m.confidence, m.method
@@ -1,19 +1,38 @@
 from __future__ import annotations
 import os, json
 from typing import Dict, Any
+from ..config import CFG
+from ..refdata import RefTable, load
 
-def load_company_tickers() -> Dict[str, Any]:
-    """
-    Load a sample set of SEC company tickers from fixtures.
-    Keys are normalized company names -> {ticker, cik}.
-    """
-    path = os.path.join(os.path.dirname(__file__), "..", "fixtures", "company_tickers_sample.json")
-    path = os.path.normpath(path)
+SAMPLE = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "fixtures", "company_tickers_sample.json"))
+
+def _source() -> str:
+    return CFG.sec_tickers_path if CFG.sec_tickers_path and os.path.exists(CFG.sec_tickers_path) else SAMPLE
+
+def _build(path: str):
+    from .issuers import issuer_key
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
+    # SEC's company_tickers.json is {"0": {"cik_str", "ticker", "title"}, ...}; the sample is a list
+    rows = data.values() if isinstance(data, dict) else data
+    out = []
+    for row in rows:
+        title = row["title"]
+        out.append((title.lower(), issuer_key(title), row["ticker"], row.get("cik", row.get("cik_str"))))
+    return ["name", "key", "ticker", "cik"], out
 
-    out: Dict[str, Any] = {}
-    for row in data:
-        name = row["title"].lower()
-        out[name] = {"ticker": row["ticker"], "cik": row["cik"]}
-    return out
+def company_table() -> RefTable:
+    """SEC company tickers as a compiled snapshot (name, precomputed issuer key, ticker, cik)."""
+    path = _source()
+    return load("company_tickers", [path], lambda: _build(path))
+
+def load_company_tickers() -> Dict[str, Any]:
+    """
+    Load SEC company tickers (``TICKER_SEC_TICKERS_PATH`` or the bundled sample).
+    Keys are lower-cased company names -> {ticker, cik}.
+    """
+    t = company_table()
+    return {
+        name: {"ticker": ticker, "cik": int(cik) if cik else None}
+        for name, ticker, cik in zip(t.column("name"), t.column("ticker"), t.column("cik"))
+    }
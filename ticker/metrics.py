@@ -0,0 +1,155 @@
+from __future__ import annotations
+import json, math, threading, time, uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from sqlmodel import select
+from .db import get_session, get_read_session, stream
+from .models import Filing, RunMetric
+from .utils.logging import warn
+
+STAGES = ("ingest", "extract", "parse", "map", "score", "follow", "alerts")
+
+_BUFFER: List[RunMetric] = []
+_LOCK = threading.Lock()
+
+def new_batch() -> str:
+    """Id grouping the stage metrics of one hotpath/pipeline run."""
+    return uuid.uuid4().hex[:12]
+
+def _counters() -> Dict[str, tuple]:
+    """Hit/miss counters of the in-process caches (the issuer resolver only once built)."""
+    from .parse.cache import get_text_cache
+    from .mapsec import issuers
+    tc = get_text_cache()
+    out = {"text_cache": (tc.hits, tc.misses)}
+    if issuers._RESOLVER is not None:
+        out["issuer_memo"] = (issuers._RESOLVER.hits, issuers._RESOLVER.misses)
+    return out
+
+class StageTimer:
+    """Mutable handle for a running stage; set ``rows_out`` / ``details`` before it exits."""
+
+    def __init__(self, stage: str, batch: Optional[str], rows_in: Optional[int]):
+        self.stage = stage
+        self.batch = batch
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.details: Dict[str, object] = {}
+
+@contextmanager
+def stage(name: str, batch: Optional[str] = None, rows_in: Optional[int] = None) -> Iterator[StageTimer]:
+    """Time a pipeline stage and buffer a ``RunMetric`` row for it (see ``flush``).
+
+    The row records wall time, rows in/out, success (no exception escaped) and,
+    in ``details``, hits/misses of the text cache and issuer memo during the stage.
+    """
+    from .profiling import enter_stage, exit_stage
+    st = StageTimer(name, batch, rows_in)
+    enter_stage(name)
+    started_at = datetime.utcnow()
+    before = _counters()
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        yield st
+        ok = True
+    finally:
+        ms = (time.perf_counter() - t0) * 1000.0
+        exit_stage(name)
+        for k, (h, m) in _counters().items():
+            h0, m0 = before.get(k, (0, 0))
+            if h - h0 or m - m0:
+                st.details[k] = {"hits": h - h0, "misses": m - m0}
+        row = RunMetric(
+            run_id=uuid.uuid4().hex,
+            batch_id=batch,
+            stage=name,
+            started_at=started_at,
+            finished_at=started_at + timedelta(milliseconds=ms),
+            duration_ms=round(ms, 3),
+            rows_in=st.rows_in,
+            rows_out=st.rows_out,
+            success=ok,
+            details=json.dumps(st.details) if st.details else None,
+        )
+        with _LOCK:
+            _BUFFER.append(row)
+
+def flush() -> int:
+    """Write buffered stage metrics in one transaction; returns the number written."""
+    with _LOCK:
+        rows = _BUFFER[:]
+        _BUFFER.clear()
+    if not rows:
+        return 0
+    try:
+        with get_session() as s:
+            s.add_all(rows)
+            s.commit()
+    except Exception as e:
+        warn(f"could not record {len(rows)} run metrics: {e}")
+        return 0
+    return len(rows)
+
+def percentile(sorted_vals: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list (None when empty)."""
+    if not sorted_vals:
+        return None
+    k = max(0, math.ceil(p / 100.0 * len(sorted_vals)) - 1)
+    return sorted_vals[k]
+
+def _summary(vals: List[float]) -> dict:
+    vals.sort()
+    return {
+        "n": len(vals),
+        "p50": percentile(vals, 50),
+        "p95": percentile(vals, 95),
+        "p99": percentile(vals, 99),
+        "max": vals[-1] if vals else None,
+    }
+
+def stage_latency(since: datetime) -> Dict[str, dict]:
+    """Per-stage duration percentiles (ms), failures, row totals and cache hit rate since ``since``."""
+    durations: Dict[str, List[float]] = {}
+    agg: Dict[str, dict] = {}
+    q = select(RunMetric.stage, RunMetric.duration_ms, RunMetric.success, RunMetric.rows_out, RunMetric.details).where(
+        RunMetric.started_at >= since
+    )
+    with get_read_session() as s:
+        for name, ms, ok, rows_out, details in stream(s, q):
+            durations.setdefault(name, []).append(ms or 0.0)
+            a = agg.setdefault(name, {"failures": 0, "rows_out": 0, "hits": 0, "lookups": 0})
+            a["failures"] += 0 if ok else 1
+            a["rows_out"] += rows_out or 0
+            for c in json.loads(details).values() if details else ():
+                if isinstance(c, dict):
+                    a["hits"] += c.get("hits", 0)
+                    a["lookups"] += c.get("hits", 0) + c.get("misses", 0)
+    out: Dict[str, dict] = {}
+    for name in sorted(durations, key=lambda n: STAGES.index(n) if n in STAGES else len(STAGES)):
+        a = agg[name]
+        out[name] = {
+            **_summary(durations[name]),
+            "failures": a["failures"],
+            "rows_out": a["rows_out"],
+            "hit_rate": a["hits"] / a["lookups"] if a["lookups"] else None,
+        }
+    return out
+
+def freshness_lag(since: datetime) -> Dict[str, dict]:
+    """End-to-end lag percentiles (seconds) for filings whose first signal was written since ``since``.
+
+    ``discovered`` measures discovery → first signal; ``filed`` measures the
+    filing date (midnight) → first signal. The first-signal time is
+    ``Filing.first_signal_at``, which re-scoring and re-parsing never move.
+    """
+    q = select(Filing.discovered_at, Filing.filed_date, Filing.first_signal_at).where(Filing.first_signal_at >= since)
+    discovered: List[float] = []
+    filed: List[float] = []
+    with get_read_session() as s:
+        for disc, filed_date, created in s.exec(q):
+            if disc is not None:
+                discovered.append(max(0.0, (created - disc).total_seconds()))
+            filed.append(max(0.0, (created - datetime.combine(filed_date, datetime.min.time())).total_seconds()))
+    return {"discovered": _summary(discovered), "filed": _summary(filed)}
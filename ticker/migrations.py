@@ -0,0 +1,139 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+def add_column(conn: Connection, table: str, column: str, ddl: str) -> None:
+    """``ALTER TABLE ... ADD COLUMN`` unless the column already exists."""
+    cols = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in cols:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+def create_index(conn: Connection, name: str, table: str, *columns: str) -> None:
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+def _baseline(conn: Connection) -> None:
+    from . import models  # noqa: F401  (registers tables)
+    SQLModel.metadata.create_all(conn)
+
+def _hot_indexes(conn: Connection) -> None:
+    create_index(conn, "ix_filing_member_filed", "filing", "filer_member_id", "filed_date")
+    create_index(conn, "ix_filing_status", "filing", "status")
+    create_index(conn, "ix_trade_filing_txn", "trade", "filing_id", "txn_date")
+    create_index(conn, "ix_trade_txn_date", "trade", "txn_date")
+    create_index(conn, "ix_trade_ticker", "trade", "ticker")
+    create_index(conn, "ix_signal_trade_id", "signal", "trade_id")
+    create_index(conn, "ix_signal_created_at", "signal", "created_at")
+
+def _source_state(conn: Connection) -> None:
+    from .models import SourceState
+    SQLModel.metadata.create_all(conn, tables=[SourceState.__table__])
+
+def _filing_discovered_at(conn: Connection) -> None:
+    add_column(conn, "filing", "discovered_at", "TIMESTAMP")
+
+def _run_metric_columns(conn: Connection) -> None:
+    add_column(conn, "runmetric", "batch_id", "VARCHAR")
+    add_column(conn, "runmetric", "duration_ms", "FLOAT")
+    add_column(conn, "runmetric", "rows_in", "INTEGER")
+    add_column(conn, "runmetric", "rows_out", "INTEGER")
+    create_index(conn, "ix_runmetric_stage_started", "runmetric", "stage", "started_at")
+
+def _ref_state(conn: Connection) -> None:
+    from .models import RefState
+    SQLModel.metadata.create_all(conn, tables=[RefState.__table__])
+
+def _rollups(conn: Connection) -> None:
+    from sqlmodel import Session
+    from .models import MemberDayRollup, TickerDayRollup
+    from .score.rollups import rebuild
+    SQLModel.metadata.create_all(conn, tables=[MemberDayRollup.__table__, TickerDayRollup.__table__])
+    with Session(conn) as s:
+        rebuild(s)
+        s.flush()
+
+def _signal_updated_at(conn: Connection) -> None:
+    add_column(conn, "signal", "updated_at", "TIMESTAMP")
+    conn.execute(text("UPDATE signal SET updated_at = created_at WHERE updated_at IS NULL"))
+    create_index(conn, "ix_signal_updated_at", "signal", "updated_at")
+
+def _filing_first_signal_at(conn: Connection) -> None:
+    add_column(conn, "filing", "first_signal_at", "TIMESTAMP")
+    conn.execute(text(
+        "UPDATE filing SET first_signal_at = ("
+        "SELECT MIN(signal.created_at) FROM trade JOIN signal ON signal.trade_id = trade.trade_id "
+        "WHERE trade.filing_id = filing.filing_id) WHERE first_signal_at IS NULL"
+    ))
+    create_index(conn, "ix_filing_first_signal", "filing", "first_signal_at")
+
+def _trade_ticker_txn(conn: Connection) -> None:
+    create_index(conn, "ix_trade_ticker_txn", "trade", "ticker", "txn_date")
+    conn.execute(text("DROP INDEX IF EXISTS ix_trade_ticker"))  # a prefix of the new index
+
+def _member_follow_watermark(conn: Connection) -> None:
+    create_index(conn, "ix_member_follow_score_updated_at", "member", "follow_score_updated_at")
+
+def _filing_file_stat(conn: Connection) -> None:
+    add_column(conn, "filing", "file_size", "INTEGER")
+    add_column(conn, "filing", "file_mtime_ns", "INTEGER")
+
+def _filing_member_ref(conn: Connection) -> None:
+    add_column(conn, "filing", "filer_member_ref", "VARCHAR")
+    conn.execute(text("UPDATE filing SET filer_member_ref = filer_member_id WHERE filer_member_ref IS NULL"))
+
+# Append new migrations here; never edit or reorder applied ones.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline schema", _baseline),
+    Migration(2, "hot-path indexes", _hot_indexes),
+    Migration(3, "source_state table", _source_state),
+    Migration(4, "filing.discovered_at", _filing_discovered_at),
+    Migration(5, "run_metric stage timings", _run_metric_columns),
+    Migration(6, "ref_state table", _ref_state),
+    Migration(7, "day rollups (member, ticker)", _rollups),
+    Migration(8, "signal.updated_at", _signal_updated_at),
+    Migration(9, "filing.first_signal_at", _filing_first_signal_at),
+    Migration(10, "trade (ticker, txn_date) index", _trade_ticker_txn),
+    Migration(11, "member.follow_score_updated_at index", _member_follow_watermark),
+    Migration(12, "filing file size/mtime", _filing_file_stat),
+    Migration(13, "filing.filer_member_ref", _filing_member_ref),
+]
+
+def _ensure_table(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migration ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    ))
+
+def applied(engine: Engine) -> dict[int, tuple[str, Any]]:
+    """Applied migrations as ``{version: (name, applied_at)}``."""
+    with engine.begin() as conn:
+        _ensure_table(conn)
+        rows = conn.execute(text("SELECT version, name, applied_at FROM schema_migration ORDER BY version"))
+        return {v: (n, at) for v, n, at in rows}
+
+def current(engine: Engine) -> int:
+    """Highest applied migration version (0 for an unversioned database)."""
+    return max(applied(engine), default=0)
+
+def migrate(engine: Engine, target: int | None = None) -> List[int]:
+    """Apply pending migrations up to ``target`` (default: latest), each in its own transaction."""
+    done = applied(engine)
+    ran: List[int] = []
+    for m in MIGRATIONS:
+        if m.version in done or (target is not None and m.version > target):
+            continue
+        with engine.begin() as conn:
+            m.apply(conn)
+            conn.execute(
+                text("INSERT INTO schema_migration (version, name, applied_at) VALUES (:v, :n, :at)"),
+                {"v": m.version, "n": m.name, "at": datetime.utcnow()},
+            )
+        ran.append(m.version)
+    return ran
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from typing import Optional
 from datetime import date, datetime
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Index
 
 class Member(SQLModel, table=True):
+    __table_args__ = (Index("ix_member_follow_score_updated_at", "follow_score_updated_at"),)
     member_id: str = Field(primary_key=True)
     first: str
     last: str
@@ -26,9 +27,15 @@ class MemberCommittee(SQLModel, table=True):
     role: Optional[str] = None
 
 class Filing(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_filing_member_filed", "filer_member_id", "filed_date"),
+        Index("ix_filing_status", "status"),
+        Index("ix_filing_first_signal", "first_signal_at"),
+    )
     filing_id: str = Field(primary_key=True)
     source: str
     filer_member_id: Optional[str] = Field(default=None, foreign_key="member.member_id")
+    filer_member_ref: Optional[str] = None  # member id as listed; linked once that member is loaded
     filer_name_raw: str
     filed_date: date
     period_start: Optional[date] = None
@@ -38,8 +45,17 @@ class Filing(SQLModel, table=True):
     doc_type: str = "PTR"
     status: str = "fetched"
     checksum: Optional[str] = None
+    file_size: Optional[int] = None  # with file_mtime_ns: the local file as of ``checksum``
+    file_mtime_ns: Optional[int] = None
+    discovered_at: Optional[datetime] = None  # when the watcher/ingest first saw it
+    first_signal_at: Optional[datetime] = None  # first signal written for it; kept across re-scores/re-parses
 
 class Trade(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_trade_filing_txn", "filing_id", "txn_date"),
+        Index("ix_trade_txn_date", "txn_date"),
+        Index("ix_trade_ticker_txn", "ticker", "txn_date"),
+    )
     trade_id: str = Field(primary_key=True)
     filing_id: str = Field(foreign_key="filing.filing_id")
     txn_date: date
@@ -52,13 +68,45 @@ class Trade(SQLModel, table=True):
     confidence: float = 1.0
     map_method: Optional[str] = None
 
+class IssuerAlias(SQLModel, table=True):
+    issuer_key: str = Field(primary_key=True)  # normalized, lower-cased issuer name
+    ticker: str
+    cik: Optional[int] = None
+    confidence: float
+    method: str  # exact|fuzzy|extracted|manual
+    first_seen: datetime = Field(default_factory=datetime.utcnow)
+
 class Signal(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_signal_trade_id", "trade_id"),
+        Index("ix_signal_created_at", "created_at"),
+        Index("ix_signal_updated_at", "updated_at"),
+    )
     signal_id: str = Field(primary_key=True)
     trade_id: str = Field(foreign_key="trade.trade_id")
     score: float
     tags: Optional[str] = None
     reason: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)  # first scored; never rewritten
+    updated_at: datetime = Field(default_factory=datetime.utcnow)  # last (re)scored
+
+class MemberDayRollup(SQLModel, table=True):
+    day: date = Field(primary_key=True)  # trade date
+    member_id: str = Field(primary_key=True)  # "" = unknown member
+    trades: int = 0
+    volume: float = 0.0  # sum of amount-band midpoints ($)
+    score_max: Optional[float] = None
+    score_sum: float = 0.0
+    scored: int = 0  # trades with a signal (avg = score_sum / scored)
+
+class TickerDayRollup(SQLModel, table=True):
+    day: date = Field(primary_key=True)
+    ticker: str = Field(primary_key=True)  # "" = unmapped
+    trades: int = 0
+    volume: float = 0.0
+    score_max: Optional[float] = None
+    score_sum: float = 0.0
+    scored: int = 0
 
 class PriceCache(SQLModel, table=True):
     ticker: str = Field(primary_key=True)
@@ -67,12 +115,28 @@ class PriceCache(SQLModel, table=True):
 
 
 class RunMetric(SQLModel, table=True):
+    __table_args__ = (Index("ix_runmetric_stage_started", "stage", "started_at"),)
     run_id: str = Field(primary_key=True)
+    batch_id: Optional[str] = None  # groups the stages of one hotpath/pipeline run
     started_at: datetime
     finished_at: datetime
     stage: str
+    duration_ms: Optional[float] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
     success: bool
-    details: Optional[str] = None
+    details: Optional[str] = None  # JSON: cache hits/misses etc.
+
+class SourceState(SQLModel, table=True):
+    source: str = Field(primary_key=True)  # house|senate
+    fingerprint: Optional[str] = None  # hash of the last listing's filing ids/checksums
+    last_poll: Optional[datetime] = None
+    last_change: Optional[datetime] = None
+
+class RefState(SQLModel, table=True):
+    name: str = Field(primary_key=True)  # members|committees|...
+    fingerprint: str  # hash of the source file(s) last loaded
+    loaded_at: datetime = Field(default_factory=datetime.utcnow)
 
 class MemberSnapshot(SQLModel, table=True):
     member_id: str = Field(foreign_key="member.member_id", primary_key=True)
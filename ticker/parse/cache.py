@@ -0,0 +1,110 @@
+from __future__ import annotations
+import os, zlib
+from typing import Optional
+from ..config import CFG
+from ..utils.hashing import sha256_file
+
+class TextCache:
+    """Content-addressed, size-bounded on-disk cache of extracted filing text.
+
+    Entries live at ``<root>/<sha[:2]>/<sha>.z`` as zlib-compressed UTF-8, keyed by
+    the SHA-256 of the source file. A hit touches the entry's mtime so ``prune``
+    can evict least-recently-used entries first; ``put`` prunes once a tenth of
+    ``max_bytes`` has been written since the last prune, so the directory is
+    not walked on every run.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or os.path.join(CFG.cache_dir, "text")
+        self.max_bytes = CFG.cache_max_mb * 1024 * 1024 if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._written = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.z")
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        p = self._path(key)
+        try:
+            with open(p, "rb") as f:
+                text = zlib.decompress(f.read()).decode("utf-8")
+            os.utime(p)
+        except (OSError, zlib.error, UnicodeDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def put(self, key: Optional[str], text: str) -> None:
+        if not key:
+            return
+        p = self._path(key)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        tmp = f"{p}.{os.getpid()}.tmp"
+        data = zlib.compress(text.encode("utf-8"), 6)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, p)
+        self._written += len(data)
+        if self._written > self.max_bytes // 10:
+            self.prune()
+
+    def lookup(self, path: str, key: Optional[str] = None) -> tuple[Optional[str], Optional[str]]:
+        """Return ``(key, text)`` for a source file; ``text`` is None on a miss.
+
+        Pass ``key`` when the file's SHA-256 is already known to skip hashing it again.
+        """
+        key = key or sha256_file(path)
+        return key, self.get(key)
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        out = []
+        if not os.path.isdir(self.root):
+            return out
+        for d in os.scandir(self.root):
+            if not d.is_dir():
+                continue
+            for e in os.scandir(d.path):
+                if e.name.endswith(".z"):
+                    st = e.stat()
+                    out.append((st.st_mtime, st.st_size, e.path))
+        return out
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "root": self.root,
+            "entries": len(entries),
+            "bytes": sum(e[1] for e in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least-recently-used entries until the cache fits in ``max_bytes``; returns entries removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(e[1] for e in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._written = 0
+        return removed
+
+_CACHE: Optional[TextCache] = None
+
+def get_text_cache() -> TextCache:
+    """Process-wide text cache built from ``CFG``."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = TextCache()
+    return _CACHE
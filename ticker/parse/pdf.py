@@ -1,31 +1,184 @@
 from __future__ import annotations
-import os
-from typing import Optional
+import os, signal
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..utils.logging import warn
 
 try:
     import pdfplumber  # type: ignore
 except Exception:
     pdfplumber = None
 
+# Split PDFs at least this large into page ranges so one big filing can use several cores.
+SPLIT_BYTES = 2 * 1024 * 1024
+PAGES_PER_TASK = 20
+MAX_ATTEMPTS = 2
+
+def _read_plain(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="ignore")
+    except Exception:
+        return None
+
+def _extract_pages(path: str, start: int = 0, stop: Optional[int] = None) -> Optional[str]:
+    """Extract text for pages ``[start, stop)``; raises on extraction errors."""
+    if pdfplumber is None:
+        # Fallback: try to read as plain text
+        return _read_plain(path) if start == 0 else ""
+    with pdfplumber.open(path) as pdf:
+        pages = pdf.pages[start:stop]
+        return "\n".join(page.extract_text() or "" for page in pages)
+
 def extract_text(path: str) -> Optional[str]:
     """Extract text from a PDF or text file."""
     if not os.path.exists(path):
         return None
+    try:
+        return _extract_pages(path)
+    except Exception:
+        return None
 
+def page_count(path: str) -> int:
+    """Number of pages in a PDF (0 if unknown)."""
     if pdfplumber is None:
-        # Fallback: try to read as plain text
-        try:
-            with open(path, "rb") as f:
-                data = f.read().decode("utf-8", errors="ignore")
-                return data
-        except Exception:
-            return None
-
+        return 0
     try:
         with pdfplumber.open(path) as pdf:
-            text = []
-            for page in pdf.pages:
-                text.append(page.extract_text() or "")
-        return "\n".join(text)
+            return len(pdf.pages)
     except Exception:
+        return 0
+
+def _on_alarm(signum, frame):
+    raise TimeoutError("extraction timed out")
+
+@contextmanager
+def time_limit(timeout: Optional[float]):
+    """Raise ``TimeoutError`` in the body after ``timeout`` seconds (worker processes, POSIX only)."""
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _extract_task(path: str, start: int, stop: Optional[int], timeout: Optional[float]) -> Optional[str]:
+    """Worker entry point: extract one page range, aborting after ``timeout`` seconds."""
+    with time_limit(timeout):
+        return _extract_pages(path, start, stop)
+
+def _plan(path: str, pages_per_task: int) -> List[Tuple[int, Optional[int]]]:
+    """Page ranges to extract for ``path``; small files are a single task."""
+    try:
+        big = os.path.getsize(path) >= SPLIT_BYTES
+    except OSError:
+        big = False
+    n = page_count(path) if big else 0
+    if n <= pages_per_task:
+        return [(0, None)]
+    return [(i, min(i + pages_per_task, n)) for i in range(0, n, pages_per_task)]
+
+def extract_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    pages_per_task: int = PAGES_PER_TASK,
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """Extract text from many files on a process pool, yielding ``(path, text)`` as each completes.
+
+    Large PDFs are split into page ranges. A document whose extraction raises,
+    times out, or crashes its worker yields ``None`` without affecting the others:
+    after a crash the unfinished tasks are rerun one per process, and only the
+    one that crashes again alone is given up on.
+    """
+    from ..config import CFG
+    workers = workers or CFG.parse_workers or os.cpu_count() or 1
+    timeout = CFG.parse_timeout if timeout is None else timeout
+
+    parts: Dict[str, List[Optional[str]]] = {}
+    remaining: Dict[str, int] = {}
+    failed: set = set()
+    tasks: List[Tuple[str, int, int, Optional[int]]] = []
+    for path in dict.fromkeys(paths):
+        if not os.path.exists(path):
+            yield path, None
+            continue
+        plan = _plan(path, pages_per_task)
+        parts[path] = [None] * len(plan)
+        remaining[path] = len(plan)
+        tasks.extend((path, i, start, stop) for i, (start, stop) in enumerate(plan))
+    if not tasks:
+        return
+
+    def settle(task, text: Optional[str], ok: bool):
+        path, idx = task[0], task[1]
+        if not ok:
+            failed.add(path)
+        parts[path][idx] = text
+        remaining[path] -= 1
+        if remaining[path] == 0:
+            return path, (None if path in failed else "\n".join(p or "" for p in parts[path]))
         return None
+
+    # First pass on one shared pool. A worker crash breaks the whole pool and
+    # every unfinished task with it, so those become suspects rather than
+    # failures: each is rerun alone in its own process, and only a task that
+    # crashes its own worker is charged an attempt.
+    suspects: List[Tuple[str, int, int, Optional[int]]] = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        futs = {pool.submit(_extract_task, t[0], t[2], t[3], timeout): t for t in tasks}
+        while futs:
+            done, _ = wait(futs, return_when=FIRST_COMPLETED)
+            for fut in done:
+                task = futs.pop(fut)
+                try:
+                    out = settle(task, fut.result(), True)
+                except BrokenProcessPool:
+                    suspects.append(task)
+                    continue
+                except Exception as e:
+                    warn(f"extraction failed for {task[0]}: {e}")
+                    out = settle(task, None, False)
+                if out:
+                    yield out
+    if not suspects:
+        return
+
+    # Each suspect gets a single-worker pool of its own, ``workers`` at a time.
+    attempts = {t: 0 for t in suspects}
+    queue = list(reversed(suspects))
+    pools: Dict = {}
+    futs = {}
+    try:
+        while queue or futs:
+            while queue and len(futs) < workers:
+                task = queue.pop()
+                pool = ProcessPoolExecutor(max_workers=1)
+                fut = pool.submit(_extract_task, task[0], task[2], task[3], timeout)
+                pools[fut], futs[fut] = pool, task
+            done, _ = wait(futs, return_when=FIRST_COMPLETED)
+            for fut in done:
+                task = futs.pop(fut)
+                pools.pop(fut).shutdown(wait=False)
+                try:
+                    out = settle(task, fut.result(), True)
+                except BrokenProcessPool:
+                    attempts[task] += 1
+                    if attempts[task] < MAX_ATTEMPTS:
+                        queue.append(task)
+                        continue
+                    warn(f"extraction worker crashed on {task[0]}")
+                    out = settle(task, None, False)
+                except Exception as e:
+                    warn(f"extraction failed for {task[0]}: {e}")
+                    out = settle(task, None, False)
+                if out:
+                    yield out
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
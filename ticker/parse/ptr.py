@@ -1,7 +1,7 @@
 from __future__ import annotations
-import re, uuid
+import re
 from datetime import date
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from ..models import Filing, Trade
 from ..utils.text import normalize_issuer
 
@@ -13,9 +13,14 @@ TRADE_LINE = re.compile(
 )
 
 def parse_text_to_trades(text: str, filing: Filing) -> List[Trade]:
-    """Parse plain text into Trade objects."""
+    """Parse plain text into Trade objects.
+
+    Trade ids are ``<filing_id>:<n>`` for the filing's n-th trade line, so
+    re-parsing a filing gives its trades the same ids (and keeps their
+    signals attached).
+    """
     trades: List[Trade] = []
-    for m in TRADE_LINE.finditer(text):
+    for n, m in enumerate(TRADE_LINE.finditer(text)):
         d = date.fromisoformat(m.group("date"))
         issuer = m.group("issuer").strip()
         ticker = (m.group("ticker") or "").strip() or None
@@ -24,7 +29,7 @@ def parse_text_to_trades(text: str, filing: Filing) -> List[Trade]:
 
         trades.append(
             Trade(
-                trade_id=str(uuid.uuid4()),
+                trade_id=f"{filing.filing_id}:{n}",
                 filing_id=filing.filing_id,
                 txn_date=d,
                 issuer_raw=normalize_issuer(issuer),
@@ -39,21 +44,76 @@ def parse_text_to_trades(text: str, filing: Filing) -> List[Trade]:
         )
     return trades
 
-def parse_pdf_file(path: str, filing: Filing) -> Tuple[List[Trade], Optional[str]]:
-    """Parse a filing file into trades + return raw text."""
-    from .pdf import extract_text
-    text = None
+def _read_txt(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except Exception:
+        return None
+
+def load_filing_text(path: str, timeout: Optional[float] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Return ``(text, sha256)`` for a filing file, going through the text cache for PDFs.
+
+    Safe to call in a worker process; ``timeout`` bounds PDF extraction.
+    """
+    from .pdf import extract_text, time_limit
+    from .cache import get_text_cache
+    from ..utils.hashing import sha256_file
 
     # Allow direct .txt fixture files
     if path and path.lower().endswith(".txt"):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                text = f.read()
-        except Exception:
-            text = None
+        text = _read_txt(path)
+        if text is not None:
+            return text, sha256_file(path)
 
+    cache = get_text_cache()
+    key, text = cache.lookup(path or "")
     if text is None:
-        text = extract_text(path or "") or ""
+        with time_limit(timeout):
+            text = extract_text(path or "")
+        if text is not None:
+            cache.put(key, text)
+    return text, key
 
-    trades = parse_text_to_trades(text or "", filing)
+def parse_pdf_file(path: str, filing: Filing) -> Tuple[List[Trade], Optional[str]]:
+    """Parse a filing file into trades + return raw text."""
+    text, _ = load_filing_text(path or "")
+    text = text or ""
+    trades = parse_text_to_trades(text, filing)
     return trades, text
+
+def parse_filings(
+    filings: Iterable[Filing],
+    workers: Optional[int] = None,
+    checksums: Optional[Dict[str, Optional[str]]] = None,
+) -> Iterator[Tuple[Filing, List[Trade], Optional[str]]]:
+    """Parse many filings, yielding ``(filing, trades, text)`` as each completes.
+
+    Text fixtures are read inline and PDFs already in the text cache are
+    served from it (``checksums``, by filing id, saves hashing files the caller
+    already hashed); the rest are extracted on a process pool
+    (see ``parse.pdf.extract_many``), so a PDF that hangs or crashes its
+    worker only fails its own filings.
+    """
+    from .pdf import extract_many
+    from .cache import get_text_cache
+    cache = get_text_cache()
+    by_path: dict = {}
+    keys: dict = {}
+    for f in filings:
+        path = f.file_local_path or ""
+        text = _read_txt(path) if path.lower().endswith(".txt") else None
+        if text is None and path not in by_path:
+            keys[path], text = cache.lookup(path, (checksums or {}).get(f.filing_id))
+        if text is not None:
+            yield f, parse_text_to_trades(text, f), text
+        else:
+            by_path.setdefault(path, []).append(f)
+
+    if not by_path:
+        return
+    for path, text in extract_many(by_path, workers=workers):
+        if text is not None:
+            cache.put(keys.get(path), text)
+        for f in by_path[path]:
+            yield f, parse_text_to_trades(text or "", f), text
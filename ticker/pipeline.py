@@ -0,0 +1,150 @@
+from __future__ import annotations
+import asyncio, os, time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Dict, List, Optional
+from . import metrics
+from .config import CFG
+from .utils.logging import info, error, banner
+from .hotpath import ingest_rows, member_ids, store_parsed, map_all, mark_failed
+from .parse.ptr import load_filing_text
+from .score.signals import score_all_new_trades, compute_follow_scores
+
+async def _worker(
+    q: asyncio.Queue,
+    stage: str,
+    fn: Callable[[tuple], Awaitable[None]],
+    on_error: Callable[[tuple], Awaitable[None]],
+) -> None:
+    while True:
+        item = await q.get()
+        try:
+            await fn(item)
+        except Exception as e:
+            error(f"pipeline {stage} failed for {item[0]}: {e}")
+            try:
+                await on_error(item)
+            except Exception as e2:
+                error(f"could not mark {item[0]} failed: {e2}")
+        finally:
+            q.task_done()
+
+def _extract(path: str, timeout: Optional[float]) -> tuple:
+    """Worker entry point: ``(text, checksum, cache_hit)``; ``cache_hit`` is None when the cache was not consulted."""
+    from .parse.cache import get_text_cache
+    cache = get_text_cache()
+    hits, misses = cache.hits, cache.misses
+    text, checksum = load_filing_text(path, timeout)
+    consulted = cache.hits != hits or cache.misses != misses
+    return text, checksum, (cache.hits > hits) if consulted else None
+
+async def run_pipeline(
+    new: Dict[str, List[Dict]],
+    score: bool = True,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+) -> int:
+    """Stream each new filing through ingest → extract → parse/map → score, then follow-score the batch.
+
+    Filings move independently between stages over bounded ``asyncio`` queues,
+    so a filing's signal is written as soon as its own stages finish rather than
+    after the whole batch. Text extraction runs on a process pool; database
+    stages share one writer thread so they never contend for the SQLite lock.
+    Every stage of every filing is recorded as a ``RunMetric`` row. A filing
+    whose extraction or any later stage fails is marked ``failed`` (and retried
+    by the next parse or watch run). Member follow scores are recomputed once,
+    after the score queue drains. Returns the number of filings that reached the
+    end of the pipeline.
+    """
+    loop = asyncio.get_running_loop()
+    workers = workers or CFG.parse_workers or os.cpu_count() or 1
+    size = queue_size or 2 * workers
+    q_extract: asyncio.Queue = asyncio.Queue(size)
+    q_store: asyncio.Queue = asyncio.Queue(size)
+    q_score: asyncio.Queue = asyncio.Queue(size)
+    finished = 0
+    batch = metrics.new_batch()
+    banner("Pipeline")
+
+    cpu = ProcessPoolExecutor(workers)
+    solo = ProcessPoolExecutor(1)
+    solo_lock = asyncio.Lock()
+    with ThreadPoolExecutor(1, thread_name_prefix="ticker-db") as db:
+
+        async def extract(item: tuple) -> None:
+            nonlocal cpu, solo
+            fid, path, t0 = item
+            with metrics.stage("extract", batch, 1) as st:
+                pool = cpu
+                try:
+                    text, checksum, hit = await loop.run_in_executor(pool, _extract, path, CFG.parse_timeout)
+                except BrokenProcessPool:
+                    # A worker crash breaks the pool under every in-flight filing:
+                    # replace it and rerun this filing alone, so only the one that
+                    # actually kills its worker is marked failed.
+                    if cpu is pool:
+                        cpu = ProcessPoolExecutor(workers)
+                        pool.shutdown(wait=False)
+                    async with solo_lock:
+                        try:
+                            text, checksum, hit = await loop.run_in_executor(solo, _extract, path, CFG.parse_timeout)
+                        except BrokenProcessPool:
+                            solo.shutdown(wait=False)
+                            solo = ProcessPoolExecutor(1)
+                            raise
+                st.rows_out = int(text is not None)
+                if hit is not None:
+                    st.details["text_cache"] = {"hits": int(hit), "misses": int(not hit)}
+                if text is None:
+                    raise RuntimeError(f"no text extracted from {path or '(no file)'}")
+            await q_store.put((fid, text, checksum, t0))
+
+        async def store(item: tuple) -> None:
+            fid, text, checksum, t0 = item
+            with metrics.stage("parse", batch, 1) as st:
+                st.rows_out = await loop.run_in_executor(db, store_parsed, fid, text, checksum)
+            with metrics.stage("map", batch, st.rows_out) as st:
+                st.rows_out = await loop.run_in_executor(db, map_all, True, [fid])
+            if score:
+                await q_score.put((fid, t0))
+            else:
+                done(fid, t0)
+
+        async def rate(item: tuple) -> None:
+            fid, t0 = item
+            with metrics.stage("score", batch) as st:
+                st.rows_out = await loop.run_in_executor(db, score_all_new_trades, False, [fid])
+            done(fid, t0)
+
+        async def failed(item: tuple) -> None:
+            await loop.run_in_executor(db, mark_failed, [item[0]])
+
+        def done(fid: str, t0: float) -> None:
+            nonlocal finished
+            finished += 1
+            info(f"{fid} processed in {time.monotonic() - t0:.2f}s")
+
+        tasks = [asyncio.create_task(_worker(q_extract, "extract", extract, failed)) for _ in range(workers)]
+        tasks.append(asyncio.create_task(_worker(q_store, "store", store, failed)))
+        tasks.append(asyncio.create_task(_worker(q_score, "score", rate, failed)))
+        try:
+            members = await loop.run_in_executor(db, member_ids)
+            for source, rows in new.items():
+                for row in rows:
+                    t0 = time.monotonic()
+                    with metrics.stage("ingest", batch, 1) as st:
+                        st.rows_out = await loop.run_in_executor(db, ingest_rows, {source: [row]}, members)
+                    await q_extract.put((row["filing_id"], row.get("file_local_path") or "", t0))
+            for q in (q_extract, q_store, q_score):
+                await q.join()
+            if score and finished:
+                with metrics.stage("follow", batch) as st:
+                    st.rows_out = await loop.run_in_executor(db, compute_follow_scores)
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.run_in_executor(db, metrics.flush)
+            cpu.shutdown()
+            solo.shutdown()
+    return finished
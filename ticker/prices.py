@@ -0,0 +1,286 @@
+from __future__ import annotations
+import csv, json, os, struct
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .config import CFG
+
+# Columnar end-of-day close store, compiled from local CSV/Parquet files.
+#
+# Layout: MAGIC | u16 format version | u32 header length | JSON header | pad to 8 |
+# int64 keys[rows] | float64 closes[rows]. A key is ``code << 32 | day + 2**31``
+# where ``code`` is the ticker's position in the header's sorted ticker list and
+# ``day`` counts days since 1970-01-01, so rows are ordered by (ticker, date):
+# each ticker's history is one contiguous slice and a (ticker, date) lookup
+# is one ``searchsorted`` over the mapped keys.
+
+MAGIC = b"TKPRC"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<5sHI")
+_DAY_BITS = 32
+_DAY_MASK = (1 << _DAY_BITS) - 1
+_DAY_BIAS = 1 << 31  # keeps pre-1970 days non-negative
+
+TICKER_COLUMNS = ("ticker", "symbol")
+DATE_COLUMNS = ("date", "as_of", "timestamp")
+CLOSE_COLUMNS = ("close", "adj_close", "adj close", "adjclose")
+
+def store_path() -> str:
+    return os.path.join(CFG.cache_dir, "prices", "close.store")
+
+def _days(dates) -> np.ndarray:
+    """Days since the epoch for ISO strings, ``date`` objects or ``datetime64`` values."""
+    arr = np.asarray(dates)
+    if arr.dtype.kind in "US":
+        arr = arr.astype("U10")
+    return arr.astype("datetime64[D]").astype(np.int64)
+
+def _key(codes: np.ndarray, days: np.ndarray) -> np.ndarray:
+    return (codes.astype(np.int64) << _DAY_BITS) | (days + _DAY_BIAS)
+
+def _day(keys) -> np.ndarray:
+    return (np.asarray(keys) & _DAY_MASK) - _DAY_BIAS
+
+class PriceStore:
+    """Memory-mapped closes for many tickers (see the module comment for the layout)."""
+
+    def __init__(self, tickers: List[str], keys: np.ndarray, close: np.ndarray, header: Optional[dict] = None):
+        self.tickers = tickers
+        self.codes: Dict[str, int] = {t: i for i, t in enumerate(tickers)}
+        self.keys = keys
+        self.close = close
+        self.header = header or {}
+        # per-ticker [start, end) row ranges
+        bounds = np.searchsorted(keys, np.arange(len(tickers) + 1, dtype=np.int64) << _DAY_BITS)
+        self._start, self._end = bounds[:-1], bounds[1:]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def empty(cls) -> "PriceStore":
+        return cls([], np.empty(0, np.int64), np.empty(0, np.float64))
+
+    @classmethod
+    def open(cls, path: Optional[str] = None) -> "PriceStore":
+        """Map the store at ``path`` (empty when missing or from another format version)."""
+        path = path or store_path()
+        try:
+            with open(path, "rb") as f:
+                magic, version, hlen = _PREFIX.unpack(f.read(_PREFIX.size))
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    return cls.empty()
+                header = json.loads(f.read(hlen))
+        except (OSError, ValueError, struct.error):
+            return cls.empty()
+        n = header["rows"]
+        if not n:
+            return cls(header["tickers"], np.empty(0, np.int64), np.empty(0, np.float64), header)
+        body = _PREFIX.size + hlen + (-(_PREFIX.size + hlen) % 8)
+        keys = np.memmap(path, dtype="<i8", mode="r", offset=body, shape=(n,))
+        close = np.memmap(path, dtype="<f8", mode="r", offset=body + 8 * n, shape=(n,))
+        return cls(header["tickers"], keys, close, header)
+
+    def history(self, ticker: str) -> Tuple[np.ndarray, np.ndarray]:
+        """``(dates, closes)`` of one ticker as views into the mapping (empty if unknown)."""
+        i = self.codes.get(ticker.upper())
+        if i is None:
+            return np.empty(0, "datetime64[D]"), np.empty(0, np.float64)
+        sl = slice(self._start[i], self._end[i])
+        return _day(self.keys[sl]).astype("datetime64[D]"), np.asarray(self.close[sl])
+
+    def close_on_or_after(self, tickers: Sequence[str], dates, max_days: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """First close on or after each ``(ticker, date)`` pair, vectorized.
+
+        Returns ``(closes, dates)``: float64 closes (NaN when the ticker is unknown,
+        has no later close, or the next close is more than ``max_days`` after the
+        requested date) and the ``datetime64[D]`` dates they were taken from (NaT
+        where missing). Only the distinct tickers are looked up in Python.
+        """
+        uniq, inverse = np.unique(np.asarray(tickers, dtype=str), return_inverse=True)
+        codes = np.array([self.codes.get(t.upper(), -1) for t in uniq], dtype=np.int64)[inverse]
+        days = _days(dates)
+        closes = np.full(len(days), np.nan)
+        on = np.full(len(days), np.datetime64("NaT"), dtype="datetime64[D]")
+        if not len(self.keys):
+            return closes, on
+        known = codes >= 0
+        c = np.where(known, codes, 0)
+        idx = np.searchsorted(self.keys, _key(c, days))
+        hit = known & (idx < self._end[c])
+        idx = idx[hit]
+        found = _day(self.keys[idx])
+        if max_days is not None:
+            near = found - days[hit] <= max_days
+            hit[hit] = near
+            idx, found = idx[near], found[near]
+        closes[hit] = self.close[idx]
+        on[hit] = found.astype("datetime64[D]")
+        return closes, on
+
+def _pick(columns: List[str], names: Sequence[str]) -> Optional[int]:
+    lower = [c.strip().lower() for c in columns]
+    for n in names:
+        if n in lower:
+            return lower.index(n)
+    return None
+
+def _default_ticker(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0].split(".")[0].upper()
+
+def _read_csv(path: str) -> Tuple[List[str], List[str], List[str]]:
+    """Ticker, date and close columns of one CSV (ticker from the file name when absent)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        ti, di, ci = _pick(header, TICKER_COLUMNS), _pick(header, DATE_COLUMNS), _pick(header, CLOSE_COLUMNS)
+        if di is None or ci is None:
+            raise ValueError(f"{path}: needs a date and a close column")
+        default = _default_ticker(path)
+        tickers, dates, closes = [], [], []
+        for r in reader:
+            if len(r) <= max(di, ci) or not r[ci] or r[ci].lower() in ("null", "nan"):
+                continue
+            tickers.append(r[ti].strip().upper() if ti is not None else default)
+            dates.append(r[di][:10])
+            closes.append(r[ci])
+    return tickers, dates, closes
+
+def _read_parquet(path: str) -> Tuple[List[str], List[str], List[str]]:
+    try:
+        import pandas as pd
+        df = pd.read_parquet(path)
+    except ImportError as e:
+        raise ValueError(f"{path}: reading Parquet needs pandas with pyarrow or fastparquet ({e})")
+    cols = list(map(str, df.columns))
+    ti, di, ci = _pick(cols, TICKER_COLUMNS), _pick(cols, DATE_COLUMNS), _pick(cols, CLOSE_COLUMNS)
+    if di is None or ci is None:
+        raise ValueError(f"{path}: needs a date and a close column")
+    df = df[df.iloc[:, ci].notna()]
+    tickers = df.iloc[:, ti].astype(str).str.strip().str.upper().tolist() if ti is not None else [_default_ticker(path)] * len(df)
+    dates = pd.to_datetime(df.iloc[:, di]).dt.strftime("%Y-%m-%d").tolist()
+    return tickers, dates, df.iloc[:, ci].tolist()
+
+def price_files(paths: Iterable[str]) -> List[str]:
+    """CSV/Parquet files among ``paths`` (directories are scanned, not recursively)."""
+    out: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            out.extend(
+                os.path.join(p, fn) for fn in sorted(os.listdir(p))
+                if fn.lower().endswith((".csv", ".parquet", ".pq"))
+            )
+        else:
+            out.append(p)
+    return out
+
+def read_prices(files: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(tickers, days, closes)`` arrays from price files, in file order."""
+    tickers: List[str] = []
+    dates: List[str] = []
+    closes: List = []
+    for path in files:
+        read = _read_parquet if path.lower().endswith((".parquet", ".pq")) else _read_csv
+        t, d, c = read(path)
+        tickers += t
+        dates += d
+        closes += c
+    return np.array(tickers, dtype=str), _days(np.array(dates, dtype="U10")), np.array(closes, dtype=np.float64)
+
+def _merge(base: PriceStore, tickers: np.ndarray, days: np.ndarray, closes: np.ndarray) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Union of ``base`` and new rows; a new close replaces the stored one for the same (ticker, date)."""
+    old_tickers = np.asarray(base.tickers, dtype=str)[np.asarray(base.keys) >> _DAY_BITS]
+    names, codes = np.unique(np.concatenate([old_tickers, tickers]), return_inverse=True)
+    keys = _key(codes, np.concatenate([_day(base.keys), days]))
+    vals = np.concatenate([np.asarray(base.close), closes])
+    # Stable sort keeps file order within equal keys; the last occurrence wins.
+    order = np.argsort(keys, kind="stable")
+    keys, vals = keys[order], vals[order]
+    last = np.append(keys[1:] != keys[:-1], True) if len(keys) else np.empty(0, bool)
+    return names.tolist(), keys[last], vals[last]
+
+def write_store(path: str, tickers: List[str], keys: np.ndarray, close: np.ndarray, sources: List[str]) -> None:
+    """Write the store atomically."""
+    days = _day(keys)
+    header = json.dumps({
+        "tickers": tickers,
+        "rows": int(len(keys)),
+        "first": str(days.min().astype("datetime64[D]")) if len(keys) else None,
+        "last": str(days.max().astype("datetime64[D]")) if len(keys) else None,
+        "sources": sources,
+    }).encode("utf-8")
+    head = _PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)) + header
+    head += b"\0" * (-len(head) % 8)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(head)
+        f.write(keys.astype("<i8").tobytes())
+        f.write(close.astype("<f8").tobytes())
+    os.replace(tmp, path)
+
+def mirror(tickers: List[str], keys: np.ndarray, closes: np.ndarray) -> int:
+    """Upsert closes (store-encoded keys) into ``PriceCache`` in chunked multi-row statements."""
+    from .db import CHUNK, get_session, upsert
+    from .models import PriceCache
+    epoch = date(1970, 1, 1).toordinal()
+    names = np.asarray(tickers, dtype=object)
+    n = 0
+    with get_session() as s:
+        for i in range(0, len(keys), CHUNK):
+            k = keys[i:i + CHUNK]
+            rows = [
+                {"ticker": t, "as_of": date.fromordinal(epoch + d), "close": c}
+                for t, d, c in zip(names[k >> _DAY_BITS].tolist(), _day(k).tolist(), closes[i:i + CHUNK].tolist())
+            ]
+            n += upsert(s, PriceCache, rows, ["ticker", "as_of"])
+        s.commit()
+    return n
+
+def load_prices(paths: Iterable[str], to_db: bool = True, path: Optional[str] = None) -> dict:
+    """Import closes from CSV/Parquet ``paths`` into the store (merging) and, by default, ``PriceCache``."""
+    path = path or store_path()
+    files = price_files(paths)
+    tickers, days, closes = read_prices(files)
+    new_names, new_keys, new_vals = _merge(PriceStore.empty(), tickers, days, closes)
+    base = PriceStore.open(path)
+    names, keys, vals = _merge(base, np.asarray(new_names, dtype=str)[new_keys >> _DAY_BITS], _day(new_keys), new_vals)
+    sources = sorted(set(base.header.get("sources", [])) | {os.path.abspath(f) for f in files})
+    write_store(path, names, keys, vals, sources)
+    mirrored = mirror(new_names, new_keys, new_vals) if to_db else 0
+    return {"files": len(files), "rows_read": int(len(tickers)), "tickers": len(names), "rows": int(len(keys)), "mirrored": mirrored}
+
+def rebuild_from_db(path: Optional[str] = None) -> int:
+    """Recompile the store from ``PriceCache`` (e.g. after the cache directory was cleared)."""
+    from sqlmodel import select
+    from .db import get_read_session, stream
+    from .models import PriceCache
+    tickers: List[str] = []
+    dates: List[date] = []
+    closes: List[float] = []
+    with get_read_session() as s:
+        for t, d, c in stream(s, select(PriceCache.ticker, PriceCache.as_of, PriceCache.close)):
+            tickers.append(t)
+            dates.append(d)
+            closes.append(c)
+    names, keys, vals = _merge(
+        PriceStore.empty(), np.array(tickers, dtype=str), _days(np.array(dates, dtype="datetime64[D]")), np.array(closes, dtype=np.float64)
+    )
+    write_store(path or store_path(), names, keys, vals, ["db:price_cache"])
+    return len(keys)
+
+def status(path: Optional[str] = None) -> dict:
+    """Row/ticker counts, date range and size of the store (for CLI)."""
+    path = path or store_path()
+    st = PriceStore.open(path)
+    if not len(st) and not os.path.exists(path):
+        return {"path": path, "exists": False}
+    return {
+        "path": path,
+        "rows": len(st),
+        "tickers": len(st.tickers),
+        "first": st.header.get("first"),
+        "last": st.header.get("last"),
+        "bytes": os.path.getsize(path),
+        "sources": len(st.header.get("sources", [])),
+    }
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import cProfile, io, pstats, re, threading, time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# A statement shape executed at least this many times in one command is reported as a likely N+1.
+N_PLUS_ONE = 25
+TOP_FUNCTIONS = 40
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)|\((?:\s*%\(\w+\)s\s*,)+\s*%\(\w+\)s\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+def query_shape(sql: str) -> str:
+    """Normalize a statement so executions differing only in literals/IN-list length compare equal."""
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    sql = _LITERAL.sub("?", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+class Profiler:
+    """cProfile + SQL statement counting for one CLI command.
+
+    Statements are counted through a ``before_cursor_execute`` listener on every
+    engine, attributed to the innermost open ``metrics.stage`` (approximate when
+    pipeline stages overlap), and grouped by normalized shape to spot N+1
+    patterns. cProfile covers the main thread only: pipeline DB threads and
+    extraction worker processes show up in SQL counts but not in the profile.
+    """
+
+    active: Optional["Profiler"] = None
+
+    def __init__(self, command: str):
+        self.command = command
+        self.prof = cProfile.Profile()
+        self.shapes: Counter = Counter()
+        self.by_stage: Dict[str, Counter] = {}
+        self.stages: List[str] = []
+        self.statements = 0
+        self._lock = threading.Lock()
+        self._t0 = 0.0
+        self.elapsed = 0.0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        shape = query_shape(statement)
+        stage = self.stages[-1] if self.stages else "-"
+        with self._lock:
+            self.statements += 1
+            self.shapes[shape] += 1
+            self.by_stage.setdefault(stage, Counter())[shape] += 1
+
+    def start(self) -> None:
+        Profiler.active = self
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+        self._t0 = time.perf_counter()
+        self.prof.enable()
+
+    def stop(self) -> None:
+        self.prof.disable()
+        self.elapsed = time.perf_counter() - self._t0
+        event.remove(Engine, "before_cursor_execute", self._on_execute)
+        Profiler.active = None
+
+    def suspects(self, threshold: int = N_PLUS_ONE) -> List[Tuple[str, int]]:
+        """Statement shapes repeated at least ``threshold`` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        out = io.StringIO()
+        out.write(f"ticker {self.command} • {datetime.now().isoformat(timespec='seconds')}\n")
+        out.write(f"wall time: {self.elapsed:.3f}s  SQL statements: {self.statements}\n\n")
+        out.write("SQL statements by stage\n")
+        for stage, shapes in self.by_stage.items():
+            out.write(f"  {stage:<10} {sum(shapes.values()):>8}  ({len(shapes)} distinct)\n")
+        suspects = self.suspects()
+        out.write(f"\nRepeated statement shapes (>= {N_PLUS_ONE} executions, possible N+1)\n")
+        if not suspects:
+            out.write("  none\n")
+        for shape, n in suspects:
+            out.write(f"  {n:>8}x  {shape[:300]}\n")
+        out.write(f"\ncProfile (top {TOP_FUNCTIONS} by cumulative time)\n")
+        stats = pstats.Stats(self.prof, stream=out)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        return out.getvalue()
+
+    def write(self, path: Optional[str] = None) -> str:
+        """Write the text report (and ``<path>.prof`` raw stats) and return the report path."""
+        path = path or f"ticker-profile-{self.command}-{datetime.now():%Y%m%d-%H%M%S}.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        self.prof.dump_stats(f"{path}.prof")
+        return path
+
+def enter_stage(name: str) -> None:
+    p = Profiler.active
+    if p is not None:
+        p.stages.append(name)
+
+def exit_stage(name: str) -> None:
+    p = Profiler.active
+    if p is None:
+        return
+    for i in range(len(p.stages) - 1, -1, -1):
+        if p.stages[i] == name:
+            del p.stages[i]
+            break
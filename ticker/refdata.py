@@ -0,0 +1,229 @@
+from __future__ import annotations
+import json, mmap, os, struct, sys
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .config import CFG
+from .utils.hashing import sha256_file
+
+# Compiled, memory-mapped snapshots of reference data (fixtures, SEC tickers).
+#
+# Layout: MAGIC | u16 format version | u32 header length | JSON header | pad to 8 |
+# per column: u32 little-endian offsets[rows + 1] followed by the UTF-8 values
+# concatenated. Values are decoded lazily from the mapping, so attaching a
+# snapshot costs one open + mmap regardless of its size.
+
+MAGIC = b"TKREF"
+FORMAT_VERSION = 1
+NULL = "\x00"  # stored for None
+_PREFIX = struct.Struct("<5sHI")
+
+Builder = Callable[[], Tuple[List[str], List[Sequence[Optional[object]]]]]
+
+class Column(Sequence):
+    """Lazily decoded string column backed by the snapshot mapping."""
+
+    def __init__(self, offsets, data: memoryview):
+        self._off = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        v = bytes(self._data[self._off[i]:self._off[i + 1]]).decode("utf-8")
+        return None if v == NULL else v
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+class RefTable:
+    """A read-only table attached from a snapshot file (all values are strings or None)."""
+
+    def __init__(self, name: str, header: dict, buf, body: int):
+        self.name = name
+        self.header = header
+        self.columns: List[str] = header["columns"]
+        self.rows: int = header["rows"]
+        self._buf = buf
+        self._cols: Dict[str, Column] = {}
+        mv = memoryview(buf)
+        for col, (off_pos, data_pos, data_len) in header["layout"].items():
+            raw = mv[body + off_pos:body + data_pos]
+            if sys.byteorder == "little":
+                offsets = raw.cast("I")
+            else:
+                offsets = array("I", raw.tobytes())
+                offsets.byteswap()
+            self._cols[col] = Column(offsets, mv[body + data_pos:body + data_pos + data_len])
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> Column:
+        return self._cols[name]
+
+    def row(self, i: int) -> dict:
+        """Row ``i`` as a dict, omitting columns that are None for it."""
+        out = {}
+        for c in self.columns:
+            v = self._cols[c][i]
+            if v is not None:
+                out[c] = v
+        return out
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self.rows):
+            yield self.row(i)
+
+def _stat(path: str) -> List:
+    try:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return [None, None]
+
+def _snapshot_path(name: str) -> str:
+    return os.path.join(CFG.cache_dir, "refdata", f"{name}.snap")
+
+def _fresh(header: dict, sources: List[str]) -> bool:
+    """Sources unchanged: same size/mtime, or (after a touch/copy) the same SHA-256."""
+    recorded = header.get("sources", [])
+    if [s[0] for s in recorded] != sources:
+        return False
+    if all(_stat(p) == s[1:3] for p, s in zip(sources, recorded)):
+        return True
+    return all(sha256_file(p) == s[3] for p, s in zip(sources, recorded))
+
+def write_snapshot(path: str, name: str, sources: List[str], columns: List[str], rows: List[Sequence]) -> None:
+    """Compile ``rows`` into a snapshot at ``path`` (atomically replaced)."""
+    body = bytearray()
+    layout = {}
+    for ci, col in enumerate(columns):
+        offsets = array("I", [0])
+        blob = bytearray()
+        for r in rows:
+            v = r[ci]
+            blob += (NULL if v is None else str(v)).encode("utf-8")
+            offsets.append(len(blob))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        body += b"\0" * (-len(body) % 4)
+        off_pos = len(body)
+        body += offsets.tobytes()
+        layout[col] = [off_pos, len(body), len(blob)]
+        body += blob
+    header = json.dumps({
+        "name": name,
+        "columns": columns,
+        "rows": len(rows),
+        "layout": layout,
+        "sources": [[p, *_stat(p), sha256_file(p)] for p in sources],
+    }).encode("utf-8")
+    head = _PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)) + header
+    head += b"\0" * (-len(head) % 8)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(head)
+        f.write(body)
+    os.replace(tmp, path)
+
+def attach(path: str, name: str) -> Optional[RefTable]:
+    """Map a snapshot file; None if it is missing, truncated or from another format version."""
+    try:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, hlen = _PREFIX.unpack_from(buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("foreign snapshot")
+        start = _PREFIX.size
+        header = json.loads(bytes(buf[start:start + hlen]))
+        body = start + hlen + (-(start + hlen) % 8)
+        return RefTable(name, header, buf, body)
+    except (ValueError, KeyError, struct.error):
+        buf.close()
+        return None
+
+_LOADED: Dict[str, Tuple[List, RefTable]] = {}
+
+def load(name: str, sources: List[str], build: Builder) -> RefTable:
+    """Return the snapshot ``name`` compiled from ``sources``, (re)building it when they change.
+
+    The table is cached per process; later calls only ``stat`` the sources.
+    """
+    sig = [_stat(p) for p in sources]
+    hit = _LOADED.get(name)
+    if hit and hit[0] == sig:
+        return hit[1]
+    path = _snapshot_path(name)
+    table = attach(path, name)
+    if table is None or not _fresh(table.header, sources):
+        columns, rows = build()
+        write_snapshot(path, name, sources, columns, rows)
+        table = attach(path, name)
+        if table is None:
+            raise RuntimeError(f"could not attach reference snapshot {path}")
+    _LOADED[name] = (sig, table)
+    return table
+
+def _read_records(path: str):
+    """Columns and rows of a JSON list of objects or a CSV file with a header."""
+    if path.lower().endswith(".csv"):
+        import csv
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            columns = next(reader, [])
+            return columns, [tuple(r) for r in reader]
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    columns = list(dict.fromkeys(k for row in data for k in row))
+    return columns, [tuple(row.get(c) for c in columns) for row in data]
+
+def fixture_table(name: str, path: str) -> RefTable:
+    """Snapshot of a JSON/CSV fixture file (values as strings; missing keys are omitted from rows)."""
+    return load(name, [path], lambda: _read_records(path))
+
+def status() -> Dict[str, dict]:
+    """Snapshots on disk with their row counts, sizes and freshness (for CLI)."""
+    root = os.path.join(CFG.cache_dir, "refdata")
+    out: Dict[str, dict] = {}
+    if not os.path.isdir(root):
+        return out
+    for fn in sorted(os.listdir(root)):
+        if not fn.endswith(".snap"):
+            continue
+        name = fn[:-5]
+        path = os.path.join(root, fn)
+        t = attach(path, name)
+        if t is None:
+            out[name] = {"valid": False}
+            continue
+        sources = [s[0] for s in t.header.get("sources", [])]
+        out[name] = {
+            "rows": t.rows,
+            "bytes": os.path.getsize(path),
+            "fresh": _fresh(t.header, sources),
+            "sources": sources,
+        }
+    return out
+
+def clear() -> int:
+    """Delete compiled snapshots (they are rebuilt on next use)."""
+    root = os.path.join(CFG.cache_dir, "refdata")
+    n = 0
+    if os.path.isdir(root):
+        for fn in os.listdir(root):
+            if fn.endswith(".snap"):
+                os.remove(os.path.join(root, fn))
+                n += 1
+    _LOADED.clear()
+    return n
@@ -0,0 +1,131 @@
+from __future__ import annotations
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+from sqlmodel import select, func
+from .config import CFG
+from .db import get_read_session, stream
+from .models import Filing
+
+HISTORY_DAYS = 180
+REFRESH_SECONDS = 3600
+BURST_WINDOW = timedelta(minutes=30)
+MIN_HISTORY = 20  # filings needed before trusting the learned profile
+FRESHNESS_TARGET = 300  # seconds from a filing appearing to its signal
+MAX_INTERVAL = 240  # off-peak poll ceiling: leaves room under FRESHNESS_TARGET for jitter and processing
+
+def _default_profile() -> List[List[float]]:
+    """Prior arrival rates (filings/hour) by weekday × hour: business hours on weekdays."""
+    return [[1.0 if wd < 5 and 8 <= h < 19 else 0.05 for h in range(24)] for wd in range(7)]
+
+class SourceSchedule:
+    """Learned arrival profile and poll state for one source."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.profile = _default_profile()
+        self.peak = 1.0
+        self.failures = 0
+        self.last_change: Optional[datetime] = None
+        self.refreshed = 0.0
+
+    def learn(self, days: Counter, hours: Counter) -> None:
+        """Fit weekday × hour rates from filed-date counts and discovery-hour counts."""
+        if sum(days.values()) < MIN_HISTORY:
+            return
+        weeks = HISTORY_DAYS / 7.0
+        hour_total = sum(hours.values())
+        prior = _default_profile()[0]
+        shares = [
+            (hours[h] + 1) / (hour_total + 24) if hour_total >= MIN_HISTORY else prior[h] / sum(prior)
+            for h in range(24)
+        ]
+        self.profile = [[days[wd] / weeks * shares[h] for h in range(24)] for wd in range(7)]
+        self.peak = max(max(row) for row in self.profile) or 1.0
+
+    def rate(self, at: datetime) -> float:
+        """Expected filings/hour at local time ``at``."""
+        return self.profile[at.weekday()][at.hour]
+
+class Scheduler:
+    """Adaptive per-source poll intervals.
+
+    Sources are polled every ``base`` seconds when filings are most likely
+    (peak weekday/hour of the learned profile, or within 30 minutes of the last
+    change), proportionally less often otherwise up to ``ceiling`` seconds, and
+    with exponential backoff after failed or throttled polls. The default
+    ceiling keeps even off-peak polls within the freshness target.
+    """
+
+    def __init__(self, base: int = 75, ceiling: int = MAX_INTERVAL, max_backoff: int = 1800):
+        self.base = base
+        self.ceiling = max(ceiling, base)
+        self.max_backoff = max_backoff
+        self.tz = ZoneInfo(CFG.tz)
+        self.sources: Dict[str, SourceSchedule] = {}
+
+    def _get(self, source: str) -> SourceSchedule:
+        sch = self.sources.get(source)
+        if sch is None:
+            sch = self.sources[source] = SourceSchedule(source)
+        if time.monotonic() - sch.refreshed > REFRESH_SECONDS or not sch.refreshed:
+            self._refresh(sch)
+        return sch
+
+    def _refresh(self, sch: SourceSchedule) -> None:
+        since = date.today() - timedelta(days=HISTORY_DAYS)
+        days: Counter = Counter()
+        hours: Counter = Counter()
+        try:
+            with get_read_session() as s:
+                q = (
+                    select(Filing.filed_date, func.count())
+                    .where(Filing.source == sch.source, Filing.filed_date >= since)
+                    .group_by(Filing.filed_date)
+                )
+                for d, n in s.exec(q):
+                    days[d.weekday()] += n
+                q = select(Filing.discovered_at).where(
+                    Filing.source == sch.source, Filing.discovered_at.is_not(None), Filing.filed_date >= since
+                )
+                for at in stream(s, q):
+                    hours[self._local(at).hour] += 1
+        except Exception:
+            pass  # no history yet: keep the prior
+        sch.learn(days, hours)
+        sch.refreshed = time.monotonic()
+
+    def _local(self, at: datetime) -> datetime:
+        return at.replace(tzinfo=timezone.utc).astimezone(self.tz)
+
+    def record(self, source: str, ok: bool, changed: bool = False) -> None:
+        """Feed back the outcome of a poll."""
+        sch = self._get(source)
+        sch.failures = 0 if ok else sch.failures + 1
+        if changed:
+            sch.last_change = datetime.utcnow()
+
+    def next_delay(self, source: str, now: Optional[datetime] = None) -> float:
+        """Seconds to wait before polling ``source`` again."""
+        sch = self._get(source)
+        if sch.failures:
+            return float(min(self.max_backoff, self.base * 2 ** sch.failures))
+        now = now or datetime.utcnow()
+        if sch.last_change and now - sch.last_change < BURST_WINDOW:
+            return float(self.base)
+        rel = sch.rate(self._local(now)) / sch.peak
+        return float(min(self.ceiling, self.base / max(rel, 1e-6)))
+
+    def describe(self) -> dict:
+        """Current rate and next delay per known source (for CLI status)."""
+        now = datetime.utcnow()
+        return {
+            src: {
+                "rate_per_hour": round(sch.rate(self._local(now)), 3),
+                "failures": sch.failures,
+                "next_delay_s": round(self.next_delay(src, now), 1),
+            }
+            for src, sch in self.sources.items()
+        }
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Column, Date, MetaData, String, Table, tuple_
+from sqlmodel import Session, select, delete, func, literal, and_
+from ..db import get_session, upsert, batched
+from ..models import Filing, MemberDayRollup, Signal, TickerDayRollup, Trade
+
+NONE_KEY = ""  # rollup key for trades without a member / ticker
+_AMOUNT = re.compile(r"\$?\s*([\d,.]+)\s*([km]?)", re.I)
+
+def band_midpoint(band: Optional[str]) -> float:
+    """Dollar midpoint of a disclosure amount band such as ``$15k-$50k`` (0 if unparseable)."""
+    if not band:
+        return 0.0
+    vals = []
+    for num, unit in _AMOUNT.findall(band):
+        try:
+            v = float(num.replace(",", ""))
+        except ValueError:
+            continue
+        vals.append(v * {"k": 1e3, "m": 1e6}.get(unit.lower(), 1.0))
+    return sum(vals) / len(vals) if vals else 0.0
+
+def _fold(rows, out: Optional[Dict[Tuple[date, str], dict]] = None) -> Dict[Tuple[date, str], dict]:
+    """Fold ``(day, key, band, n, max, sum, scored)`` groups into one rollup row per ``(day, key)``."""
+    out = {} if out is None else out
+    for day, key, band, n, smax, ssum, scored in rows:
+        r = out.setdefault((day, key), {"trades": 0, "volume": 0.0, "score_max": None, "score_sum": 0.0, "scored": 0})
+        r["trades"] += n
+        r["volume"] += n * band_midpoint(band)
+        if smax is not None:
+            r["score_max"] = smax if r["score_max"] is None else max(r["score_max"], smax)
+        r["score_sum"] += ssum or 0.0
+        r["scored"] += scored or 0
+    return out
+
+# Session-local probe rows ``(ref, day, key)`` for an index nested-loop join on
+# ``Trade (ref, txn_date)``; never part of the schema (see ``_probe``).
+_PROBE = Table(
+    "rollup_probe", MetaData(),
+    Column("ref", String), Column("day", Date), Column("key", String),
+    prefixes=["TEMPORARY"],
+)
+
+def _groups(key):
+    """``(day, key, band, n, max, sum, scored)`` over Trade ⋈ Filing ⟕ Signal; callers add filters and grouping."""
+    return (
+        select(
+            Trade.txn_date, key, Trade.amount_band,
+            func.count(), func.max(Signal.score), func.sum(Signal.score), func.count(Signal.score),
+        )
+        .select_from(Trade)
+        .join(Filing, Filing.filing_id == Trade.filing_id)
+        .outerjoin(Signal, Signal.signal_id == literal("S-") + Trade.trade_id)
+    )
+
+def _probe(s: Session, ref_col, probes: List[Tuple[str, date, str]], found: Dict[Tuple[date, str], dict]) -> None:
+    """Fold the trades matching ``(ref, day)`` probes (``ref`` compared with ``ref_col``) into ``found`` under each probe's key.
+
+    The probes go to a temp table with one ``executemany`` and are joined on
+    an index of ``Trade``, so each probe is one index seek and the statement
+    compiles once however many probes there are.
+    """
+    if not probes:
+        return
+    conn = s.connection()
+    _PROBE.create(conn, checkfirst=True)
+    conn.execute(_PROBE.delete())
+    conn.execute(_PROBE.insert(), [{"ref": r, "day": d, "key": k} for r, d, k in probes])
+    _fold(s.exec(_probe_query(ref_col)), found)
+
+def _probe_query(ref_col):
+    # Selected and grouped on the probe's columns so the planner drives the
+    # join from the probe table (SQLite would otherwise scan Trade by date).
+    return (
+        select(
+            _PROBE.c.day, _PROBE.c.key, Trade.amount_band,
+            func.count(), func.max(Signal.score), func.sum(Signal.score), func.count(Signal.score),
+        )
+        .select_from(_PROBE)
+        .join(Trade, and_(ref_col == _PROBE.c.ref, Trade.txn_date == _PROBE.c.day))
+        .outerjoin(Signal, Signal.signal_id == literal("S-") + Trade.trade_id)
+        .group_by(_PROBE.c.day, _PROBE.c.key, Trade.amount_band)
+    )
+
+def _member_groups(s: Session, pairs: Sequence[Tuple[date, str]]) -> Dict[Tuple[date, str], dict]:
+    """Member rollups for ``(day, member_id)`` pairs, via each member's filings and ``ix_trade_filing_txn``."""
+    days: Dict[str, List[date]] = {}
+    for d, k in pairs:
+        days.setdefault(k, []).append(d)
+    q = select(Filing.filing_id, func.coalesce(Filing.filer_member_id, NONE_KEY))
+    scopes = [q.where(Filing.filer_member_id.in_(chunk)) for chunk in batched(sorted(k for k in days if k != NONE_KEY))]
+    if NONE_KEY in days:
+        scopes.append(q.where(Filing.filer_member_id.is_(None)))
+    probes = [(fid, d, k) for scope in scopes for fid, k in s.exec(scope) for d in days[k]]
+    found: Dict[Tuple[date, str], dict] = {}
+    _probe(s, Trade.filing_id, probes, found)
+    return found
+
+def _ticker_groups(s: Session, pairs: Sequence[Tuple[date, str]]) -> Dict[Tuple[date, str], dict]:
+    """Ticker rollups for ``(day, ticker)`` pairs, via ``ix_trade_ticker_txn``."""
+    found: Dict[Tuple[date, str], dict] = {}
+    _probe(s, Trade.ticker, [(k, d, k) for d, k in pairs if k != NONE_KEY], found)
+    unmapped = sorted({d for d, k in pairs if k == NONE_KEY})
+    if unmapped:
+        q = (
+            _groups(literal(NONE_KEY))
+            .where(Trade.ticker.is_(None), Trade.txn_date.in_(unmapped))
+            .group_by(Trade.txn_date, Trade.amount_band)
+        )
+        _fold(s.exec(q), found)
+    return found
+
+_PAIRS = {MemberDayRollup: ("member_id", _member_groups), TickerDayRollup: ("ticker", _ticker_groups)}
+
+def _store(s: Session, model, key_col: str, folded: Dict[Tuple[date, str], dict]) -> int:
+    rows = [{"day": d, key_col: k, **r} for (d, k), r in folded.items()]
+    for chunk in batched(rows):
+        upsert(s, model, chunk, ["day", key_col])
+    return len(rows)
+
+def _recompute_days(s: Session, model, key_expr, key_col: str, days: Sequence[date]) -> int:
+    """Rebuild every ``model`` row for ``days`` (used by ``rebuild``, which clears the table first)."""
+    key = func.coalesce(key_expr, NONE_KEY)
+    q = _groups(key).where(Trade.txn_date.in_(days)).group_by(Trade.txn_date, key, Trade.amount_band)
+    return _store(s, model, key_col, _fold(s.exec(q)))
+
+def _refresh(s: Session, model, groups: Iterable[Tuple[date, Optional[str]]]) -> int:
+    """Recompute ``model`` rows for exactly the touched ``(day, key)`` pairs; pairs left with no trades are deleted.
+
+    Work is proportional to the trades in those groups, not to everything
+    traded on the same days, so refreshing after each scoring chunk stays
+    linear in the number of trades.
+    """
+    key_col, compute = _PAIRS[model]
+    col = getattr(model, key_col)
+    s.flush()  # pending trades must be visible to the Core probe queries
+    n = 0
+    for chunk in batched(sorted({(d, k or NONE_KEY) for d, k in groups})):
+        found = compute(s, chunk)
+        gone = [pk for pk in chunk if pk not in found]
+        if gone:
+            s.exec(delete(model).where(tuple_(model.day, col).in_(gone)))
+        n += _store(s, model, key_col, found)
+    return n
+
+def refresh_rollups(s: Session, trades: Iterable[Tuple[date, Optional[str], Optional[str]]]) -> int:
+    """Recompute rollups touched by ``(txn_date, member_id, ticker)`` triples (caller commits).
+
+    Groups are recomputed from the base tables rather than adjusted by deltas,
+    so re-scoring a trade never double counts. Callers that delete trades
+    (re-parsing a filing) must pass the removed trades' groups as well, or those
+    groups keep counting them.
+    """
+    trades = list(trades)
+    return (
+        _refresh(s, MemberDayRollup, ((d, m) for d, m, _ in trades))
+        + _refresh(s, TickerDayRollup, ((d, t) for d, _, t in trades))
+    )
+
+def refresh_member_rollups(s: Session, groups: Iterable[Tuple[date, Optional[str]]]) -> int:
+    """Recompute member rollups for ``(txn_date, member_id)`` pairs after filings are re-linked (caller commits)."""
+    return _refresh(s, MemberDayRollup, groups)
+
+def refresh_ticker_rollups(s: Session, groups: Iterable[Tuple[date, Optional[str]]]) -> int:
+    """Recompute ticker rollups for ``(txn_date, ticker)`` pairs after trades are re-mapped (caller commits)."""
+    return _refresh(s, TickerDayRollup, groups)
+
+def rebuild(s: Session, days_per_batch: int = 31) -> int:
+    """Recompute every rollup row from scratch (caller commits)."""
+    s.exec(delete(MemberDayRollup))
+    s.exec(delete(TickerDayRollup))
+    n = 0
+    all_days: List[date] = list(s.exec(select(Trade.txn_date).distinct().order_by(Trade.txn_date)))
+    for chunk in batched(all_days, days_per_batch):
+        n += _recompute_days(s, MemberDayRollup, Filing.filer_member_id, "member_id", chunk)
+        n += _recompute_days(s, TickerDayRollup, Trade.ticker, "ticker", chunk)
+    return n
+
+def rebuild_rollups() -> int:
+    """Rebuild all rollups (e.g. after a bulk fix-up of trades or members)."""
+    with get_session() as s:
+        n = rebuild(s)
+        s.commit()
+    return n
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import List, Tuple
-from datetime import date, datetime
-from sqlmodel import select
-from ..db import get_session
+from typing import Iterable, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from sqlmodel import select, update, or_, and_, not_, literal, func, case
+from ..db import get_session, upsert, iter_chunks, batched
 from ..models import Trade, Filing, Member, Signal, MemberSnapshot
+from .rollups import refresh_rollups
 
 def compute_trade_signal(trade: Trade, member: Member | None) -> Tuple[float, str, List[str]]:
     """Compute a score for a single trade."""
@@ -48,77 +49,143 @@ def compute_trade_signal(trade: Trade, member: Member | None) -> Tuple[float, st
     # Return as 0–5 scale (to match later aggregation)
     return score * 5.0, "; ".join(reason), tags
 
-def score_all_new_trades() -> int:
-    """Score all trades and store Signal rows."""
+def _tagged(tag: str):
+    return (literal(",") + Signal.tags + ",").like(f"%,{tag},%")
+
+def _stale_filter(today: date):
+    """Trades with no signal, or whose stored tags no longer match their inputs."""
+    d30, d90 = today - timedelta(days=30), today - timedelta(days=90)
+    influence = Member.party.in_(("D", "R"))
+    return or_(
+        Signal.signal_id.is_(None),
+        and_(Trade.txn_date >= d30, not_(_tagged("recent"))),
+        and_(Trade.txn_date < d30, Trade.txn_date >= d90, not_(_tagged("recent90"))),
+        and_(Trade.txn_date < d90, or_(_tagged("recent"), _tagged("recent90"))),
+        and_(influence, not_(_tagged("influence"))),
+        and_(or_(Member.party.is_(None), not_(influence)), _tagged("influence")),
+    )
+
+def score_batch(rows: Iterable[Tuple[Trade, Member | None]]) -> List[dict]:
+    """Score a batch of (trade, member) pairs into Signal row dicts."""
+    now = datetime.utcnow()
+    out: List[dict] = []
+    for t, m in rows:
+        sc, reason, tags = compute_trade_signal(t, m)
+        out.append({
+            "signal_id": f"S-{t.trade_id}",
+            "trade_id": t.trade_id,
+            "score": sc,
+            "tags": ",".join(tags),
+            "reason": reason,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return out
+
+def score_all_new_trades(force: bool = False, filing_ids: Optional[Sequence[str]] = None) -> int:
+    """Score new trades (and those whose scoring inputs changed) into Signal rows.
+
+    Trades are read with one Trade ⋈ Filing ⋈ Member ⋈ Signal query per chunk
+    (keyset-paginated on trade_id) and each chunk's signals are written with a
+    single bulk upsert, after which the day rollups those trades touch are
+    recomputed. Re-scoring refreshes ``Signal.updated_at`` but keeps
+    ``created_at`` (when the trade was first scored); ``Filing.first_signal_at``
+    is set once, for freshness-lag reporting. ``force=True``
+    re-scores every trade; ``filing_ids`` limits the run to trades from
+    those filings.
+    """
     n = 0
+    today = date.today()
     with get_session() as s:
-        trades = s.exec(select(Trade)).all()
-        for t in trades:
-            sig = Signal(signal_id=f"S-{t.trade_id}", trade_id=t.trade_id, score=0.0)
-            m = None
-            if t.filing_id:
-                f = s.get(Filing, t.filing_id)
-                if f and f.filer_member_id:
-                    m = s.get(Member, f.filer_member_id)
-
-            sc, reason, tags = compute_trade_signal(t, m)
-            sig.score = sc
-            sig.reason = reason
-            sig.tags = ",".join(tags)
-
-            old = s.get(Signal, sig.signal_id)
-            if old:
-                s.delete(old)
+        q = (
+            select(Trade, Member)
+            .outerjoin(Filing, Filing.filing_id == Trade.filing_id)
+            .outerjoin(Member, Member.member_id == Filing.filer_member_id)
+            .outerjoin(Signal, Signal.signal_id == literal("S-") + Trade.trade_id)
+        )
+        if not force:
+            q = q.where(_stale_filter(today))
+        scopes = [q] if filing_ids is None else [
+            q.where(Trade.filing_id.in_(chunk)) for chunk in batched(list(filing_ids))
+        ]
+        for scoped in scopes:
+            for rows in iter_chunks(s, scoped, Trade.trade_id):
+                signals = score_batch(rows)
+                n += upsert(s, Signal, signals, ["signal_id"], insert_only=["created_at"])
+                s.exec(
+                    update(Filing)
+                    .where(Filing.filing_id.in_({t.filing_id for t, _ in rows}), Filing.first_signal_at.is_(None))
+                    .values(first_signal_at=signals[0]["created_at"])
+                )
+                refresh_rollups(s, ((t.txn_date, m.member_id if m else None, t.ticker) for t, m in rows))
                 s.commit()
-            s.add(sig)
-            n += 1
-        s.commit()
     return n
 
-def compute_follow_scores() -> int:
-    """Compute 'Follow Likelihood %' for each member and save snapshots."""
+def _dirty_members(s, force: bool):
+    """Member ids whose follow score is stale: never computed, or with signals written since.
+
+    Runs commit atomically, so the newest ``follow_score_updated_at`` is a
+    watermark every scored member has reached; only signals above it (a range
+    on ``ix_signal_updated_at``) are joined back to their members.
+    """
+    if force:
+        return select(Member.member_id)
+    never = select(Member.member_id).where(Member.follow_score_updated_at.is_(None))
+    since = s.scalar(select(func.max(Member.follow_score_updated_at)))
+    if since is None:
+        return never
+    touched = (
+        select(Filing.filer_member_id)
+        .select_from(Signal)
+        .join(Trade, Trade.trade_id == Signal.trade_id)
+        .join(Filing, Filing.filing_id == Trade.filing_id)
+        .join(Member, Member.member_id == Filing.filer_member_id)
+        .where(Signal.updated_at > since)
+    )
+    return touched.union(never)
+
+def compute_follow_scores(force: bool = False) -> int:
+    """Compute 'Follow Likelihood %' for members with new or re-scored trades and save snapshots.
+
+    Per-member average signal score and 90-day trade count come from one
+    GROUP BY query per chunk of members, and the run commits once (see
+    ``_dirty_members``); ``force=True`` recomputes every member.
+    """
+    now = datetime.utcnow()
+    today = date.today()
+    cnt = 0
     with get_session() as s:
-        members = s.exec(select(Member)).all()
-        cnt = 0
-        for m in members:
-            q = s.exec(
-                select(Trade).join(Filing, Filing.filing_id == Trade.filing_id)
-                .where(Filing.filer_member_id == m.member_id)
-            )
-            trades = q.all()
-            if not trades:
-                m.follow_score = 0.0
-                m.follow_score_updated_at = datetime.utcnow()
-                cnt += 1
-                continue
-
-            total, n = 0.0, 0
-            for t in trades:
-                sig = s.get(Signal, f"S-{t.trade_id}")
-                if sig:
-                    total += sig.score
-                    n += 1
-
-            base = (total / max(1, n)) / 5.0  # normalize 0–1
-            recent = sum(1 for t in trades if (date.today() - t.txn_date).days <= 90)
-            rec_boost = min(0.2, 0.05 * (recent // 3))
-
-            m.follow_score = round(min(1.0, base + rec_boost) * 100.0, 1)
-            m.follow_score_updated_at = datetime.utcnow()
-
-            # Snapshot (idempotent per day)
-            from datetime import date as _date
-            snap = MemberSnapshot(
-                member_id=m.member_id,
-                as_of_date=_date.today(),
-                follow_score=m.follow_score,
-                metrics_json=None,
+        ids = sorted(s.scalars(_dirty_members(s, force)))
+        for chunk in batched(ids):
+            agg = (
+                select(
+                    Filing.filer_member_id,
+                    func.avg(Signal.score),
+                    func.sum(case((Trade.txn_date >= today - timedelta(days=90), 1), else_=0)),
+                )
+                .select_from(Trade)
+                .join(Filing, Filing.filing_id == Trade.filing_id)
+                .outerjoin(Signal, Signal.trade_id == Trade.trade_id)
+                .where(Filing.filer_member_id.in_(chunk))
+                .group_by(Filing.filer_member_id)
             )
-            old = s.get(MemberSnapshot, (m.member_id, _date.today()))
-            if old:
-                s.delete(old)
-            s.add(snap)
-            cnt += 1
-
+            stats = {mid: (avg or 0.0, recent or 0) for mid, avg, recent in s.exec(agg)}
+
+            members, snaps = [], []
+            for mid in chunk:
+                if mid not in stats:
+                    members.append({"member_id": mid, "follow_score": 0.0, "follow_score_updated_at": now})
+                    continue
+                avg, recent = stats[mid]
+                base = avg / 5.0  # normalize 0–1
+                rec_boost = min(0.2, 0.05 * (recent // 3))
+                score = round(min(1.0, base + rec_boost) * 100.0, 1)
+                members.append({"member_id": mid, "follow_score": score, "follow_score_updated_at": now})
+                # Snapshot (idempotent per day)
+                snaps.append({"member_id": mid, "as_of_date": today, "follow_score": score, "metrics_json": None})
+
+            s.exec(update(Member), params=members)
+            upsert(s, MemberSnapshot, snaps, ["member_id", "as_of_date"])
+            cnt += len(members)
         s.commit()
     return cnt
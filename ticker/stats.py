@@ -1,11 +1,12 @@
 from __future__ import annotations
+import csv, json, re, sys
 from datetime import datetime, timedelta, date
-from typing import List
+from typing import Optional, Tuple
 from rich.table import Table
 from rich.console import Console
-from sqlmodel import select
-from .db import get_session
-from .models import Filing, Trade, Signal, Member
+from sqlmodel import select, func, literal
+from .db import get_read_session
+from .models import Filing, Trade, Signal, Member, MemberDayRollup, TickerDayRollup
 
 console = Console()
 
@@ -13,6 +14,32 @@ def _last_24h_range():
     now = datetime.now()
     return now - timedelta(days=1), now
 
+def daily_report_rows(limit: int = 10) -> list[dict]:
+    """Top trades by signal score (fixtures: trades of the last 30 days)."""
+    rows = []
+    with get_read_session() as s:
+        score = func.coalesce(Signal.score, 0.0)
+        q = (
+            select(Trade, Filing.filer_name_raw, Member.first, Member.last, score)
+            .outerjoin(Signal, Signal.signal_id == literal("S-") + Trade.trade_id)
+            .outerjoin(Filing, Filing.filing_id == Trade.filing_id)
+            .outerjoin(Member, Member.member_id == Filing.filer_member_id)
+            .where(Trade.txn_date >= date.today() - timedelta(days=30))
+            .order_by(score.desc())
+            .limit(limit)
+        )
+        for i, (tr, filer_raw, first, last, sc) in enumerate(s.exec(q), start=1):
+            rows.append({
+                "rank": i,
+                "member": f"{first} {last}" if first else (filer_raw or "?"),
+                "issuer": tr.issuer_raw,
+                "ticker": tr.ticker,
+                "txn_date": tr.txn_date,
+                "band": tr.amount_band,
+                "score": round(sc, 2),
+            })
+    return rows
+
 def table_daily_report() -> Table:
     since, now = _last_24h_range()
     t = Table(title=f"Ticker • Daily Report (last 24h) • as of {now.strftime('%Y-%m-%d %H:%M')}")
@@ -22,33 +49,180 @@ def table_daily_report() -> Table:
     t.add_column("Txn Date")
     t.add_column("Band")
     t.add_column("Score")
+    for r in daily_report_rows():
+        t.add_row(
+            str(r["rank"]),
+            r["member"],
+            f"{r['issuer']} / {r['ticker'] or '-'}",
+            r["txn_date"].isoformat(),
+            r["band"] or "-",
+            f"{r['score']:.2f}",
+        )
+    return t
+
+_LAST_N = re.compile(r"last-(\d+)d$")
+
+def resolve_period(period: str, start: Optional[date] = None, end: Optional[date] = None) -> Tuple[date, date]:
+    """Inclusive ``(start, end)`` trade dates for ``today|last-Nd|mtd|ytd|all`` or explicit bounds."""
+    today = date.today()
+    if start or end:
+        return start or date.min, end or today
+    if period == "today":
+        return today, today
+    if period == "mtd":
+        return today.replace(day=1), today
+    if period == "ytd":
+        return today.replace(month=1, day=1), today
+    if period == "all":
+        return date.min, today
+    m = _LAST_N.match(period)
+    if m:
+        return today - timedelta(days=int(m.group(1)) - 1), today
+    raise ValueError(f"unknown period {period!r}")
+
+SORTS = ("score", "avg", "volume", "trades")
+
+def leaderboard(start: date, end: date, by: str = "member", top: int = 10, sort: str = "score") -> list[dict]:
+    """Top-``top`` members or tickers over ``[start, end]`` from the day rollups.
 
-    with get_session() as s:
-        # For fixtures: show trades in last 30 days and rank by signal score
-        trades = s.exec(select(Trade)).all()
-        trades = [tr for tr in trades if (date.today() - tr.txn_date).days <= 30]
+    One indexed range scan over ``(day, key)`` rollup rows, so the cost depends
+    on the period's size rather than the trade archive's.
+    """
+    model = MemberDayRollup if by == "member" else TickerDayRollup
+    key = model.member_id if by == "member" else model.ticker
+    trades = func.sum(model.trades)
+    volume = func.sum(model.volume)
+    smax = func.max(model.score_max)
+    avg = func.sum(model.score_sum) / func.nullif(func.sum(model.scored), 0)
+    order = {"score": smax, "avg": avg, "volume": volume, "trades": trades}[sort]
+    q = (
+        select(key, trades, volume, smax, avg)
+        .where(model.day >= start, model.day <= end)
+        .group_by(key)
+        .order_by(order.desc(), volume.desc(), key)
+        .limit(top)
+    )
+    rows = []
+    with get_read_session() as s:
+        for i, (k, n, vol, mx, av) in enumerate(s.exec(q), start=1):
+            rows.append({
+                "rank": i,
+                by: k or None,
+                "trades": n,
+                "volume": round(vol or 0.0, 2),
+                "score_max": None if mx is None else round(mx, 2),
+                "score_avg": None if av is None else round(av, 2),
+            })
+        if by == "member":
+            ids = [r["member"] for r in rows if r["member"]]
+            names = {
+                mid: f"{first} {last}"
+                for mid, first, last in s.exec(select(Member.member_id, Member.first, Member.last).where(Member.member_id.in_(ids)))
+            }
+            for r in rows:
+                r["name"] = names.get(r["member"], r["member"] or "(unknown)")
+    return rows
 
-        ranked: List[tuple] = []
-        for tr in trades:
-            sig = s.get(Signal, f"S-{tr.trade_id}")
-            f = s.exec(select(Filing).where(Filing.filing_id == tr.filing_id)).first()
-            mem = s.get(Member, f.filer_member_id) if f and f.filer_member_id else None
-            ranked.append((sig.score if sig else 0.0, tr, mem))
+def table_leaderboard(rows: list[dict], by: str, start: date, end: date, sort: str) -> Table:
+    span = "all time" if start == date.min else f"{start.isoformat()} → {end.isoformat()}"
+    t = Table(title=f"Ticker • Top {by}s by {sort} • {span}")
+    cols = ["#", "Member" if by == "member" else "Ticker", "Trades", "Volume ($)", "Max score", "Avg score"]
+    for col in cols:
+        t.add_column(col, justify="left" if col in ("Member", "Ticker") else "right")
+    for r in rows:
+        t.add_row(
+            str(r["rank"]),
+            r["name"] if by == "member" else (r["ticker"] or "(unmapped)"),
+            f"{r['trades']:,}",
+            f"{r['volume']:,.0f}",
+            "-" if r["score_max"] is None else f"{r['score_max']:.2f}",
+            "-" if r["score_avg"] is None else f"{r['score_avg']:.2f}",
+        )
+    return t
+
+def emit(rows: list[dict], fmt: str, table: Optional[Table] = None) -> None:
+    """Print report rows as a rich table, JSON or CSV."""
+    if fmt == "json":
+        sys.stdout.write(json.dumps(rows, default=str, indent=2) + "\n")
+    elif fmt == "csv":
+        w = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]) if rows else ["rank"])
+        w.writeheader()
+        w.writerows(rows)
+    else:
+        console.print(table)
+
+def _ms(v) -> str:
+    return "-" if v is None else f"{v:,.1f}"
 
-        ranked.sort(key=lambda x: x[0], reverse=True)
+def _dur(secs) -> str:
+    if secs is None:
+        return "-"
+    if secs < 120:
+        return f"{secs:.1f}s"
+    if secs < 7200:
+        return f"{secs / 60:.1f}m"
+    if secs < 172800:
+        return f"{secs / 3600:.1f}h"
+    return f"{secs / 86400:.1f}d"
 
-        for i, (_, tr, mem) in enumerate(ranked[:10], start=1):
-            name = f"{mem.first} {mem.last}" if mem else (f.filer_name_raw if f else "?")
+def pipeline_report_rows(days: int = 7) -> list[dict]:
+    """Stage latency percentiles (ms) and end-to-end freshness lag (s) from ``RunMetric``/``Filing``, one row each."""
+    from .metrics import stage_latency, freshness_lag
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = [
+        {
+            "section": "stage", "name": name, "n": r["n"], "unit": "ms",
+            "p50": r["p50"], "p95": r["p95"], "p99": r["p99"], "max": r["max"],
+            "rows_out": r["rows_out"], "cache_hit_rate": r["hit_rate"], "failures": r["failures"],
+        }
+        for name, r in stage_latency(since).items()
+    ]
+    rows += [
+        {
+            "section": "freshness", "name": name, "n": r["n"], "unit": "s",
+            "p50": r["p50"], "p95": r["p95"], "p99": r["p99"], "max": r["max"],
+            "rows_out": None, "cache_hit_rate": None, "failures": None,
+        }
+        for name, r in freshness_lag(since).items()
+    ]
+    return rows
+
+def table_pipeline_report(rows: list[dict], days: int = 7) -> list[Table]:
+    """Render ``pipeline_report_rows`` as a stage table and a freshness-lag table."""
+    t = Table(title=f"Ticker • Pipeline stages (last {days}d)")
+    for col in ("Stage", "Runs", "p50 ms", "p95 ms", "p99 ms", "max ms", "Rows out", "Cache hit", "Failures"):
+        t.add_column(col, justify="left" if col == "Stage" else "right")
+    lag = Table(title="Freshness lag → first signal")
+    for col in ("From", "Filings", "p50", "p95", "p99", "max"):
+        lag.add_column(col, justify="left" if col == "From" else "right")
+    for r in rows:
+        if r["section"] == "stage":
             t.add_row(
-                str(i),
-                name,
-                f"{tr.issuer_raw} / {tr.ticker or '-'}",
-                tr.txn_date.isoformat(),
-                tr.amount_band or "-",
-                f"{(s.get(Signal, 'S-'+tr.trade_id).score if s.get(Signal, 'S-'+tr.trade_id) else 0):.2f}",
+                r["name"],
+                str(r["n"]),
+                _ms(r["p50"]),
+                _ms(r["p95"]),
+                _ms(r["p99"]),
+                _ms(r["max"]),
+                str(r["rows_out"]),
+                "-" if r["cache_hit_rate"] is None else f"{r['cache_hit_rate']:.0%}",
+                f"[red]{r['failures']}[/]" if r["failures"] else "0",
             )
-    return t
+        else:
+            label = "discovery" if r["name"] == "discovered" else "filed date"
+            lag.add_row(label, str(r["n"]), _dur(r["p50"]), _dur(r["p95"]), _dur(r["p99"]), _dur(r["max"]))
+    return [t, lag]
+
+def print_pipeline_report(days: int = 7, fmt: str = "table"):
+    rows = pipeline_report_rows(days)
+    if fmt != "table":
+        emit(rows, fmt)
+        return
+    for table in table_pipeline_report(rows, days):
+        console.print(table)
 
-def print_last_24h_report():
-    table = table_daily_report()
-    console.print(table)
+def print_last_24h_report(fmt: str = "table"):
+    if fmt == "table":
+        console.print(table_daily_report())
+    else:
+        emit(daily_report_rows(), fmt)
@@ -1,11 +1,18 @@
 from __future__ import annotations
+from typing import Optional
+from textual import work
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, Input, Static, DataTable, Button, Label
 from textual.containers import Horizontal, Vertical
 from textual.reactive import reactive
-from sqlmodel import select
-from ..db import get_session
-from ..models import Member, Filing, Trade, Signal
+from textual.worker import get_current_worker
+from .portfolio import Portfolio, PortfolioCache
+from .search import MemberIndex
+
+SEARCH_DEBOUNCE = 0.08  # seconds of typing quiet before the table is filtered
+MAX_ROWS = 200
+INCREMENTAL_ROWS = 32  # above this many removals, refill the table instead
+PAGE_AHEAD = 20  # fetch the next portfolio page when the cursor is this close to the end
 
 class SearchBar(Static):
     def compose(self) -> ComposeResult:
@@ -13,58 +20,132 @@ class SearchBar(Static):
         yield Input(placeholder="e.g., Pelosi, Schumer, etc.", id="search_input")
 
 class TraderList(Static):
-    def __init__(self):
+    """Member table kept in step with the search index.
+
+    Small result changes are applied as row removals/additions; DataTable row
+    removal is linear in the table size, so larger changes refill the rows
+    (columns are kept). At most ``MAX_ROWS`` matches are shown.
+    """
+
+    def __init__(self, index: MemberIndex):
         super().__init__()
-        self.table = DataTable(zebra_stripes=True)
+        self.index = index
+        self.table = DataTable(zebra_stripes=True, cursor_type="row")
+        self.shown: set[str] = set()
 
     def compose(self) -> ComposeResult:
         yield self.table
 
     def populate(self, query: str = ""):
-        self.table.clear(columns=True)
-        self.table.add_columns("Member ID", "Name", "Chamber", "State", "Follow %")
-        with get_session() as s:
-            members = s.exec(select(Member)).all()
-            for m in members:
-                name = f"{m.first} {m.last}"
-                if query and query.lower() not in name.lower():
-                    continue
-                self.table.add_row(m.member_id, name, m.chamber, m.state, f"{m.follow_score:.1f}")
+        if not self.table.columns:
+            for label, key in (("Member ID", "id"), ("Name", "name"), ("Chamber", "chamber"), ("State", "state"), ("Follow %", "follow")):
+                self.table.add_column(label, key=key)
+        matches = self.index.search(query)
+        rows = matches[:MAX_ROWS]
+        keep = {r.member_id for r in rows}
+        removed = self.shown - keep
+        added = [r for r in rows if r.member_id not in self.shown]
+        if len(removed) > INCREMENTAL_ROWS:
+            self.table.clear()
+            added = rows
+        else:
+            for mid in removed:
+                self.table.remove_row(mid)
+        for r in added:
+            self.table.add_row(r.member_id, r.name, r.chamber, r.state, f"{r.follow:.1f}", key=r.member_id)
+        if added and len(added) < len(rows):
+            self.table.sort("name", key=str.casefold)
+        self.shown = keep
+        self.border_title = f"{len(matches)} members" + (f" (first {MAX_ROWS})" if len(matches) > MAX_ROWS else "")
 
 class PortfolioView(Static):
+    """Portfolio of the highlighted member, loaded off the UI thread.
+
+    Loads run in an exclusive worker, so moving the cursor cancels the stale
+    request. Trades arrive a page at a time; the next page is fetched when
+    the cursor nears the last loaded row, one page load at a time. The table
+    is then topped up with whatever the portfolio holds beyond its last row.
+    """
+
     title = reactive("Portfolio")
 
     def __init__(self):
         super().__init__()
-        self.table = DataTable(zebra_stripes=True)
+        self.table = DataTable(zebra_stripes=True, cursor_type="row")
         self.header = Label("Select a member to view portfolio.")
+        self.portfolios = PortfolioCache()
+        self.current: Optional[Portfolio] = None
+        self.member_id: Optional[str] = None
+        self._paging: Optional[Portfolio] = None  # portfolio with a page load in flight
 
     def compose(self) -> ComposeResult:
         yield self.header
         yield self.table
 
+    def on_mount(self):
+        self.table.add_columns("Issuer", "Ticker", "Txn Date", "Type", "Band", "Signal Score")
+
     def show_member(self, member_id: str):
-        with get_session() as s:
-            m = s.get(Member, member_id)
+        if member_id == self.member_id:
+            return
+        self.member_id = member_id
+        self.current = None
+        self.header.update(f"Loading {member_id}…")
+        self._load(member_id)
+
+    @work(thread=True, exclusive=True, group="portfolio")
+    def _load(self, member_id: str) -> None:
+        p = self.portfolios.get(member_id)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._show, p)
+
+    @work(thread=True, group="portfolio-page")
+    def _load_more(self, p: Portfolio) -> None:
+        try:
+            self.portfolios.more(p)
+        finally:
+            self.app.call_from_thread(self._paged, p)
+
+    def _paged(self, p: Portfolio):
+        if self._paging is p:
+            self._paging = None
+        self._sync(p)
+
+    def _show(self, p: Portfolio):
+        if p.member_id != self.member_id:
+            return
+        self.current = p
+        if p.member:
+            first, last, chamber, state, follow = p.member
             self.header.update(
-                f"[b]{m.first} {m.last}[/] • {m.chamber.upper()} {m.state} • "
-                f"Follow Likelihood: [b]{m.follow_score:.1f}%[/]"
+                f"[b]{first} {last}[/] • {chamber.upper()} {state} • "
+                f"Follow Likelihood: [b]{follow:.1f}%[/]"
             )
-            self.table.clear(columns=True)
-            self.table.add_columns("Issuer", "Ticker", "Txn Date", "Type", "Band", "Signal Score")
-            filings = s.exec(select(Filing).where(Filing.filer_member_id == member_id)).all()
-            for f in filings:
-                trades = s.exec(select(Trade).where(Trade.filing_id == f.filing_id)).all()
-                for t in trades:
-                    sig = s.get(Signal, f"S-{t.trade_id}")
-                    self.table.add_row(
-                        t.issuer_raw,
-                        t.ticker or "-",
-                        t.txn_date.isoformat(),
-                        t.txn_type or "-",
-                        t.amount_band or "-",
-                        f"{sig.score if sig else 0:.2f}",
-                    )
+        else:
+            self.header.update(f"[b]{p.member_id}[/] • unknown member")
+        self.table.clear()
+        self._sync(p)
+
+    def _sync(self, p: Portfolio):
+        """Add the rows of ``p`` loaded since the table was last filled (the table mirrors a prefix of ``p.rows``)."""
+        if p is not self.current:
+            return
+        for h in p.rows[self.table.row_count:]:  # unlocked: p.lock is held across page fetches
+            self.table.add_row(
+                h.issuer,
+                h.ticker or "-",
+                h.txn_date.isoformat(),
+                h.txn_type or "-",
+                h.band or "-",
+                f"{h.score or 0:.2f}",
+            )
+
+    def on_data_table_row_highlighted(self, message: DataTable.RowHighlighted):
+        p = self.current
+        if message.data_table is self.table and p is not None and not p.done and self._paging is not p:
+            if message.cursor_row >= self.table.row_count - PAGE_AHEAD:
+                self._paging = p
+                self._load_more(p)
 
 class MenuApp(App):
     CSS = """
@@ -74,13 +155,14 @@ class MenuApp(App):
     #controls { height: auto; }
     """
     BINDINGS = [("q", "quit", "Quit")]
+    _search_timer = None
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         with Vertical(id="main"):
             yield SearchBar()
             with Horizontal():
-                self.traders = TraderList()
+                self.traders = TraderList(MemberIndex.load())
                 self.portfolio = PortfolioView()
                 yield self.traders
                 yield self.portfolio
@@ -94,7 +176,10 @@ class MenuApp(App):
         self.traders.populate("")
 
     def on_input_changed(self, event: Input.Changed):
-        self.traders.populate(event.value or "")
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        query = event.value or ""
+        self._search_timer = self.set_timer(SEARCH_DEBOUNCE, lambda: self.traders.populate(query))
 
     def on_data_table_row_highlighted(self, message: DataTable.RowHighlighted):
         table = message.data_table
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional, Tuple
+from sqlmodel import Session, select, func, literal, or_, and_
+from ..db import get_read_session
+from ..models import Filing, Member, Signal, Trade
+
+PAGE = 200
+CACHE_SIZE = 32
+
+class Holding(NamedTuple):
+    trade_id: str
+    issuer: str
+    ticker: Optional[str]
+    txn_date: date
+    txn_type: Optional[str]
+    band: Optional[str]
+    score: Optional[float]
+
+class Portfolio:
+    """A member's header plus the trades loaded so far (newest first, one page at a time)."""
+
+    def __init__(self, member_id: str, member: Optional[tuple]):
+        self.member_id = member_id
+        self.member = member  # (first, last, chamber, state, follow_score) or None if unknown
+        self.rows: List[Holding] = []
+        self.done = False
+        self.lock = threading.Lock()
+
+    def _after(self) -> Optional[Tuple[date, str]]:
+        return (self.rows[-1].txn_date, self.rows[-1].trade_id) if self.rows else None
+
+def signal_generation(s: Session) -> Optional[datetime]:
+    """Newest signal write (indexed); changes whenever scoring inserts or re-scores trades."""
+    return s.exec(select(func.max(Signal.updated_at))).one()
+
+def fetch_page(s: Session, member_id: str, after: Optional[Tuple[date, str]] = None, limit: int = PAGE) -> List[Holding]:
+    """One page of a member's trades with their signal scores, keyset-paged on (txn_date, trade_id) desc."""
+    q = (
+        select(Trade.trade_id, Trade.issuer_raw, Trade.ticker, Trade.txn_date, Trade.txn_type, Trade.amount_band, Signal.score)
+        .join(Filing, Filing.filing_id == Trade.filing_id)
+        .outerjoin(Signal, Signal.signal_id == literal("S-") + Trade.trade_id)
+        .where(Filing.filer_member_id == member_id)
+        .order_by(Trade.txn_date.desc(), Trade.trade_id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        d, tid = after
+        q = q.where(or_(Trade.txn_date < d, and_(Trade.txn_date == d, Trade.trade_id < tid)))
+    return [Holding(*r) for r in s.exec(q)]
+
+class PortfolioCache:
+    """LRU of recently viewed portfolios, dropped wholesale when new signals are written.
+
+    Safe to use from worker threads. Each ``get`` checks the signal generation
+    (one indexed MAX query), so portfolios refresh after the watcher scores
+    new filings, even when the watcher runs in another process.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._items: "OrderedDict[str, Portfolio]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: Optional[datetime] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, member_id: str) -> Portfolio:
+        """The member's portfolio with at least its first page loaded."""
+        with get_read_session() as s:
+            gen = signal_generation(s)
+            with self._lock:
+                if gen != self._generation:
+                    self._items.clear()
+                    self._generation = gen
+                p = self._items.get(member_id)
+                if p is not None:
+                    self._items.move_to_end(member_id)
+                    self.hits += 1
+                    return p
+                self.misses += 1
+            m = s.exec(
+                select(Member.first, Member.last, Member.chamber, Member.state, Member.follow_score)
+                .where(Member.member_id == member_id)
+            ).first()
+            p = Portfolio(member_id, tuple(m) if m else None)
+            self._extend(s, p)
+        with self._lock:
+            self._items[member_id] = p
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return p
+
+    def more(self, p: Portfolio) -> List[Holding]:
+        """Load the next page of ``p`` (empty once all trades are loaded)."""
+        if p.done:
+            return []
+        with get_read_session() as s:
+            return self._extend(s, p)
+
+    @staticmethod
+    def _extend(s: Session, p: Portfolio) -> List[Holding]:
+        with p.lock:
+            page = fetch_page(s, p.member_id, p._after())
+            p.rows.extend(page)
+            p.done = len(page) < PAGE
+        return page
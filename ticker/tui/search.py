@@ -0,0 +1,98 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+from rapidfuzz import process, fuzz
+from sqlmodel import select
+from ..db import get_read_session, stream
+from ..models import Member
+
+FUZZY_CUTOFF = 70
+FUZZY_LIMIT = 25
+PREFIX_LEN = 2  # terms shorter than a trigram match word prefixes
+
+class MemberRow(NamedTuple):
+    member_id: str
+    name: str
+    chamber: str
+    state: str
+    party: Optional[str]
+    follow: float
+
+def _grams(s: str) -> Set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+class MemberIndex:
+    """Resident member search index for the TUI.
+
+    Every query term must match a member's name, state, chamber or party:
+    terms of three or more characters as substrings (trigram postings
+    intersected, then verified), shorter ones as word prefixes. Typing more
+    characters narrows the previous result instead of searching again. When
+    nothing matches, names are ranked with rapidfuzz to tolerate typos.
+    """
+
+    def __init__(self, rows: Iterable[MemberRow]):
+        self.rows: List[MemberRow] = sorted(rows, key=lambda r: r.name.casefold())
+        self.by_id: Dict[str, MemberRow] = {r.member_id: r for r in self.rows}
+        self.text: List[str] = []
+        self.grams: Dict[str, Set[int]] = {}
+        self.prefixes: Dict[str, Set[int]] = {}
+        for i, r in enumerate(self.rows):
+            text = " ".join(filter(None, (r.name, r.state, r.chamber, r.party))).casefold()
+            self.text.append(text)
+            for g in _grams(text):
+                self.grams.setdefault(g, set()).add(i)
+            for word in text.split():
+                for n in range(1, PREFIX_LEN + 1):
+                    self.prefixes.setdefault(word[:n], set()).add(i)
+        self._names = [r.name.casefold() for r in self.rows]
+        self._last: tuple = ("", [], False)
+
+    @classmethod
+    def load(cls) -> "MemberIndex":
+        q = select(Member.member_id, Member.first, Member.last, Member.chamber, Member.state, Member.party, Member.follow_score)
+        with get_read_session() as s:
+            return cls(
+                MemberRow(mid, f"{first} {last}", chamber, state, party, follow or 0.0)
+                for mid, first, last, chamber, state, party, follow in stream(s, q)
+            )
+
+    def _term(self, term: str, within: Optional[List[int]]) -> List[int]:
+        if len(term) <= PREFIX_LEN:
+            hits = self.prefixes.get(term, set())
+            check = None
+        else:
+            grams = sorted((self.grams.get(g, set()) for g in _grams(term)), key=len)
+            hits = set.intersection(*grams)
+            check = term
+        pool = sorted(hits) if within is None else [i for i in within if i in hits]
+        return pool if check is None else [i for i in pool if check in self.text[i]]
+
+    def _fuzzy(self, query: str) -> List[int]:
+        found = process.extract(query, self._names, scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF, limit=FUZZY_LIMIT)
+        return [i for _, _, i in found]
+
+    def _narrows(self, query: str) -> Optional[List[int]]:
+        """The previous result if ``query`` can only match a subset of it (the usual keystroke)."""
+        last_q, last_ids, fuzzy = self._last
+        if not last_q or fuzzy or not query.startswith(last_q):
+            return None
+        old, new = last_q.split(), query.split()
+        # A short (word prefix) term that grew into a substring term may match elsewhere.
+        if len(old[-1]) <= PREFIX_LEN < len(new[len(old) - 1]):
+            return None
+        return last_ids
+
+    def search(self, query: str) -> List[MemberRow]:
+        """Members matching every term of ``query`` (all members when empty), in name order."""
+        query = " ".join(query.casefold().split())
+        fuzzy = False
+        if not query:
+            ids = list(range(len(self.rows)))
+        else:
+            ids = self._narrows(query)
+            for term in query.split():
+                ids = self._term(term, ids)
+            if not ids:
+                ids, fuzzy = self._fuzzy(query), True
+        self._last = (query, ids, fuzzy)
+        return [self.rows[i] for i in ids]
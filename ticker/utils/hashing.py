@@ -0,0 +1,26 @@
+from __future__ import annotations
+import hashlib, os
+from typing import Optional, Tuple
+
+_CHUNK = 1 << 20
+
+def sha256_file(path: str) -> Optional[str]:
+    """Return the hex SHA-256 of a file's contents, or None if it cannot be read."""
+    if not path or not os.path.isfile(path):
+        return None
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+def file_stat(path: str) -> Optional[Tuple[int, int]]:
+    """``(size, mtime_ns)`` of a file, or None if it cannot be stat'ed; unchanged means no need to re-hash."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return st.st_size, st.st_mtime_ns
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import sys
+from contextlib import contextmanager
 from rich.console import Console
 from datetime import datetime
 
@@ -15,3 +17,13 @@ def error(msg: str):
 
 def banner(title: str):
     console.rule(f"[bold magenta]{title}[/] • {datetime.now().isoformat(timespec='seconds')}")
+
+@contextmanager
+def logs_to_stderr():
+    """Send log output to stderr for the duration (while stdout carries data)."""
+    old = console.file
+    console.file = sys.stderr
+    try:
+        yield
+    finally:
+        console.file = old
@@ -1,39 +1,238 @@
 from __future__ import annotations
-import asyncio, random, time
-from datetime import datetime
-from .utils.logging import error, banner
-from .hotpath import run_hotpath_once
+import asyncio, hashlib, random, time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+from sqlmodel import select
+from . import metrics
+from .config import CFG
+from .db import get_session, get_read_session, batched
+from .models import Filing, SourceState
+from .utils.logging import error, banner, info, warn
+from .schedule import MAX_INTERVAL, Scheduler
+from .fetch import house as fetch_house
+from .fetch import senate as fetch_senate
+
+FETCHERS = {"house": fetch_house, "senate": fetch_senate}
+LOOKBACK_DAYS = 60
 
 class WatchState:
     last_poll: datetime | None = None
     last_change: datetime | None = None
 
 STATE = WatchState()
+SCHEDULER = Scheduler()
+_PENDING: Dict[str, str] = {}  # source -> fingerprint awaiting a successful hotpath run
+_RETRIES: Dict[str, Dict[str, Tuple[int, datetime]]] = {}  # source -> filing id -> (retries so far, next due)
+MAX_RETRIES = 5
+RETRY_BACKOFF = 60  # seconds before the second retry; doubles after each one
+RETRY_BACKOFF_MAX = 3600
+
+def parse_sources(sources: str) -> List[str]:
+    out = [x.strip() for x in sources.split(",") if x.strip()]
+    bad = [x for x in out if x not in FETCHERS]
+    if bad:
+        raise ValueError(f"unknown source(s): {', '.join(bad)}")
+    return out
+
+async def run_watch(
+    interval: int = 75,
+    jitter: int = 20,
+    sources: str = "house,senate",
+    adaptive: bool = True,
+    max_interval: int = MAX_INTERVAL,
+):
+    """Continuously poll for changes and run the pipeline on new filings.
 
-async def run_watch(interval: int = 75, jitter: int = 20, sources: str = "house,senate"):
-    """Continuously poll for changes and run the hotpath."""
+    Each source is polled by its own task on its own schedule; new filings are
+    handed to a single processing task, so a slow parse never delays a poll.
+    Blocking DB/PDF work runs in threads and the pipeline's process pool.
+    With ``adaptive`` the poll interval follows the learned arrival profile
+    (``interval`` at peak, up to ``max_interval`` when filings are unlikely)
+    and backs off exponentially after failed/throttled polls.
+    """
+    global SCHEDULER
     banner("Ticker Watcher Started")
+    SCHEDULER = Scheduler(base=interval, ceiling=max_interval if adaptive else interval)
+    queue: asyncio.Queue = asyncio.Queue()
+    inflight: set = set()
+    tasks = [asyncio.create_task(_poll_loop(src, jitter, queue, inflight)) for src in parse_sources(sources)]
+    tasks.append(asyncio.create_task(_process_loop(queue, inflight)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+async def _poll_loop(source: str, jitter: int, queue: asyncio.Queue, inflight: set) -> None:
     while True:
         start = time.monotonic()
+        ok, changed = False, False
         try:
-            changed = await discover_changes()
-            if changed:
+            changes = await discover_changes(source)
+            rows = [r for r in changes.get(source, []) if r["filing_id"] not in inflight]
+            if rows:
                 STATE.last_change = datetime.utcnow()
-                await run_hotpath_once(score=True, alerts=True)
+                inflight.update(r["filing_id"] for r in rows)
+                queue.put_nowait({source: rows})
+            ok, changed = True, any(not _retried(source, r["filing_id"]) for r in rows)
         except Exception as e:
-            error(f"watch error: {e}")
+            error(f"watch error ({source}): {e}")
         finally:
             STATE.last_poll = datetime.utcnow()
-            sleep_for = max(5, interval + random.randint(-jitter, jitter) - (time.monotonic() - start))
+            await asyncio.to_thread(SCHEDULER.record, source, ok, changed)
+            delay = await asyncio.to_thread(SCHEDULER.next_delay, source)
+            sleep_for = max(5, delay + random.randint(-jitter, jitter) - (time.monotonic() - start))
             await asyncio.sleep(sleep_for)
 
-async def discover_changes() -> bool:
-    """Placeholder — in DEV mode always returns True, in live mode would check House/Senate endpoints."""
-    return True
+async def _process_loop(queue: asyncio.Queue, inflight: set) -> None:
+    from .pipeline import run_pipeline
+    from .notify.alerts import send_alerts
+    while True:
+        batch: Dict[str, List[Dict]] = {}
+        item = await queue.get()
+        while True:  # coalesce everything that queued up while the last batch ran
+            for source, rows in item.items():
+                batch.setdefault(source, []).extend(rows)
+            if queue.empty():
+                break
+            item = queue.get_nowait()
+        ids = [r["filing_id"] for rows in batch.values() for r in rows]
+        try:
+            await run_pipeline(batch, score=True)
+            await asyncio.to_thread(mark_processed, batch)
+            with metrics.stage("alerts", rows_in=len(ids)):
+                send_alerts([f"{len(ids)} new filing(s) processed and scored"])
+            await asyncio.to_thread(metrics.flush)
+        except Exception as e:
+            error(f"watch pipeline error: {e}")
+        finally:
+            inflight.difference_update(ids)
+
+def fingerprint(rows: List[Dict]) -> str:
+    """Order-independent hash of a source listing (filing ids + file checksums)."""
+    h = hashlib.sha256()
+    for fid, ck in sorted((r["filing_id"], r.get("checksum") or "") for r in rows):
+        h.update(f"{fid}:{ck}\n".encode("utf-8"))
+    return h.hexdigest()
+
+async def _list(source: str, since: date) -> List[Dict]:
+    mod = FETCHERS[source]
+    if CFG.dev:
+        return await asyncio.to_thread(mod.list_new_filings, since)
+    return await mod.fetch_new_filings(since)
+
+def _filing_row(f: Filing) -> Dict:
+    return {
+        "filing_id": f.filing_id,
+        "filer_member_id": f.filer_member_id,
+        "filer_name_raw": f.filer_name_raw,
+        "filed_date": f.filed_date.isoformat(),
+        "url": f.url,
+        "file_local_path": f.file_local_path,
+        "checksum": f.checksum,
+        "doc_type": f.doc_type,
+    }
+
+def _retried(source: str, filing_id: str) -> bool:
+    return _RETRIES.get(source, {}).get(filing_id, (0, None))[0] > 0
+
+def _due_retries(source: str, filings: List[Filing], now: datetime) -> List[Filing]:
+    """Unprocessed filings whose next retry is due, recording the attempt; gives up after ``MAX_RETRIES``."""
+    ids = {f.filing_id for f in filings}
+    state = _RETRIES[source] = {fid: v for fid, v in _RETRIES.get(source, {}).items() if fid in ids}
+    due = []
+    for f in filings:
+        n, at = state.get(f.filing_id, (0, now))
+        if n >= MAX_RETRIES or at > now:
+            continue
+        backoff = min(RETRY_BACKOFF * 2 ** n, RETRY_BACKOFF_MAX)
+        state[f.filing_id] = (n + 1, now + timedelta(seconds=backoff))
+        if n + 1 == MAX_RETRIES:
+            warn(f"{f.filing_id}: last retry; 'ticker parse' picks it up after that")
+        due.append(f)
+    return due
+
+def _record_listing(source: str, rows: List[Dict], now: datetime) -> List[Dict]:
+    """Compare a listing with the stored fingerprint; return rows for unknown and unprocessed filings.
+
+    Filings of ``source`` still ``fetched`` or ``failed`` (a run that died
+    after ingest, or a stage that failed) are retried whatever the fingerprint
+    says, with exponential backoff and at most ``MAX_RETRIES`` times per watcher
+    process; leftovers from an earlier process are retried at once. An empty
+    listing never replaces the stored fingerprint.
+    """
+    from .hotpath import RETRY_STATUSES
+    fp = fingerprint(rows)
+    new: List[Dict] = []
+    listed = {r["filing_id"]: r for r in rows}
+    with get_session() as s:
+        st = s.get(SourceState, source) or SourceState(source=source)
+        st.last_poll = now
+        if rows and fp != st.fingerprint:
+            known = set()
+            for chunk in batched(list(listed)):
+                known.update(s.exec(select(Filing.filing_id).where(Filing.filing_id.in_(chunk))))
+            new = [r for r in rows if r["filing_id"] not in known]
+        unprocessed = s.exec(select(Filing).where(Filing.source == source, Filing.status.in_(RETRY_STATUSES))).all()
+        retry = [listed.get(f.filing_id) or _filing_row(f) for f in _due_retries(source, unprocessed, now)]
+        if new:
+            # First retry only after a backoff, so a filing still in the pipeline isn't charged one.
+            first = now + timedelta(seconds=RETRY_BACKOFF)
+            _RETRIES[source].update((r["filing_id"], (0, first)) for r in new)
+            st.last_change = now
+            _PENDING[source] = fp
+            info(f"{source}: {len(new)} new filing(s)")
+        elif rows:
+            st.fingerprint = fp
+        if retry:
+            info(f"{source}: retrying {len(retry)} unprocessed filing(s)")
+        s.add(st)
+        s.commit()
+    return new + retry
+
+async def discover_changes(sources: str = "house,senate") -> Dict[str, List[Dict]]:
+    """Return rows for filings not yet processed, keyed by source.
+
+    Each source's listing is fingerprinted; when the fingerprint matches the one
+    stored in ``SourceState`` the source is skipped without touching ``Filing``.
+    Otherwise the listing is set-differenced against known filing ids. An empty
+    dict means nothing new was filed. Filings left ``fetched``/``failed`` by an
+    earlier run are returned again, with backoff, until they are processed.
+    """
+    since = date.today() - timedelta(days=LOOKBACK_DAYS)
+    now = datetime.utcnow()
+    names = parse_sources(sources)
+    listings = await asyncio.gather(*(_list(src, since) for src in names))
+    out: Dict[str, List[Dict]] = {}
+    for source, rows in zip(names, listings):
+        new = await asyncio.to_thread(_record_listing, source, rows, now)
+        if new:
+            out[source] = new
+    return out
+
+def mark_processed(changes: Dict[str, List[Dict]]) -> None:
+    """Persist the listing fingerprints for sources whose new filings were processed."""
+    with get_session() as s:
+        for source in changes:
+            fp = _PENDING.pop(source, None)
+            st = s.get(SourceState, source)
+            if fp and st:
+                st.fingerprint = fp
+        s.commit()
 
 def status() -> dict:
     """Return watcher state as a dict (for CLI status)."""
-    return {
+    out = {
         "last_poll": STATE.last_poll.isoformat() if STATE.last_poll else None,
         "last_change": STATE.last_change.isoformat() if STATE.last_change else None,
     }
+    try:
+        with get_read_session() as s:
+            for st in s.exec(select(SourceState)):
+                out[st.source] = {
+                    "last_poll": st.last_poll.isoformat() if st.last_poll else None,
+                    "last_change": st.last_change.isoformat() if st.last_change else None,
+                }
+    except Exception:
+        pass  # database not initialized yet
+    return out